@@ -0,0 +1,275 @@
+""" Benchmark suite of CrudRepo operations against running MySQL server, e.g. mysql_test service of
+docker-compose.yml (docker-compose up -d mysql_test) or any local mysqld.
+
+Throughput and p50/p99 latency of insert, buffered insert, insert_many, find_one, find_all, update, delete_many
+and delete_many_by_id are measured single threaded and with N threads sharing one connection pool. Rows are written
+to separate bench_teams table, which is emptied before every case. Results are saved as JSON, so runs of different
+commits can be compared:
+    python -m benchmarks.bench_crud_repo --env .env --threads 1 8 --output before.json
+    python -m benchmarks.bench_crud_repo --env .env --threads 1 8 --output after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import mysql.connector
+
+from easy_crud_repo_service.repo.connections.builders import MySQLConnectionPoolBuilder
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+
+# MySQLConnectionPool doesn't accept more connections
+MAX_POOL_SIZE = 32
+
+# Single row inserts queued by one call of buffered insert case
+BUFFERED_CALLS = 100
+
+
+@dataclass(slots=True)
+class BenchTeam:
+    """ Entity stored in bench_teams table, so benchmark doesn't touch tables used by tests """
+    id: int = None
+    name: str = None
+    points: int = 0
+
+
+def create_table(pool: Any) -> None:
+    connection = pool.get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            'create table if not exists bench_teams '
+            '(id int auto_increment primary key, name varchar(255), points int)'
+        )
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def empty_table(pool: Any) -> None:
+    connection = pool.get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute('truncate table bench_teams')
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def fill_table(repo: CrudRepo, rows: int) -> list[BenchTeam]:
+    """ Empties table and inserts given number of rows, returns their entities with ids set """
+    empty_table(repo._connection_pool)
+    teams = [BenchTeam(name=f'TEAM_{n}', points=n % 100) for n in range(rows)]
+    for team, team_id in zip(teams, repo.insert_many(teams)):
+        team.id = team_id
+    return teams
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """ Nearest rank percentile of sorted values """
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def measure(calls: int, threads: int, call: Callable[[int], int]) -> dict[str, Any]:
+    """ Runs call(n) for n in range(calls) on given number of threads. call returns number of processed rows.
+    Returns throughput and latency statistics """
+    latencies = [0.0] * calls
+    rows = [0] * calls
+
+    def run(numbers: range) -> None:
+        for n in numbers:
+            started_at = time.perf_counter()
+            rows[n] = call(n)
+            latencies[n] = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    if threads == 1:
+        run(range(calls))
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Every thread takes every threads-th call, so work is split evenly
+            list(executor.map(run, [range(start, calls, threads) for start in range(threads)]))
+    seconds = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        'calls': calls,
+        'rows': sum(rows),
+        'seconds': round(seconds, 6),
+        'calls_per_second': round(calls / seconds, 2),
+        'rows_per_second': round(sum(rows) / seconds, 2),
+        'mean_ms': round(sum(latencies) / calls * 1000, 4),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 4),
+    }
+
+
+def cases(repo: CrudRepo, args: argparse.Namespace, threads: int) -> list[tuple[str, dict[str, Any], dict[str, Any]]]:
+    """ Runs every case with given number of threads and returns (operation, parameters, statistics) """
+    calls = args.calls
+    pool = repo._connection_pool
+    results = []
+
+    def insert(n: int) -> int:
+        repo.insert(BenchTeam(name=f'TEAM_{n}', points=n % 100))
+        return 1
+
+    empty_table(pool)
+    results.append(('insert', {}, measure(calls, threads, insert)))
+
+    def buffered_insert(n: int) -> int:
+        futures = [buffered.insert(BenchTeam(name=f'TEAM_{n}', points=m % 100)) for m in range(BUFFERED_CALLS)]
+        return len([future.result() for future in futures])
+
+    # Single row inserts written behind in batches, measured call includes waiting for ids of all its rows
+    empty_table(pool)
+    with repo.buffered() as buffered:
+        results.append(('buffered_insert', {'inserts_per_call': BUFFERED_CALLS}, measure(
+            max(threads, calls // BUFFERED_CALLS), threads, buffered_insert
+        )))
+
+    for batch_size in args.batch_sizes:
+        empty_table(pool)
+        batch = [BenchTeam(name=f'TEAM_{n}', points=n % 100) for n in range(batch_size)]
+        results.append(('insert_many', {'batch_size': batch_size}, measure(
+            max(threads, calls * 10 // batch_size), threads, lambda n: len(repo.insert_many(batch, batch_size))
+        )))
+
+    teams = fill_table(repo, args.rows)
+    # Ids are drawn before measurement, so every run reads and updates the same rows
+    targets = random.Random(args.seed).choices([team.id for team in teams], k=calls)
+
+    def find_one(n: int) -> int:
+        repo.find_one(targets[n])
+        return 1
+
+    def update(n: int) -> int:
+        repo.update(targets[n], BenchTeam(name=f'UPDATED_{n}', points=n % 100), reload=False)
+        return 1
+
+    results.append(('find_one', {'table_rows': args.rows}, measure(calls, threads, find_one)))
+    results.append(('update', {'table_rows': args.rows}, measure(calls, threads, update)))
+
+    chunk = args.delete_chunk
+    delete_calls = max(1, min(calls, len(teams) // chunk))
+
+    def delete_many(n: int) -> int:
+        return len(repo.delete_many(teams[n * chunk:(n + 1) * chunk]))
+
+    results.append(('delete_many', {'items_per_call': chunk}, measure(delete_calls, threads, delete_many)))
+
+    # Rows were deleted by previous case, the same number of them is inserted again
+    ids = [team.id for team in fill_table(repo, args.rows)]
+
+    def delete_many_by_id(n: int) -> int:
+        return len(repo.delete_many_by_id(ids[n * chunk:(n + 1) * chunk]))
+
+    results.append(('delete_many_by_id', {'ids_per_call': chunk}, measure(delete_calls, threads, delete_many_by_id)))
+
+    for table_rows in args.table_sizes:
+        fill_table(repo, table_rows)
+        results.append(('find_all', {'table_rows': table_rows}, measure(
+            max(threads, args.find_all_calls), threads, lambda n: len(repo.find_all())
+        )))
+    return results
+
+
+def server_version(pool: Any) -> str:
+    connection = pool.get_connection()
+    try:
+        return connection.get_server_info()
+    finally:
+        connection.close()
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict[str, Any]], previous_path: str) -> None:
+    """ Prints throughput and p99 of current run relative to previous one """
+    previous = {
+        (result['operation'], result['threads'], json.dumps(result['params'], sort_keys=True)): result
+        for result in json.loads(Path(previous_path).read_text())['results']
+    }
+    print(f'\ncompared with {previous_path}')
+    for result in results:
+        key = (result['operation'], result['threads'], json.dumps(result['params'], sort_keys=True))
+        if key not in previous:
+            continue
+        throughput = result['rows_per_second'] / previous[key]['rows_per_second']
+        p99 = result['p99_ms'] / previous[key]['p99_ms']
+        print(f'{describe_case(result):<48} rows/s x{throughput:6.2f}   p99 x{p99:6.2f}')
+
+
+def describe_case(result: dict[str, Any]) -> str:
+    params = ', '.join(f'{name}={value}' for name, value in result['params'].items())
+    return f"{result['operation']}({params}) threads={result['threads']}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--env', default=str(Path.cwd() / '.env'), help='.env file with connection config')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--calls', type=int, default=2000, help='calls of single row operations per case')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument(
+        '--rows', type=int, default=10_000, help='rows in table for find_one, update, delete_many, delete_many_by_id'
+    )
+    parser.add_argument('--table-sizes', type=int, nargs='+', default=[1000, 10_000, 100_000])
+    parser.add_argument('--find-all-calls', type=int, default=20)
+    parser.add_argument('--delete-chunk', type=int, default=100)
+    parser.add_argument('--prepared', action='store_true', help='execute statements on prepared cursors')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='JSON file of previous run')
+    args = parser.parse_args()
+
+    pool = MySQLConnectionPoolBuilder(args.env).set_pool_size(min(max(args.threads), MAX_POOL_SIZE)).build()
+    create_table(pool)
+    repo = CrudRepo(pool, BenchTeam, prepared=args.prepared)
+
+    results = []
+    for threads in args.threads:
+        for operation, params, statistics in cases(repo, args, threads):
+            result = {'operation': operation, 'params': params, 'threads': threads, **statistics}
+            results.append(result)
+            print(
+                f"{describe_case(result):<48} {result['rows_per_second']:>12,.0f} rows/s "
+                f"{result['calls_per_second']:>10,.0f} calls/s  p50 {result['p50_ms']:8.3f} ms  "
+                f"p99 {result['p99_ms']:8.3f} ms"
+            )
+    empty_table(pool)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'connector': mysql.connector.__version__,
+            'server': server_version(pool),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f'\nresults saved to {args.output}')
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
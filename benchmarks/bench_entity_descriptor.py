@@ -0,0 +1,45 @@
+""" Micro-benchmark of per-call metadata overhead of CrudRepo before and after EntityDescriptor.
+
+It doesn't need database, it measures only python work done before statement reaches the driver.
+Run from main directory:
+    python -m benchmarks.bench_entity_descriptor
+"""
+import timeit
+from dataclasses import fields
+from datetime import date
+
+import inflection
+
+from easy_crud_repo_service.model.car import Car
+from easy_crud_repo_service.repo.entity_descriptor import describe
+
+NUMBER = 100_000
+
+
+def _legacy_insert_sql(entity: type, item) -> str:
+    """ Reflection done by CrudRepo.insert before descriptor was introduced. Models have slots now, so fields
+    are read with dataclasses.fields() and getattr() instead of __dict__, work per call stays the same """
+    table_name = inflection.tableize(type(entity()).__name__)
+    columns = ', '.join([field.name for field in fields(entity()) if field.name.lower() != 'id'])
+    values = ", ".join([
+        f"'{value}'" if isinstance(value, (str, date)) else str(value)
+        for name, value in ((field.name, getattr(item, field.name)) for field in fields(item)) if name.lower() != 'id'
+    ])
+    return f'insert into {table_name} ({columns}) values ({values});'
+
+
+def _descriptor_insert_sql(entity: type, item) -> tuple[str, tuple]:
+    """ Work done by CrudRepo.insert with cached descriptor """
+    descriptor = describe(entity)
+    return descriptor.statements['insert'], descriptor.insert_values(item)
+
+
+def main() -> None:
+    car = Car(None, 'WW12345', date(2012, 6, 22), 'xxxxxxxxxxxxxxxxx', 'BMW', 'M5')
+    for name, function in [('before (reflection)', _legacy_insert_sql), ('after (descriptor)', _descriptor_insert_sql)]:
+        seconds = min(timeit.repeat(lambda: function(Car, car), number=NUMBER, repeat=5))
+        print(f'{name:<22} {seconds / NUMBER * 1_000_000:8.3f} us per call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+""" Micro-benchmark of instrumentation overhead of CrudRepo.find_one.
+
+It doesn't need database, connection pool returns connections that answer every statement at once, so measured
+time is only python work of CrudRepo. Cost of disabled instrumentation is two 'is not None' checks per statement,
+it is measured separately and compared with time of whole call.
+Run from main directory:
+    python -m benchmarks.bench_instrumentation
+"""
+import timeit
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from easy_crud_repo_service.repo.instrumentation import Instrumentation
+
+NUMBER = 100_000
+
+
+class _Cursor:
+    rowcount = 1
+
+    def execute(self, operation, params=()):
+        pass
+
+    def fetchone(self):
+        return 1, 'Barcelona', 30
+
+    def close(self):
+        pass
+
+
+class _Connection:
+    def cursor(self, prepared=False):
+        return _Cursor()
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _Pool:
+    """ Pool without database, only CrudRepo overhead is measured """
+
+    def get_connection(self):
+        return _Connection()
+
+
+def per_call(function) -> float:
+    """ Returns best time of one call in microseconds """
+    return min(timeit.repeat(function, number=NUMBER, repeat=5)) / NUMBER * 1_000_000
+
+
+def main() -> None:
+    disabled = CrudRepo(_Pool(), Team)
+    histograms = CrudRepo(_Pool(), Team, instrumentation=Instrumentation())
+    with_callbacks = Instrumentation(slow_query_threshold=1.0)
+    with_callbacks.before_execute(lambda event: None)
+    with_callbacks.after_execute(lambda event: None)
+    callbacks = CrudRepo(_Pool(), Team, instrumentation=with_callbacks)
+
+    disabled_time = per_call(lambda: disabled.find_one(1))
+    check_time = per_call(lambda: (disabled._instrumentation is not None, disabled._instrumentation is not None))
+    print(f'{"disabled":<34} {disabled_time:8.3f} us per call')
+    print(f'{"  of which disabled checks":<34} {check_time:8.3f} us ({check_time / disabled_time:.1%})')
+    print(f'{"histograms":<34} {per_call(lambda: histograms.find_one(1)):8.3f} us per call')
+    print(f'{"histograms, slow log and callbacks":<34} {per_call(lambda: callbacks.find_one(1)):8.3f} us per call')
+
+
+if __name__ == '__main__':
+    main()
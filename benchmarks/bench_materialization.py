@@ -0,0 +1,71 @@
+""" Benchmark of row materialization: rows per second and peak memory of converting fetched rows
+into entities (regular and slots dataclasses) and into raw formats returned by CrudRepo.find_all_rows.
+
+It doesn't need database, rows are generated in the same shape as connector returns them.
+Run from main directory:
+    python -m benchmarks.bench_materialization --rows 1000000
+"""
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.entity_descriptor import describe
+from easy_crud_repo_service.repo.row_formats import collect_rows, ROW_FORMATS
+
+BATCH_SIZE = 10_000
+
+
+@dataclass
+class DictTeam:
+    """ Team without slots, every instance has its own __dict__ """
+    id: int | None = None
+    name: str | None = None
+    points: int | None = 0
+
+
+def batches(rows: list[tuple], batch_size: int = BATCH_SIZE):
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def measure(rows: list[tuple], entity: type, row_format: str) -> tuple[float, float]:
+    """ Returns rows per second and peak memory in MB of materialization """
+    descriptor = describe(entity)
+
+    def materialize():
+        return collect_rows(batches(rows), descriptor.fields_names, row_format, descriptor.rows_to_entities)
+
+    start = time.perf_counter()
+    result = materialize()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = materialize()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return len(rows) / elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = [(n, f'TEAM_{n}', n % 100) for n in range(1, args.rows + 1)]
+    cases = [('entity', DictTeam), ('entity', Team)] + [(row_format, Team) for row_format in ROW_FORMATS[1:]]
+    print(f'{args.rows} rows')
+    for row_format, entity in cases:
+        try:
+            rows_per_second, peak_mb = measure(rows, entity, row_format)
+        except ImportError as e:
+            print(f'{row_format:<8} {entity.__name__:<9} skipped: {e}')
+            continue
+        print(f'{row_format:<8} {entity.__name__:<9} {rows_per_second:>14,.0f} rows/s {peak_mb:>10.1f} MB peak')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,7 @@ from datetime import date
 from typing import Any, Self
 
 
-@dataclass
+@dataclass(slots=True)
 class Car:
     """id, registration_number, first_registration_date, vin, brand, model"""
     id: int = None
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Coach:
+    """ Entity with version column used for optimistic locking """
+    id: int | None = None
+    name: str | None = None
+    team_id: int | None = None
+    version: int | None = 0
@@ -1,10 +1,14 @@
 from dataclasses import dataclass
 
-@dataclass
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.relationships import belongs_to
+
+@dataclass(slots=True)
 class Player:
     id: int | None = None
     name: str | None = None
     goals: int | None = 0
     team_id: int | None = None
+    team: Team | None = belongs_to(Team, 'team_id')
 
 
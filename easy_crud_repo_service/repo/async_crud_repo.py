@@ -0,0 +1,154 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from mysql.connector import Error
+
+from easy_crud_repo_service.repo.connections.async_pool import AsyncMySQLConnectionPool
+from easy_crud_repo_service.repo.crud_repo import (
+    AUTO_INCREMENT_STATEMENT, MAX_PLACEHOLDERS, cache_auto_increment, cached_auto_increment
+)
+from easy_crud_repo_service.repo.entity_descriptor import describe
+
+
+class AsyncCrudRepo:
+    """ asyncio counterpart of CrudRepo with the same methods, every method has to be awaited """
+
+    def __init__(self, connection_pool: AsyncMySQLConnectionPool, entity: type, prepared: bool = False) -> None:
+        self._connection_pool = connection_pool
+        self._entity = entity
+        self._descriptor = describe(entity)
+        self._prepared = prepared
+
+    @asynccontextmanager
+    async def _get_cursor_object(self) -> AsyncIterator[Any]:
+        """ Context manager that allows us to work on cursor in safe manner """
+        async with self._connection_pool.connection() as connection_object:
+            cursor_object = await connection_object.cursor(prepared=self._prepared)
+            try:
+                yield cursor_object
+                await connection_object.commit()
+            except Exception as e:
+                # Connection is discarded by the pool when it can't be rolled back
+                try:
+                    await connection_object.rollback()
+                except Error:
+                    pass
+                raise e
+            finally:
+                await cursor_object.close()
+
+    def _statement(self, operation: str) -> str:
+        """ Returns parameterized sql of operation compiled once for given entity """
+        return self._descriptor.statements[operation]
+
+    async def _auto_increment(self, cur: Any) -> int:
+        """ Returns auto_increment_increment of server, it is read once per connection pool using provided cursor """
+        increment = cached_auto_increment(self._connection_pool)
+        if increment is None:
+            await cur.execute(AUTO_INCREMENT_STATEMENT)
+            increment = cache_auto_increment(self._connection_pool, await cur.fetchone())
+        return increment
+
+    async def insert(self, item: Any) -> int:
+        """ Inserts one new row into database table """
+        async with self._get_cursor_object() as cur:
+            await cur.execute(self._statement('insert'), self._descriptor.insert_values(item))
+            return cur.lastrowid
+
+    async def insert_many(self, items: list[Any], batch_size: int = 1000) -> list[int]:
+        """ Inserts multiple new rows into database table using multi row statements of at most batch_size rows.
+        Ids are returned in order of items, see CrudRepo.insert_many() """
+        if not items:
+            return []
+        columns_number = max(len(self._descriptor.insert_fields_names), 1)
+        batch_size = max(1, min(batch_size, MAX_PLACEHOLDERS // columns_number))
+        ids = []
+        async with self._get_cursor_object() as cur:
+            increment = await self._auto_increment(cur)
+            for start in range(0, len(items), batch_size):
+                batch = items[start:start + batch_size]
+                values = [value for item in batch for value in self._descriptor.insert_values(item)]
+                await cur.execute(self._descriptor.insert_many_statement(len(batch)), values)
+                ids.extend(range(cur.lastrowid, cur.lastrowid + len(batch) * increment, increment))
+        return ids
+
+    async def update(self, item_id: int, item: Any) -> Any:
+        """ Updates database table row using provided id and object containing new values"""
+        async with self._get_cursor_object() as cur:
+            await cur.execute(self._statement('update'), (*self._descriptor.insert_values(item), item_id))
+        return await self.find_one(item_id)
+
+    async def find_n_last(self, n: int) -> list[Any]:
+        """ Finds n last rows in table """
+        async with self._get_cursor_object() as cur:
+            await cur.execute(self._statement('find_n_last'), (n,))
+            return self._descriptor.rows_to_entities(await cur.fetchall())
+
+    async def find_one(self, item_id: int) -> Any:
+        """ Finds one row in table using provided id"""
+        async with self._get_cursor_object() as cur:
+            await cur.execute(self._statement('find_one'), (item_id,))
+            result = await cur.fetchone()
+            if not result:
+                raise RuntimeError(f"Item with id {item_id} wasn't found")
+            return self._descriptor.row_to_entity(result)
+
+    async def find_all(self) -> list[Any]:
+        """ Finds all rows in table """
+        async with self._get_cursor_object() as cur:
+            await cur.execute(self._statement('find_all'))
+            return self._descriptor.rows_to_entities(await cur.fetchall())
+
+    async def iter_all(self, page_size: int = 1000) -> AsyncIterator[Any]:
+        """ Lazily yields all rows of table ordered by id, reading them in pages with keyset pagination """
+        last_id = None
+        while True:
+            async with self._get_cursor_object() as cur:
+                if last_id is None:
+                    await cur.execute(self._statement('find_first_page'), (page_size,))
+                else:
+                    await cur.execute(self._statement('find_next_page'), (last_id, page_size))
+                rows = await cur.fetchall()
+            if not rows:
+                return
+            for entity in self._descriptor.rows_to_entities(rows):
+                yield entity
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][self._descriptor.id_index]
+
+    async def delete_one(self, item_id: int) -> int:
+        """ Deletes one row in table using provided id"""
+        async with self._get_cursor_object() as cur:
+            await cur.execute(self._statement('delete_one'), (item_id,))
+            deleted = cur.rowcount
+        if not deleted:
+            raise RuntimeError(f"Item with id {item_id} wasn't found")
+        return item_id
+
+    async def delete_many(self, items: list[Any]) -> list[int]:
+        """ Deletes multiple rows in table using entities"""
+        return await self.delete_many_by_id([item.id for item in items])
+
+    async def delete_many_by_id(self, items_ids: list[int]) -> list[int]:
+        """ Deletes multiple rows in table using ids"""
+        if not items_ids:
+            return []
+        async with self._get_cursor_object() as cur:
+            await cur.execute(self._descriptor.delete_many_statement(len(items_ids)), tuple(items_ids))
+            return items_ids
+
+    async def delete_all(self, page_size: int = 1000) -> list[int]:
+        """ Deletes all rows from a table. Only ids are read, page by page, and rows are deleted by these pages """
+        all_deleted_items = []
+        async with self._get_cursor_object() as cur:
+            await cur.execute(self._statement('find_first_ids_page'), (page_size,))
+            ids = [row[0] for row in await cur.fetchall()]
+            while ids:
+                await cur.execute(self._descriptor.delete_many_statement(len(ids)), ids)
+                all_deleted_items.extend(ids)
+                if len(ids) < page_size:
+                    break
+                await cur.execute(self._statement('find_next_ids_page'), (ids[-1], page_size))
+                ids = [row[0] for row in await cur.fetchall()]
+        return all_deleted_items
@@ -0,0 +1,169 @@
+import atexit
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Any, TYPE_CHECKING
+
+from easy_crud_repo_service.repo.transaction import active_transaction
+
+if TYPE_CHECKING:
+    from easy_crud_repo_service.repo.crud_repo import CrudRepo
+
+# Put into queue by close(), writer thread writes everything queued before it and stops
+_CLOSE = object()
+
+# Open buffered repos, rows that are still queued are written when interpreter exits
+_buffers: weakref.WeakSet = weakref.WeakSet()
+
+
+class BufferFullError(RuntimeError):
+    """ Raised when item couldn't be queued within timeout, because writer doesn't keep up with callers """
+
+
+class BufferedCrudRepo:
+    """ Write behind inserts of CrudRepo. insert() queues item and returns Future resolved with id of its row.
+    Writer thread collects queued items until batch_size items are collected or flush_interval seconds passed
+    since the first of them and inserts them with one insert_many() (multi row statements, one commit).
+    When max_pending items wait, insert() blocks until writer makes room (backpressure). All items of failed
+    batch get its error. Queued items are written by flush() and close(), and when interpreter exits """
+
+    def __init__(
+            self,
+            repo: 'CrudRepo',
+            batch_size: int = 1000,
+            flush_interval: float = 0.05,
+            max_pending: int = 10_000
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("Batch size should be higher than 0")
+        if flush_interval < 0:
+            raise ValueError("Flush interval can't be negative")
+        if max_pending <= 0:
+            raise ValueError("Max pending should be higher than 0")
+        self._repo = repo
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        # Number of callers putting into queue, close() waits for them, so nothing is queued after _CLOSE
+        self._putting = 0
+        self._condition = threading.Condition()
+        self._writer = threading.Thread(
+            target=self._write_loop, name=f'buffered-{repo._descriptor.table_name}', daemon=True
+        )
+        self._writer.start()
+        _buffers.add(self)
+
+    @property
+    def pending(self) -> int:
+        """ Number of queued items and flush requests that writer didn't take yet """
+        return self._queue.qsize()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def insert(self, item: Any, timeout: float | None = None) -> Future:
+        """ Queues item, result of returned Future is id of its row. When queue is full caller waits, at most
+        timeout seconds when it is provided, then BufferFullError is raised. Cancelled futures aren't written """
+        future = Future()
+        self._put((item, future), timeout)
+        return future
+
+    def insert_many(self, items: list[Any], timeout: float | None = None) -> list[Future]:
+        """ Queues items one by one, futures are returned in order of items """
+        return [self.insert(item, timeout) for item in items]
+
+    def flush(self, timeout: float | None = None) -> None:
+        """ Writes items queued before the call and waits until they are committed. Errors of batches are set
+        on futures of their items, they aren't raised by flush() """
+        marker = Future()
+        self._put(marker, timeout)
+        marker.result(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """ Writes queued items and stops writer thread. Items can't be queued after close, callers waiting for
+        room in queue are let in before writer is stopped """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.wait_for(lambda: not self._putting)
+        self._queue.put(_CLOSE)
+        _buffers.discard(self)
+        if threading.current_thread() is not self._writer:
+            self._writer.join(timeout)
+
+    def __enter__(self) -> 'BufferedCrudRepo':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def _put(self, entry: Any, timeout: float | None) -> None:
+        # Items are written by writer thread, they would be committed outside of transaction of caller
+        if active_transaction(self._repo._connection_pool) is not None:
+            raise RuntimeError("Buffered inserts can't run inside transaction of the same connection pool")
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Buffered repo is closed")
+            self._putting += 1
+        # Queue is full when writer doesn't keep up, other callers and close() don't wait for this one
+        try:
+            self._queue.put(entry, timeout=timeout)
+        except queue.Full:
+            raise BufferFullError(f"Write buffer of {self._repo._descriptor.table_name} is full")
+        finally:
+            with self._condition:
+                self._putting -= 1
+                if not self._putting:
+                    self._condition.notify_all()
+
+    def _write_loop(self) -> None:
+        """ Takes batches until _CLOSE is taken. Flush request ends batch, so items queued before it are written """
+        closing = False
+        while not closing:
+            entry = self._queue.get()
+            deadline = time.monotonic() + self._flush_interval
+            batch, markers = [], []
+            while True:
+                if entry is _CLOSE:
+                    closing = True
+                    break
+                if isinstance(entry, Future):
+                    markers.append(entry)
+                    break
+                batch.append(entry)
+                if len(batch) >= self._batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for marker in markers:
+                marker.set_result(None)
+
+    def _write(self, batch: list[tuple[Any, Future]]) -> None:
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            ids = self._repo.insert_many([item for item, _ in batch], self._batch_size)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+        else:
+            for (_, future), item_id in zip(batch, ids):
+                future.set_result(item_id)
+
+
+def _close_buffers() -> None:
+    for buffer in list(_buffers):
+        buffer.close()
+
+
+atexit.register(_close_buffers)
@@ -0,0 +1,220 @@
+import threading
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterable
+
+# Returned by CacheBackend.get when key is not cached, None can't be used because it is a valid value
+MISSING = object()
+
+# Invalidation generations of keys are kept in this many stripes, so their memory doesn't grow with number of keys
+GENERATION_STRIPES = 4096
+
+# First item of keys under which SharedCache keeps generations in shared mapping, next to (table name, id) keys
+GENERATIONS_KEY = '__generations__'
+
+
+def _stripe(key: Hashable) -> int:
+    """ Returns stripe of key, the same in every process (hash() of str is randomized per process) """
+    return zlib.crc32(repr(key).encode()) % GENERATION_STRIPES
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class CacheBackend(ABC):
+    """ Storage of entities read by CrudRepo.find_one, keys are (table name, id) tuples """
+
+    def __init__(self) -> None:
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._generation_lock = threading.Lock()
+        self._generations = [0] * GENERATION_STRIPES
+        self._table_generations: dict[str, int] = {}
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any:
+        """ Returns cached value or MISSING """
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """ Caches value under the key """
+
+    @abstractmethod
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        """ Removes keys from cache, keys that are not cached are ignored """
+
+    @abstractmethod
+    def delete_table(self, table_name: str) -> None:
+        """ Removes all keys of the table from cache """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def generation(self, key: Hashable) -> tuple[Any, Any]:
+        """ Returns invalidation generation of key, read it before row is selected and pass it to fill() """
+        return self._table_generations.get(key[0], 0), self._generations[_stripe(key)]
+
+    def fill(self, key: Hashable, value: Any, generation: tuple[Any, Any]) -> bool:
+        """ Caches value read from database only when key wasn't invalidated since generation was read, otherwise
+        row could be replaced by concurrent write after it was selected and stale value would be cached.
+        Generation is checked again after value is set, invalidation of other process between the check and set
+        is seen then (it changes generation before it deletes keys) """
+        with self._generation_lock:
+            if self.generation(key) != generation:
+                return False
+            self.set(key, value)
+            if self.generation(key) != generation:
+                self.delete_many([key])
+                return False
+            return True
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """ Removes keys and makes fills of values read before this call ignored """
+        keys = list(keys)
+        with self._generation_lock:
+            self._advance({_stripe(key) for key in keys})
+        self.delete_many(keys)
+
+    def invalidate_table(self, table_name: str) -> None:
+        """ Removes all keys of the table and makes fills of values read before this call ignored """
+        with self._generation_lock:
+            self._advance_table(table_name)
+        self.delete_table(table_name)
+
+    def _advance(self, stripes: Iterable[int]) -> None:
+        for stripe in stripes:
+            self._generations[stripe] += 1
+
+    def _advance_table(self, table_name: str) -> None:
+        self._table_generations[table_name] = self._table_generations.get(table_name, 0) + 1
+
+    def stats(self) -> CacheStats:
+        """ Returns hit, miss and eviction counters """
+        with self._stats_lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self))
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _count_evictions(self, evictions: int) -> None:
+        with self._stats_lock:
+            self._evictions += evictions
+
+
+class LRUCache(CacheBackend):
+    """ Process local, thread safe cache that holds at most maxsize entries, each for at most ttl seconds """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        super().__init__()
+        if maxsize <= 0:
+            raise ValueError("Cache maxsize should be higher than 0")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        expired = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry, expired = None, True
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if expired:
+            self._count_evictions(1)
+        self._count(entry is not None)
+        return MISSING if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = None if self._ttl is None else time.monotonic() + self._ttl
+        evictions = 0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                evictions += 1
+        if evictions:
+            self._count_evictions(evictions)
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def delete_table(self, table_name: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == table_name]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SharedCache(CacheBackend):
+    """ Cache on top of any mutable mapping, e.g. multiprocessing.Manager().dict() shared by many processes.
+    Size of shared mapping is not bounded by this class, entries expire after ttl seconds. Invalidation
+    generations are kept in the mapping too, so stale rows read before invalidation made by other process
+    aren't cached """
+
+    def __init__(self, mapping: MutableMapping, ttl: float | None = None) -> None:
+        super().__init__()
+        self._mapping = mapping
+        self._ttl = ttl
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._mapping.get(key)
+        if entry is not None and entry[0] is not None and entry[0] < time.time():
+            self._mapping.pop(key, None)
+            self._count_evictions(1)
+            entry = None
+        self._count(entry is not None)
+        return MISSING if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._mapping[key] = (None if self._ttl is None else time.time() + self._ttl, value)
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        for key in keys:
+            self._mapping.pop(key, None)
+
+    def delete_table(self, table_name: str) -> None:
+        for key in [key for key in self._mapping.keys() if key[0] == table_name]:
+            self._mapping.pop(key, None)
+
+    def __len__(self) -> int:
+        return sum(1 for key in self._mapping.keys() if key[0] != GENERATIONS_KEY)
+
+    def generation(self, key: Hashable) -> tuple[Any, Any]:
+        return (
+            self._mapping.get((GENERATIONS_KEY, 'table', key[0])),
+            self._mapping.get((GENERATIONS_KEY, _stripe(key)))
+        )
+
+    def _advance(self, stripes: Iterable[int]) -> None:
+        # Unique values instead of counters, increments of two processes could be lost
+        generation = uuid.uuid4().hex
+        self._mapping.update({(GENERATIONS_KEY, stripe): generation for stripe in stripes})
+
+    def _advance_table(self, table_name: str) -> None:
+        self._mapping[(GENERATIONS_KEY, 'table', table_name)] = uuid.uuid4().hex
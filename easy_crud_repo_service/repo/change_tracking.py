@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable
+
+# Default number of snapshots kept by tracker, rows without snapshot are written with all columns
+MAX_SNAPSHOTS = 100_000
+
+
+class StaleEntityError(RuntimeError):
+    """ Raised when row written with version check was changed or deleted by another writer since it was read """
+
+
+class ChangeTracker:
+    """ Thread safe snapshots of values of rows read by CrudRepo, keyed by row id. Values of item compared with
+    snapshot of its row tell which columns were changed. Snapshots are kept until rows are deleted or forgotten,
+    at most maxsize of them, the least recently taken ones are dropped first """
+
+    def __init__(self, names: tuple[str, ...], ignored: str | None = None, maxsize: int = MAX_SNAPSHOTS) -> None:
+        if maxsize <= 0:
+            raise ValueError("Tracker maxsize should be higher than 0")
+        self._names = names
+        self._compared = tuple(index for index, name in enumerate(names) if name != ignored)
+        self._maxsize = maxsize
+        self._snapshots: OrderedDict[Any, tuple[Any, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def snapshot(self, item_id: Any, values: tuple[Any, ...]) -> None:
+        self.snapshot_many([(item_id, values)])
+
+    def snapshot_many(self, pairs: Iterable[tuple[Any, tuple[Any, ...]]]) -> None:
+        with self._lock:
+            for item_id, values in pairs:
+                self._snapshots[item_id] = values
+                self._snapshots.move_to_end(item_id)
+            while len(self._snapshots) > self._maxsize:
+                self._snapshots.popitem(last=False)
+
+    def changed(self, item_id: Any, values: tuple[Any, ...]) -> tuple[str, ...] | None:
+        """ Returns names of columns which values differ from snapshot, None when row has no snapshot """
+        snapshot = self._snapshots.get(item_id)
+        if snapshot is None:
+            return None
+        return tuple(self._names[index] for index in self._compared if values[index] != snapshot[index])
+
+    def forget(self, items_ids: Iterable[Any]) -> None:
+        with self._lock:
+            for item_id in items_ids:
+                self._snapshots.pop(item_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
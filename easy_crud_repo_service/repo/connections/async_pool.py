@@ -0,0 +1,123 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from mysql.connector import Error
+from mysql.connector.aio import connect
+
+
+class AsyncMySQLConnectionPool:
+    """ Connection pool for asyncio applications based on mysql.connector.aio connections.
+    Connections are opened lazily up to pool_size, when all of them are in use callers wait for release
+    instead of getting an error, so many concurrent tasks can share a small pool. Liveness of idle connection
+    (ping) is checked on checkout when it was idle for more than health_check_after seconds, e.g. server could close
+    it after wait_timeout """
+
+    def __init__(
+            self,
+            pool_name: str | None = None,
+            pool_size: int = 5,
+            pool_reset_session: bool = True,
+            health_check_after: float = 30.0,
+            **connection_config: Any
+    ) -> None:
+        if pool_size <= 0:
+            raise AttributeError("Pool size should be higher than 0")
+        self._pool_name = pool_name
+        self._pool_size = pool_size
+        self._reset_session = pool_reset_session
+        self._health_check_after = health_check_after
+        self._connection_config = connection_config
+        # (connection, time of release) pairs, the most recently released connection is taken first
+        self._idle_connections: asyncio.LifoQueue = asyncio.LifoQueue()
+        self._available = asyncio.Semaphore(pool_size)
+
+    @property
+    def pool_name(self) -> str | None:
+        return self._pool_name
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    async def get_connection(self) -> Any:
+        """ Returns idle connection or opens new one, when pool_size connections are in use waits for release.
+        Idle connections that don't answer ping are closed and the next one is taken """
+        await self._available.acquire()
+        try:
+            while not self._idle_connections.empty():
+                connection, released_at = self._idle_connections.get_nowait()
+                if await self._is_usable(connection, released_at):
+                    return connection
+                await self._close_connection(connection)
+            return await connect(**self._connection_config)
+        except BaseException:
+            self._available.release()
+            raise
+
+    async def release(self, connection: Any, discard: bool = False) -> None:
+        """ Gives connection back to the pool, connections in unknown state should be discarded """
+        try:
+            if not discard and self._reset_session:
+                try:
+                    await connection.cmd_reset_connection()
+                except Error:
+                    discard = True
+            if discard:
+                await self._close_connection(connection)
+            else:
+                self._idle_connections.put_nowait((connection, time.monotonic()))
+        finally:
+            self._available.release()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        """ Context manager that takes connection from the pool and always gives it back. When any error occurs
+        connection is rolled back, so transaction isn't left open without session reset, or discarded when it can't
+        be rolled back """
+        connection = await self.get_connection()
+        discard = False
+        try:
+            yield connection
+        except asyncio.CancelledError:
+            # Cancelled task could leave unread result on the connection
+            discard = True
+            raise
+        except BaseException:
+            discard = not await self._rolled_back(connection)
+            raise
+        finally:
+            await self.release(connection, discard)
+
+    async def close(self) -> None:
+        """ Closes all idle connections """
+        while not self._idle_connections.empty():
+            connection, _ = self._idle_connections.get_nowait()
+            await self._close_connection(connection)
+
+    async def _is_usable(self, connection: Any, released_at: float) -> bool:
+        """ Pings connection only if it was idle for longer than health_check_after """
+        if time.monotonic() - released_at < self._health_check_after:
+            return True
+        try:
+            return await connection.is_connected()
+        except Error:
+            return False
+
+    @staticmethod
+    async def _rolled_back(connection: Any) -> bool:
+        try:
+            if not await connection.is_connected():
+                return False
+            await connection.rollback()
+            return True
+        except Error:
+            return False
+
+    @staticmethod
+    async def _close_connection(connection: Any) -> None:
+        try:
+            await connection.close()
+        except Error:
+            pass
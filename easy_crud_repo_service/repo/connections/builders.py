@@ -1,95 +1,192 @@
-import os
-from typing import Self
+from typing import Any, Self, TYPE_CHECKING
 
-from dotenv import load_dotenv
-from easyvalid_data_validator.constraints import Constraint
-from easyvalid_data_validator.validator import validate_json_data
-from mysql.connector.pooling import MySQLConnectionPool
+from easy_crud_repo_service.repo.connections.config import PoolConfig, validate_pool_options
+from easy_crud_repo_service.repo.connections.fork_safe import ForkSafeConnectionPool
+
+# mysql.connector and pool modules are imported when pool is built, so importing builders is cheap
+if TYPE_CHECKING:
+    from mysql.connector.pooling import MySQLConnectionPool
+
+    from easy_crud_repo_service.repo.connections.async_pool import AsyncMySQLConnectionPool
+    from easy_crud_repo_service.repo.connections.elastic_pool import ElasticConnectionPool
+    from easy_crud_repo_service.repo.connections.routed_pool import RoutedConnectionPool
 
 
 class MySQLConnectionPoolBuilder:
-    def __init__(self, absolute_dotenv_path: str | None = None):
-
-        # This env variables clearance is needed to avoid 'lost'
-        # variables from previous loadings of .env if current one does not exist
-        for v in ['POOL_NAME', 'POOL_SIZE', 'POOL_RESET_SESSION', 'HOST', 'DATABASE', 'USER', 'PASSWORD', 'PORT']:
-            if v in os.environ:
-                del os.environ[v]
-        load_dotenv(absolute_dotenv_path, override=True)
-        try:
-            self._pool_config_ = {
-                'pool_name': os.getenv('POOL_NAME'),
-                'pool_size': int(os.getenv('POOL_SIZE')),
-                'pool_reset_session': bool(os.getenv('POOL_RESET_SESSION')),
-                'host': os.getenv('HOST'),
-                'database': os.getenv('DATABASE'),
-                'user': os.getenv('USER'),
-                'password': os.getenv('PASSWORD'),
-                'port': int(os.getenv('PORT'))
-            }
-            validate_json_data(self._pool_config_, constraints={
-                'pool_name': {Constraint.IS_TYPE: str},
-                'pool_size': {Constraint.IS_TYPE: int},
-                'pool_reset_session': {Constraint.IS_TYPE: bool},
-                'host': {Constraint.IS_TYPE: str},
-                'database': {Constraint.IS_TYPE: str},
-                'user': {Constraint.IS_TYPE: str},
-                'password': {Constraint.IS_TYPE: str},
-                'port': {Constraint.IS_TYPE: int},
-            })
-        except TypeError:
-            raise ConnectionError("File is invalid or doesn't exist")
+    def __init__(self, absolute_dotenv_path: str | None = None, config: PoolConfig | None = None):
+        """ Options are read from .env file, or taken from already parsed and validated config. Environment
+        variables of process are neither read nor changed """
+        config = config if config is not None else PoolConfig.from_dotenv(absolute_dotenv_path)
+        self._pool_config_ = config.pool_options()
+        self._replica_hosts_ = list(config.replica_hosts)
+        # Options of config are valid, they are validated again only after some setter was called
+        self._validated_ = True
 
     def set_pool_name(self, new_pool_name: str) -> Self:
         """ Setting up new pool name"""
-        self._pool_config_['pool_name'] = new_pool_name
-        return self
+        return self._set('pool_name', new_pool_name)
 
     def set_pool_size(self, new_size: int) -> Self:
         """ Setting up new pool size"""
-        self._pool_config_['pool_size'] = new_size
-        return self
+        return self._set('pool_size', new_size)
 
     def set_pool_reset_session(self, new_pool_reset_session: bool) -> Self:
         """ Setting up new value for pool_reset_session"""
-        self._pool_config_['pool_reset_session'] = new_pool_reset_session
-        return self
+        return self._set('pool_reset_session', new_pool_reset_session)
 
     def set_new_host(self, new_host: str) -> Self:
         """ Setting up new host"""
-        self._pool_config_['host'] = new_host
-        return self
+        return self._set('host', new_host)
 
     def set_new_database(self, new_database: str) -> Self:
         """ Setting up new db name"""
-        self._pool_config_['database'] = new_database
-        return self
+        return self._set('database', new_database)
 
     def set_username(self, new_username: str) -> Self:
         """ Setting up new username"""
-        self._pool_config_['user'] = new_username
-        return self
+        return self._set('user', new_username)
 
     def set_password(self, new_password: str) -> Self:
         """ Setting up new password"""
-        self._pool_config_['password'] = new_password
-        return self
+        return self._set('password', new_password)
 
     def set_new_port(self, new_port: int) -> Self:
         """ Setting up new port"""
-        self._pool_config_['port'] = new_port
+        return self._set('port', new_port)
+
+    def set_allow_local_infile(self, new_allow_local_infile: bool) -> Self:
+        """ Setting up permission for LOAD DATA LOCAL INFILE used by CrudRepo.bulk_load()"""
+        return self._set('allow_local_infile', new_allow_local_infile)
+
+    def set_replica_hosts(self, new_replica_hosts: list[str]) -> Self:
+        """ Setting up replica hosts, every host can have its own port after colon"""
+        self._replica_hosts_ = list(new_replica_hosts)
+        return self
+
+    def _set(self, option: str, value: Any) -> Self:
+        self._pool_config_[option] = value
+        self._validated_ = False
         return self
 
-    def build(self) -> MySQLConnectionPool:
-        """ Validation of _pool_config_ dict and creation of connection pool"""
-        validate_json_data(self._pool_config_, constraints={
-            'pool_name': {Constraint.IS_TYPE: str},
-            'pool_size': {Constraint.IS_TYPE: int},
-            'pool_reset_session': {Constraint.IS_TYPE: bool},
-            'host': {Constraint.IS_TYPE: str},
-            'database': {Constraint.IS_TYPE: str},
-            'user': {Constraint.IS_TYPE: str},
-            'password': {Constraint.IS_TYPE: str},
-            'port': {Constraint.IS_TYPE: int},
-        })
+    def _validate(self) -> None:
+        """ Validates _pool_config_ dict if it was changed since last validation """
+        if not self._validated_:
+            validate_pool_options(self._pool_config_)
+            self._validated_ = True
+
+    def config(self) -> PoolConfig:
+        """ Returns validated config of current options, it can be shared by other builders """
+        return PoolConfig(**self._pool_config_, replica_hosts=tuple(self._replica_hosts_))
+
+    def build(self) -> 'MySQLConnectionPool':
+        """ Validation of _pool_config_ dict and creation of connection pool, it opens pool_size connections """
+        from mysql.connector.pooling import MySQLConnectionPool
+
+        self._validate()
         return MySQLConnectionPool(**self._pool_config_)
+
+    def build_lazy(
+            self,
+            warm_in_background: bool = False,
+            wait_timeout: float = 30.0,
+            max_waiters: int | None = None
+    ) -> 'ElasticConnectionPool':
+        """ Validation of _pool_config_ dict and creation of pool of pool_size connections that doesn't open any
+        connection in constructor. Connections are opened on demand, with warm_in_background all of them are
+        opened in parallel by background threads, so many workers starting at once don't wait for them """
+        return self.build_elastic(
+            min_size=self._pool_config_['pool_size'] if warm_in_background else 0,
+            wait_timeout=wait_timeout,
+            warm_in_background=warm_in_background,
+            max_waiters=max_waiters
+        )
+
+    def build_elastic(
+            self,
+            min_size: int = 0,
+            wait_timeout: float = 30.0,
+            idle_timeout: float = 300.0,
+            health_check_after: float = 30.0,
+            max_lifetime: float = 3600.0,
+            warm_in_background: bool = False,
+            max_waiters: int | None = None
+    ) -> 'ElasticConnectionPool':
+        """ Validation of _pool_config_ dict and creation of ElasticConnectionPool that grows lazily
+        from min_size up to pool_size connections, at most max_waiters callers wait for connection """
+        from easy_crud_repo_service.repo.connections.elastic_pool import ElasticConnectionPool
+
+        self._validate()
+        config = dict(self._pool_config_)
+        max_size = config.pop('pool_size')
+        return ElasticConnectionPool(
+            min_size=min_size,
+            max_size=max_size,
+            wait_timeout=wait_timeout,
+            idle_timeout=idle_timeout,
+            health_check_after=health_check_after,
+            max_lifetime=max_lifetime,
+            warm_in_background=warm_in_background,
+            max_waiters=max_waiters,
+            **config
+        )
+
+    def build_fork_safe(self, method: str = 'build', **options: Any) -> ForkSafeConnectionPool:
+        """ Creation of ForkSafeConnectionPool, every process builds its own pool on first use with given build
+        method (build, build_lazy, build_elastic or build_routed) from options of builder saved now """
+        if method not in ('build', 'build_lazy', 'build_elastic', 'build_routed'):
+            raise ValueError(f"Build method {method} is not supported")
+        return ForkSafeConnectionPool(PoolFactory(self.config(), method, options))
+
+    def build_routed(
+            self,
+            strategy: str = 'round_robin',
+            read_your_writes_window: float = 1.0
+    ) -> 'RoutedConnectionPool':
+        """ Validation of _pool_config_ dict and creation of primary pool and one pool per replica host.
+        Replicas use the same credentials, database and pool size as primary """
+        from mysql.connector.pooling import MySQLConnectionPool
+
+        from easy_crud_repo_service.repo.connections.routed_pool import RoutedConnectionPool, validate_strategy
+
+        self._validate()
+        validate_strategy(strategy)
+        replicas = []
+        for number, replica_host in enumerate(self._replica_hosts_, start=1):
+            host, _, port = replica_host.partition(':')
+            if not host or port and not port.isdigit():
+                raise ConnectionError(f"Replica host {replica_host} is invalid")
+            replicas.append(MySQLConnectionPool(**{
+                **self._pool_config_,
+                'pool_name': f"{self._pool_config_['pool_name']}_REPLICA_{number}",
+                'host': host,
+                'port': int(port) if port else self._pool_config_['port']
+            }))
+        return RoutedConnectionPool(
+            MySQLConnectionPool(**self._pool_config_),
+            replicas,
+            strategy=strategy,
+            read_your_writes_window=read_your_writes_window
+        )
+
+
+class PoolFactory:
+    """ Builds pool from config with build method of MySQLConnectionPoolBuilder, it can be pickled """
+
+    def __init__(self, config: PoolConfig, method: str = 'build', options: dict[str, Any] | None = None) -> None:
+        self.config = config
+        self.method = method
+        self.options = options or {}
+
+    def __call__(self) -> Any:
+        return getattr(MySQLConnectionPoolBuilder(config=self.config), self.method)(**self.options)
+
+
+class AsyncMySQLConnectionPoolBuilder(MySQLConnectionPoolBuilder):
+    """ Async counterpart of MySQLConnectionPoolBuilder, it reads the same .env file and has the same setters """
+
+    def build(self) -> 'AsyncMySQLConnectionPool':
+        """ Validation of _pool_config_ dict and creation of asyncio connection pool"""
+        from easy_crud_repo_service.repo.connections.async_pool import AsyncMySQLConnectionPool
+
+        self._validate()
+        return AsyncMySQLConnectionPool(**self._pool_config_)
@@ -0,0 +1,79 @@
+from dataclasses import asdict, dataclass
+from functools import cache
+from typing import Any, Self
+
+from dotenv import dotenv_values
+
+
+@cache
+def pool_config_constraints() -> dict[str, Any]:
+    """ Constraints of pool options, easyvalid_data_validator is imported on first validation """
+    from easyvalid_data_validator.constraints import Constraint
+
+    return {
+        'pool_name': {Constraint.IS_TYPE: str},
+        'pool_size': {Constraint.IS_TYPE: int},
+        'pool_reset_session': {Constraint.IS_TYPE: bool},
+        'host': {Constraint.IS_TYPE: str},
+        'database': {Constraint.IS_TYPE: str},
+        'user': {Constraint.IS_TYPE: str},
+        'password': {Constraint.IS_TYPE: str},
+        'port': {Constraint.IS_TYPE: int},
+        'allow_local_infile': {Constraint.IS_TYPE: bool},
+    }
+
+
+def validate_pool_options(pool_options: dict[str, Any]) -> None:
+    """ Raises ValidationError of easyvalid_data_validator when some option has invalid type """
+    from easyvalid_data_validator.validator import validate_json_data
+
+    validate_json_data(pool_options, constraints=pool_config_constraints())
+
+
+@dataclass(frozen=True, slots=True)
+class PoolConfig:
+    """ Connection pool options parsed and validated once. It is immutable, so one config can be shared by
+    builders in many threads. Reading .env file doesn't change os.environ of process """
+    pool_name: str
+    pool_size: int
+    pool_reset_session: bool
+    host: str
+    database: str
+    user: str
+    password: str
+    port: int
+    allow_local_infile: bool = False
+    # Optional replicas, every host can have its own port after colon
+    replica_hosts: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        validate_pool_options(self.pool_options())
+
+    @classmethod
+    def from_dotenv(cls, absolute_dotenv_path: str | None = None) -> Self:
+        """ Parses .env file, ConnectionError is raised when it doesn't exist or numbers are missing in it """
+        values = dotenv_values(absolute_dotenv_path)
+        try:
+            return cls(
+                pool_name=values.get('POOL_NAME'),
+                pool_size=int(values.get('POOL_SIZE')),
+                pool_reset_session=bool(values.get('POOL_RESET_SESSION')),
+                host=values.get('HOST'),
+                database=values.get('DATABASE'),
+                user=values.get('USER'),
+                password=values.get('PASSWORD'),
+                port=int(values.get('PORT')),
+                allow_local_infile=bool(values.get('ALLOW_LOCAL_INFILE')),
+                # Comma separated, e.g. REPLICA_HOSTS=replica-1:3307,replica-2
+                replica_hosts=tuple(
+                    host.strip() for host in (values.get('REPLICA_HOSTS') or '').split(',') if host.strip()
+                )
+            )
+        except TypeError:
+            raise ConnectionError("File is invalid or doesn't exist")
+
+    def pool_options(self) -> dict[str, Any]:
+        """ Returns keyword arguments of connection pool (all options accept replica hosts) """
+        options = asdict(self)
+        del options['replica_hosts']
+        return options
@@ -0,0 +1,300 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from mysql.connector import Error, connect
+from mysql.connector.errors import PoolError
+
+# Maximum number of connections opened at once by background warm up
+WARM_UP_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    checkouts: int
+    wait_time: float
+    max_wait_time: float
+    timeouts: int
+    rejections: int
+    in_use: int
+    idle: int
+    created: int
+    destroyed: int
+
+
+class _Slot:
+    """ Connection with timestamps needed for recycling """
+    __slots__ = ('connection', 'created_at', 'last_used_at')
+
+    def __init__(self, connection: Any) -> None:
+        self.connection = connection
+        self.created_at = self.last_used_at = time.monotonic()
+
+
+class ElasticPooledConnection:
+    """ Connection taken from ElasticConnectionPool, close() gives it back to the pool """
+
+    def __init__(self, pool: 'ElasticConnectionPool', slot: _Slot) -> None:
+        self._pool = pool
+        self._slot = slot
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._slot.connection, attr)
+
+    def __enter__(self) -> 'ElasticPooledConnection':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def pool_name(self) -> str | None:
+        return self._pool.pool_name
+
+    def close(self) -> None:
+        if self._slot is not None:
+            slot, self._slot = self._slot, None
+            self._pool._release(slot)
+
+
+class ElasticConnectionPool:
+    """ Thread safe connection pool that grows lazily from min_size up to max_size connections.
+    - when all connections are in use get_connection() waits up to wait_timeout seconds for released one,
+      with max_waiters set callers above that many waiting ones are rejected at once instead of queueing
+    - connections idle for more than idle_timeout seconds are closed, as long as pool keeps min_size connections
+    - liveness of connection (ping) is checked only when it was idle for more than health_check_after seconds
+    - connections older than max_lifetime seconds are closed and replaced with new ones
+    - with warm_in_background min_size connections are opened in parallel by background threads instead of
+      constructor, get_connection() meanwhile waits for them or opens own ones while pool has room
+    Counters of pool usage are returned by stats() """
+
+    def __init__(
+            self,
+            pool_name: str | None = None,
+            min_size: int = 0,
+            max_size: int = 5,
+            pool_reset_session: bool = True,
+            wait_timeout: float = 30.0,
+            idle_timeout: float = 300.0,
+            health_check_after: float = 30.0,
+            max_lifetime: float = 3600.0,
+            connection_factory: Callable[..., Any] = connect,
+            warm_in_background: bool = False,
+            max_waiters: int | None = None,
+            **connection_config: Any
+    ) -> None:
+        if max_size <= 0 or not 0 <= min_size <= max_size:
+            raise AttributeError("Pool sizes should satisfy 0 <= min_size <= max_size and max_size > 0")
+        if max_waiters is not None and max_waiters < 0:
+            raise AttributeError("Pool max_waiters should be None or >= 0")
+        self._pool_name = pool_name
+        self._min_size = min_size
+        self._max_size = max_size
+        self._reset_session = pool_reset_session
+        self._wait_timeout = wait_timeout
+        self._idle_timeout = idle_timeout
+        self._health_check_after = health_check_after
+        self._max_lifetime = max_lifetime
+        self._max_waiters = max_waiters
+        self._connection_factory = connection_factory
+        self._connection_config = connection_config
+
+        self._condition = threading.Condition()
+        self._idle: deque[_Slot] = deque()
+        self._in_use = 0
+        self._checkouts = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._rejections = 0
+        self._waiters = 0
+        self._created = 0
+        self._destroyed = 0
+        # Connections being opened by warm up, they are counted as part of pool size
+        self._warming = 0
+        self._warmed = threading.Event()
+
+        if warm_in_background and min_size:
+            threading.Thread(target=self._warm_up, args=(min_size,), name=f"{pool_name}_WARM_UP", daemon=True).start()
+        else:
+            for _ in range(min_size):
+                self._idle.append(self._create_slot())
+            self._warmed.set()
+
+    @property
+    def pool_name(self) -> str | None:
+        return self._pool_name
+
+    @property
+    def pool_size(self) -> int:
+        return self._max_size
+
+    def get_connection(self) -> ElasticPooledConnection:
+        """ Returns idle connection, opens new one if pool can grow, otherwise waits for released connection.
+        PoolError is raised when no connection was released within wait_timeout, or at once when max_waiters
+        callers already wait """
+        started_at = time.monotonic()
+        deadline = started_at + self._wait_timeout
+        to_close = []
+        try:
+            with self._condition:
+                while True:
+                    to_close.extend(self._reap_idle())
+                    if self._idle:
+                        slot = self._idle.pop()
+                        break
+                    if self._size() < self._max_size:
+                        slot = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolError(f"Failed getting connection; pool exhausted for {self._wait_timeout} seconds")
+                    if self._max_waiters is not None and self._waiters >= self._max_waiters:
+                        self._rejections += 1
+                        raise PoolError(
+                            f"Failed getting connection; pool exhausted and {self._waiters} callers already wait"
+                        )
+                    self._waiters += 1
+                    try:
+                        self._condition.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+                self._in_use += 1
+                waited = time.monotonic() - started_at
+                self._checkouts += 1
+                self._wait_time += waited
+                self._max_wait_time = max(self._max_wait_time, waited)
+        finally:
+            self._close_slots(to_close)
+
+        try:
+            if slot is not None and not self._is_usable(slot):
+                self._close_slots([slot])
+                slot = None
+            if slot is None:
+                slot = self._create_slot()
+        except BaseException:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+        return ElasticPooledConnection(self, slot)
+
+    def wait_until_warm(self, timeout: float | None = None) -> bool:
+        """ Waits until warm up finished, returns False when timeout passed first """
+        return self._warmed.wait(timeout)
+
+    def stats(self) -> PoolStats:
+        """ Returns counters of pool usage, wait_time is total time spent on waiting in get_connection(),
+        rejections counts callers refused because max_waiters callers already waited """
+        with self._condition:
+            return PoolStats(
+                checkouts=self._checkouts,
+                wait_time=self._wait_time,
+                max_wait_time=self._max_wait_time,
+                timeouts=self._timeouts,
+                rejections=self._rejections,
+                in_use=self._in_use,
+                idle=len(self._idle),
+                created=self._created,
+                destroyed=self._destroyed
+            )
+
+    def close(self) -> None:
+        """ Closes all idle connections, connections in use are closed when they are released """
+        with self._condition:
+            to_close, self._idle = list(self._idle), deque()
+            self._max_size = 0
+        self._close_slots(to_close)
+
+    def _release(self, slot: _Slot) -> None:
+        """ Gives connection back to the pool, broken and too old connections are closed """
+        usable = time.monotonic() - slot.created_at < self._max_lifetime
+        if usable and self._reset_session:
+            try:
+                slot.connection.reset_session()
+            except Error:
+                usable = False
+        slot.last_used_at = time.monotonic()
+        with self._condition:
+            self._in_use -= 1
+            if usable and self._size() < self._max_size:
+                self._idle.append(slot)
+                slot = None
+            self._condition.notify()
+        if slot is not None:
+            self._close_slots([slot])
+
+    def _is_usable(self, slot: _Slot) -> bool:
+        """ Checks lifetime of connection and pings it only if it was idle for longer than health_check_after """
+        now = time.monotonic()
+        if now - slot.created_at >= self._max_lifetime:
+            return False
+        if now - slot.last_used_at >= self._health_check_after:
+            return slot.connection.is_connected()
+        return True
+
+    def _reap_idle(self) -> list[_Slot]:
+        """ Removes connections idle for longer than idle_timeout, has to be called with lock held """
+        to_close = []
+        now = time.monotonic()
+        while (
+                self._idle
+                and self._size() > self._min_size
+                and now - self._idle[0].last_used_at >= self._idle_timeout
+        ):
+            to_close.append(self._idle.popleft())
+        return to_close
+
+    def _size(self) -> int:
+        """ Returns number of connections in use, idle and being opened, has to be called with lock held """
+        return self._in_use + len(self._idle) + self._warming
+
+    def _warm_up(self, count: int) -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=min(count, WARM_UP_WORKERS)) as executor:
+                for _ in range(count):
+                    executor.submit(self._warm_one)
+        finally:
+            self._warmed.set()
+
+    def _warm_one(self) -> None:
+        """ Opens one idle connection if pool has room, failures are ignored as pool opens connections on demand """
+        with self._condition:
+            if self._size() >= self._max_size:
+                return
+            self._warming += 1
+        slot = None
+        try:
+            slot = self._create_slot()
+        except Error:
+            pass
+        finally:
+            with self._condition:
+                self._warming -= 1
+                if slot is not None and self._size() < self._max_size:
+                    self._idle.append(slot)
+                    slot = None
+                self._condition.notify()
+        if slot is not None:
+            self._close_slots([slot])
+
+    def _create_slot(self) -> _Slot:
+        slot = _Slot(self._connection_factory(**self._connection_config))
+        with self._condition:
+            self._created += 1
+        return slot
+
+    def _close_slots(self, slots: list[_Slot]) -> None:
+        for slot in slots:
+            try:
+                slot.connection.close()
+            except Error:
+                pass
+        if slots:
+            with self._condition:
+                self._destroyed += len(slots)
@@ -0,0 +1,68 @@
+import os
+import threading
+import weakref
+from typing import Any, Callable
+
+# Pools of current process, they are reset in child process right after fork
+_pools: weakref.WeakSet = weakref.WeakSet()
+
+
+class ForkSafeConnectionPool:
+    """ Connection pool that is created by factory on first use in every process. Pool created before fork is
+    never used by child process, child creates its own one on first get_connection(), so sockets of parent
+    connections aren't shared. Other attributes (pool_name, pool_size, get_read_connection, ...) are taken from
+    pool of current process. Pool is pickled as its factory, so it can be passed to spawned processes when
+    factory can be pickled, e.g. factory created by MySQLConnectionPoolBuilder.build_fork_safe() """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        # Pools inherited from parent are kept referenced, so their connections are never closed by child
+        self._inherited: list[Any] = []
+        _pools.add(self)
+
+    @property
+    def pool(self) -> Any:
+        """ Returns pool of current process, it is created when it doesn't exist yet """
+        pool = self._pool
+        if pool is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pid != os.getpid():
+                    if self._pool is not None:
+                        self._inherited.append(self._pool)
+                    self._pool = self._factory()
+                    self._pid = os.getpid()
+                pool = self._pool
+        return pool
+
+    def get_connection(self) -> Any:
+        return self.pool.get_connection()
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.pool, attr)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {'factory': self._factory}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state['factory'])
+
+    def _after_fork(self) -> None:
+        """ Called in child process, lock could be held by thread of parent that doesn't exist in child """
+        self._lock = threading.Lock()
+        if self._pool is not None:
+            self._inherited.append(self._pool)
+            self._pool = None
+
+
+def _reset_pools_after_fork() -> None:
+    for pool in list(_pools):
+        pool._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
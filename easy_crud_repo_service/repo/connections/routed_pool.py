@@ -0,0 +1,130 @@
+import itertools
+import threading
+import time
+from typing import Any
+
+from mysql.connector import Error
+
+ROUTING_STRATEGIES = ('round_robin', 'least_busy')
+
+
+def validate_strategy(strategy: str) -> None:
+    if strategy not in ROUTING_STRATEGIES:
+        raise ValueError(f"Routing strategy {strategy} is not supported, use one of {ROUTING_STRATEGIES}")
+
+
+class RoutedConnection:
+    """ Connection taken from replica pool, close() gives it back and decreases number of checkouts of replica.
+    Connection of primary has no replica index, its close() happens after commit of write, so it starts
+    read_your_writes_window of current thread """
+
+    def __init__(self, routed_pool: 'RoutedConnectionPool', replica_index: int | None, connection: Any) -> None:
+        self._routed_pool = routed_pool
+        self._replica_index = replica_index
+        self._connection = connection
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._connection, attr)
+
+    def __enter__(self) -> 'RoutedConnection':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            try:
+                connection.close()
+            finally:
+                if self._replica_index is None:
+                    self._routed_pool._written()
+                else:
+                    self._routed_pool._checked_in(self._replica_index)
+
+
+class RoutedConnectionPool:
+    """ Set of one primary pool and replica pools used like a single connection pool.
+    get_connection() always returns connection of primary and get_read_connection() returns connection of one of
+    replicas chosen with round_robin or least_busy strategy. Reads stay on primary for read_your_writes_window seconds
+    after primary connection was taken and after it was given back (so after commit of write) in the same thread,
+    so rows just written are visible. When replica can't give a connection, next replicas and finally primary are
+    used """
+
+    def __init__(
+            self,
+            primary: Any,
+            replicas: list[Any] | None = None,
+            strategy: str = 'round_robin',
+            read_your_writes_window: float = 1.0
+    ) -> None:
+        validate_strategy(strategy)
+        self._primary = primary
+        self._replicas = list(replicas or [])
+        self._strategy = strategy
+        self._read_your_writes_window = read_your_writes_window
+        self._lock = threading.Lock()
+        self._busy = [0] * len(self._replicas)
+        self._next = itertools.count()
+        self._last_write = threading.local()
+
+    @property
+    def pool_name(self) -> str:
+        return self._primary.pool_name
+
+    @property
+    def pool_size(self) -> int:
+        return self._primary.pool_size
+
+    @property
+    def primary(self) -> Any:
+        return self._primary
+
+    @property
+    def replicas(self) -> list[Any]:
+        return list(self._replicas)
+
+    def get_connection(self) -> Any:
+        """ Returns connection of primary, reads of current thread stay on primary while it is used and for
+        read_your_writes_window after it is closed """
+        connection = RoutedConnection(self, None, self._primary.get_connection())
+        self._written()
+        return connection
+
+    def get_read_connection(self) -> Any:
+        """ Returns connection of replica or primary connection when current thread has written recently """
+        last_write = getattr(self._last_write, 'at', None)
+        if (
+                not self._replicas
+                or last_write is not None and time.monotonic() - last_write < self._read_your_writes_window
+        ):
+            return self._primary.get_connection()
+
+        for index in self._replicas_order():
+            with self._lock:
+                self._busy[index] += 1
+            try:
+                return RoutedConnection(self, index, self._replicas[index].get_connection())
+            except Error:
+                self._checked_in(index)
+        return self._primary.get_connection()
+
+    def _replicas_order(self) -> list[int]:
+        """ Returns indexes of replicas in order in which they should be tried """
+        replicas_number = len(self._replicas)
+        start = next(self._next) % replicas_number
+        order = [(start + i) % replicas_number for i in range(replicas_number)]
+        if self._strategy == 'least_busy':
+            # Replicas with the same number of checkouts are still taken in turns
+            with self._lock:
+                busy = list(self._busy)
+            order.sort(key=busy.__getitem__)
+        return order
+
+    def _written(self) -> None:
+        self._last_write.at = time.monotonic()
+
+    def _checked_in(self, replica_index: int) -> None:
+        with self._lock:
+            self._busy[replica_index] -= 1
@@ -1,138 +1,688 @@
-import inflection
+import copy
+import os
+import tempfile
+import time
+import weakref
 from datetime import datetime, date
-from typing import Any
+from itertools import islice
+from typing import Any, Iterable, Iterator, ContextManager
 from contextlib import contextmanager
 
 from mysql.connector import pooling, Error
 
+from easy_crud_repo_service.repo.buffered import BufferedCrudRepo
+from easy_crud_repo_service.repo.cache import CacheBackend, MISSING
+from easy_crud_repo_service.repo.change_tracking import ChangeTracker, StaleEntityError
+from easy_crud_repo_service.repo.entity_descriptor import describe
+from easy_crud_repo_service.repo.export import validate_format, write_batches
+from easy_crud_repo_service.repo.instrumentation import Instrumentation
+from easy_crud_repo_service.repo.load_data import (
+    LINE_TERMINATORS, LOCAL_INFILE_DISABLED_ERRORS, read_rows, write_rows
+)
+from easy_crud_repo_service.repo.parallel import ParallelRepo
+from easy_crud_repo_service.repo.prepared import PreparedStatements
+from easy_crud_repo_service.repo.query import Query
+from easy_crud_repo_service.repo.relationships import LazyProxy
+from easy_crud_repo_service.repo.row_formats import collect_rows
+from easy_crud_repo_service.repo.schema import TableSchema, bootstrap
+from easy_crud_repo_service.repo.transaction import Transaction, active_transaction, transaction
+
+# Maximum number of placeholders that MySQL accepts in one prepared statement
+MAX_PLACEHOLDERS = 65535
+
+AUTO_INCREMENT_STATEMENT = 'select @@auto_increment_increment'
+
+# auto_increment_increment of every connection pool, pools are weakly referenced
+_auto_increment_settings: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def cached_auto_increment(connection_pool: Any) -> int | None:
+    """ Returns auto_increment_increment already read for connection pool, None when it wasn't read yet """
+    return _auto_increment_settings.get(connection_pool)
+
+
+def cache_auto_increment(connection_pool: Any, row: tuple[Any]) -> int:
+    """ Converts row of AUTO_INCREMENT_STATEMENT into increment of ids and keeps it for connection pool """
+    increment = _auto_increment_settings[connection_pool] = int(row[0])
+    return increment
+
+
 class CrudRepo:
 
-    def __init__(self, connection_pool: pooling.MySQLConnectionPool,  entity: type) -> None:
+    def __init__(
+            self,
+            connection_pool: pooling.MySQLConnectionPool,
+            entity: type,
+            prepared: bool = False,
+            cache: CacheBackend | None = None,
+            instrumentation: Instrumentation | None = None,
+            track_changes: bool = False,
+            version_column: str | None = None,
+            validate_schema: bool = False
+    ) -> None:
+        """ With track_changes snapshots of rows read by repo are kept and update(), update_many() and save()
+        write only changed columns, unchanged items aren't written at all. With version_column (integer field of
+        entity) rows are updated only when their version didn't change since they were read, otherwise
+        StaleEntityError is raised, and the version is incremented. With validate_schema columns of table are read
+        once per pool (see schema.bootstrap()) and SchemaMismatchError is raised when entity doesn't match them """
         self._connection_pool = connection_pool
         self._entity = entity
-        self._entity_type = type(entity())
+        self._entity_type = entity
+        self._descriptor = describe(entity)
+        self._prepared = prepared
+        self._cache = cache
+        self._instrumentation = instrumentation
+        self._related_repos: dict[type, CrudRepo] = {}
+        insert_fields_names = self._descriptor.insert_fields_names
+        if version_column is not None and version_column not in insert_fields_names:
+            raise ValueError(f"Entity {entity.__name__} has no field {version_column}")
+        self._version_column = version_column
+        self._version_index = None if version_column is None else insert_fields_names.index(version_column)
+        self._tracker = ChangeTracker(insert_fields_names, version_column) if track_changes else None
+        if validate_schema:
+            bootstrap(connection_pool, [entity])
 
     @contextmanager
-    def _get_cursor_object(self):
-        """ Context manager that allows us to work on cursor in safe manner """
-        connection_object = self._connection_pool.get_connection()
+    def _get_cursor_object(self, read_only: bool = False, prepared: bool | None = None, operation: str = 'execute'):
+        """ Context manager that allows us to work on cursor in safe manner. Inside of transaction cursor of its
+        connection is used, commit and rollback are left to the transaction. Read only statements use
+        get_read_connection() of pool when it routes reads to replicas. Prepared statements are reused by all
+        statements with the same sql executed on the connection until it is released (see PreparedStatements).
+        With instrumentation statements are measured and reported under name of operation """
+        prepared = self._prepared if prepared is None else prepared
+        active = active_transaction(self._connection_pool)
+        if active is not None:
+            cursor_object = active.prepared_statements().cursor() if prepared else active.connection.cursor()
+            if self._instrumentation is not None:
+                cursor_object = self._instrumentation.cursor(cursor_object, self._entity.__name__, operation, 0.0)
+            try:
+                yield cursor_object
+            finally:
+                cursor_object.close()
+            return
 
+        # Liveness of connection is checked by the pool, there is no ping on every checkout and release
+        started_at = time.perf_counter() if self._instrumentation is not None else 0.0
+        if read_only and hasattr(self._connection_pool, 'get_read_connection'):
+            connection_object = self._connection_pool.get_read_connection()
+        else:
+            connection_object = self._connection_pool.get_connection()
+        cursor_object = None
+        statements = PreparedStatements(connection_object) if prepared else None
         try:
-            if connection_object.is_connected():
-                cursor_object = connection_object.cursor()
-                yield cursor_object
-                connection_object.commit()
-        except Error as e:
-            connection_object.rollback()
+            cursor_object = statements.cursor() if prepared else connection_object.cursor()
+            if self._instrumentation is not None:
+                pool_wait = time.perf_counter() - started_at
+                cursor_object = self._instrumentation.cursor(cursor_object, self._entity.__name__, operation, pool_wait)
+            yield cursor_object
+            connection_object.commit()
+        except Exception as e:
+            # Errors raised by caller, e.g. StaleEntityError, roll back statements executed before them
+            try:
+                connection_object.rollback()
+            except Error:
+                # Broken connection can't be rolled back, server rolls back transaction of closed session
+                pass
             raise e
         finally:
-            if connection_object.is_connected():
-                cursor_object.close()
+            try:
+                if cursor_object is not None:
+                    cursor_object.close()
+                if statements is not None:
+                    statements.close()
+            finally:
                 connection_object.close()
 
     def _table_name(self) -> str:
-        """ Creates table name using inflection.tableize() that will change expression for lowercase plural"""
-        return inflection.tableize(self._entity_type.__name__)
+        """ Returns table name created once per entity using inflection.tableize() (lowercase plural)"""
+        return self._descriptor.table_name
 
     def _fields_names(self) -> list[str]:
-        """ Returns namespace keys of entity"""
-        return list(self._entity().__dict__.keys())
+        """ Returns names of entity fields"""
+        return list(self._descriptor.fields_names)
 
     def _column_names_for_insert(self) -> str:
-        """ Returns all namespace keys of entity accept id"""
-        return ', '.join([field for field in self._fields_names() if field.lower() != 'id'])
+        """ Returns all names of entity fields accept id"""
+        return self._descriptor.insert_columns
+
+    def _insert_fields_names(self) -> list[str]:
+        """ Returns names of fields that are written by insert and update statements (All accept id) """
+        return list(self._descriptor.insert_fields_names)
+
+    def schema(self) -> TableSchema | None:
+        """ Returns columns of table read from information_schema, they are read once per connection pool """
+        return bootstrap(self._connection_pool, [self._entity], validate=False)[self._entity]
+
+    def _statement(self, operation: str) -> str:
+        """ Returns parameterized sql of operation compiled once for given entity """
+        return self._descriptor.statements[operation]
+
+    def _insert_values(self, item: Any) -> tuple[Any, ...]:
+        """ Returns values of item that are bound to insert and update statements (All accept id) """
+        return self._descriptor.insert_values(item)
+
+    def _invalidate(self, items_ids: list[int]) -> None:
+        """ Removes rows with provided ids from cache. Inside of transaction they are removed again when it ends,
+        because other threads could cache committed state of rows in the meantime """
+        if self._tracker is not None and active_transaction(self._connection_pool) is not None:
+            # Snapshots of rows written in transaction could be rolled back, so next updates write all columns
+            active_transaction(self._connection_pool).on_finish(lambda: self._tracker.forget(items_ids))
+        if self._cache is not None:
+            keys = [(self._descriptor.table_name, item_id) for item_id in items_ids]
+            self._cache.invalidate(keys)
+            active = active_transaction(self._connection_pool)
+            if active is not None:
+                active.on_finish(lambda: self._cache.invalidate(keys))
+
+    def _tracked(self, items: list[Any]) -> list[Any]:
+        """ Keeps snapshots of read items when changes are tracked """
+        if self._tracker is not None:
+            insert_values = self._descriptor.insert_values
+            self._tracker.snapshot_many((self._descriptor.id_of(item), insert_values(item)) for item in items)
+        return items
+
+    def _shared(self, item: Any) -> Any:
+        """ Entities of cache are never handed out, callers can modify returned entities in place """
+        return copy.copy(item)
+
+    def _cache_of_reads(self) -> CacheBackend | None:
+        """ Returns cache used by reads. Inside of transaction it is skipped, so rows written by transaction and
+        not committed yet are read from database and they aren't cached. Reads that fill cache aren't routed to
+        replicas """
+        if self._cache is None or active_transaction(self._connection_pool) is not None:
+            return None
+        return self._cache
+
+    def forget(self, items: list[Any] | None = None) -> None:
+        """ Removes snapshots of items or all snapshots, next updates of these items write all columns """
+        if self._tracker is not None:
+            if items is None:
+                self._tracker.clear()
+            else:
+                self._tracker.forget([self._descriptor.id_of(item) for item in items])
+
+    def transaction(self) -> ContextManager[Transaction]:
+        """ Starts transaction shared by all repos that use the same connection pool, see transaction() """
+        return transaction(self._connection_pool)
+
+    def parallel(self, workers: int | None = None, chunk_size: int = 10_000, atomic: bool = False) -> ParallelRepo:
+        """ Returns ParallelRepo running batch operations of this repo in chunks on worker threads, see ParallelRepo """
+        return ParallelRepo(self, workers, chunk_size, atomic)
+
+    def buffered(
+            self,
+            batch_size: int = 1000,
+            flush_interval: float = 0.05,
+            max_pending: int = 10_000
+    ) -> BufferedCrudRepo:
+        """ Returns BufferedCrudRepo writing inserts of many calls with multi row statements, see BufferedCrudRepo """
+        return BufferedCrudRepo(self, batch_size, flush_interval, max_pending)
 
     def insert(self, item: Any) -> int:
         """ Inserts one new row into database table """
-        with self._get_cursor_object() as cur:
-            sql = f'insert into {self._table_name()} ' \
-                  f'({self._column_names_for_insert()}) ' \
-                  f'values ({self._column_values_for_insert(item)});'
-            cur.execute(sql)
-            return cur.lastrowid
-
-    def insert_many(self, items: list[Any]) -> list[int]:
-        """ Inserts multiple new rows into database table """
-        with self._get_cursor_object() as cur:
-            values = ", ".join([f"({CrudRepo._column_values_for_insert(item)})" for item in items])
-            sql = f"insert into {self._table_name()} ({self._column_names_for_insert()}) values {values}"
-            cur.execute(sql)
-        return [item.id for item in self.find_n_last(len(items))]
-
-    def update(self, item_id: int, item: Any) -> Any:
-        """ Updates database table row using provided id and object containing new values"""
-        with self._get_cursor_object() as cur:
-            sql = f"update {self._table_name()} set {CrudRepo._column_names_and_values_for_update(item)} where id = {item_id}"
-            cur.execute(sql)
-        return self.find_one(item_id)
+        with self._get_cursor_object(operation='insert') as cur:
+            cur.execute(self._statement('insert'), self._insert_values(item))
+            item_id = cur.lastrowid
+        self._invalidate([item_id])
+        return item_id
+
+    def insert_many(self, items: list[Any], batch_size: int = 1000) -> list[int]:
+        """ Inserts multiple new rows into database table using multi row statements of at most batch_size rows.
+        Ids are returned in order of items. They are computed from first id of every statement, multi row insert
+        with values and without ids is a simple insert, InnoDB reserves consecutive ids (auto_increment_increment
+        apart) for all its rows at once in every innodb_autoinc_lock_mode, interleaved mode (2) included """
+        if not items:
+            return []
+        columns_number = max(len(self._descriptor.insert_fields_names), 1)
+        batch_size = max(1, min(batch_size, MAX_PLACEHOLDERS // columns_number))
+        ids = []
+        with self._get_cursor_object(operation='insert_many') as cur:
+            increment = self._auto_increment(cur)
+            for start in range(0, len(items), batch_size):
+                batch = items[start:start + batch_size]
+                values = [value for item in batch for value in self._insert_values(item)]
+                cur.execute(self._descriptor.insert_many_statement(len(batch)), values)
+                ids.extend(range(cur.lastrowid, cur.lastrowid + len(batch) * increment, increment))
+        self._invalidate(ids)
+        return ids
+
+    def bulk_load(
+            self,
+            source: Iterable[Any] | str | os.PathLike,
+            batch_size: int = 1000,
+            fallback: bool = True,
+            line_terminator: str = '\n'
+    ) -> int:
+        """ Loads rows with LOAD DATA LOCAL INFILE, which is much faster than inserts for huge imports.
+        Source is iterable of entities, streamed line by line into temporary file, or path of file in default
+        LOAD DATA format: tab separated values of all fields accept id, escaped with backslash, NULL written as \\N.
+        Lines of file end with line_terminator, '\\n' or '\\r\\n'. Connection pool needs allow_local_infile=True.
+        When local infile is disabled and fallback is True, rows are read back from file and inserted with multi row
+        statements of batch_size rows. Returns number of rows """
+        if line_terminator not in LINE_TERMINATORS:
+            raise ValueError(f"Line terminator should be one of {LINE_TERMINATORS}")
+        if isinstance(source, (str, os.PathLike)):
+            return self._load_file(os.fspath(source), batch_size, fallback, line_terminator)
+        file = tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', newline='', delete=False)
+        try:
+            # File is removed also when source or conversion of its entities fails in the middle of writing
+            with file:
+                write_rows(map(self._insert_values, source), file)
+            return self._load_file(file.name, batch_size, fallback, '\n')
+        finally:
+            os.remove(file.name)
+
+    def _load_file(self, path: str, batch_size: int, fallback: bool, line_terminator: str) -> int:
+        """ Executes LOAD DATA of file or inserts rows read from it when local infile is disabled. Both split
+        lines only on line_terminator, so '\\r' of '\\r\\n' lines doesn't end up in the last column """
+        try:
+            # LOAD DATA can't be prepared, file name and terminator are bound by the connector on plain cursor
+            with self._get_cursor_object(prepared=False, operation='bulk_load') as cur:
+                cur.execute(self._statement('load_data'), (path, line_terminator))
+                return cur.rowcount
+        except Error as e:
+            if not fallback or e.errno not in LOCAL_INFILE_DISABLED_ERRORS:
+                raise e
+
+        columns_number = max(len(self._descriptor.insert_fields_names), 1)
+        batch_size = max(1, min(batch_size, MAX_PLACEHOLDERS // columns_number))
+        loaded = 0
+        with open(path, encoding='utf-8', newline='') as file, self._get_cursor_object(operation='bulk_load') as cur:
+            rows = read_rows(file, line_terminator)
+            while batch := list(islice(rows, batch_size)):
+                cur.execute(self._descriptor.insert_many_statement(len(batch)), [v for row in batch for v in row])
+                loaded += len(batch)
+        return loaded
+
+    def _auto_increment(self, cur: Any) -> int:
+        """ Returns auto_increment_increment of server, it is read once per connection pool using provided cursor """
+        increment = cached_auto_increment(self._connection_pool)
+        if increment is None:
+            cur.execute(AUTO_INCREMENT_STATEMENT)
+            increment = cache_auto_increment(self._connection_pool, cur.fetchone())
+        return increment
+
+    def update(self, item_id: int, item: Any, reload: bool = True) -> Any:
+        """ Updates database table row using provided id and object containing new values. Updated row is read
+        again and returned, with reload=False it isn't and only id is returned. With tracked changes only changed
+        columns are written and when nothing changed no statement is executed and item itself is returned """
+        values = self._insert_values(item)
+        if self._tracker is None and self._version_column is None:
+            with self._get_cursor_object(operation='update') as cur:
+                cur.execute(self._statement('update'), (*values, item_id))
+            self._invalidate([item_id])
+            return self.find_one(item_id) if reload else item_id
+
+        columns = self._changed_columns(item_id, values)
+        if not columns:
+            return item if reload else item_id
+        statement = self._descriptor.update_columns_statement(columns, self._version_column)
+        params = [getattr(item, column) for column in columns]
+        params.append(item_id)
+        if self._version_column is not None:
+            params.append(values[self._version_index])
+        with self._get_cursor_object(operation='update') as cur:
+            cur.execute(statement, params)
+            updated = cur.rowcount
+        self._invalidate([item_id])
+        if self._version_column is not None and not updated:
+            raise StaleEntityError(f"Item with id {item_id} was changed or deleted by another writer")
+        self._written([(item_id, item)])
+        return self.find_one(item_id) if reload else item_id
+
+    def save(self, item: Any) -> int:
+        """ Inserts item without id and sets id assigned by database on it, item with id is updated with its
+        changed columns. Saved item is tracked, so its next save writes only columns changed in the meantime """
+        item_id = self._descriptor.id_of(item)
+        if item_id is not None:
+            return self.update(item_id, item, reload=False)
+        item_id = self.insert(item)
+        setattr(item, self._descriptor.fields_names[self._descriptor.id_index], item_id)
+        self._tracked([item])
+        return item_id
+
+    def _changed_columns(self, item_id: int, values: tuple[Any, ...]) -> tuple[str, ...]:
+        """ Returns columns of row that have to be written, all accept id and version when row isn't tracked """
+        changed = None if self._tracker is None else self._tracker.changed(item_id, values)
+        if changed is None:
+            return tuple(name for name in self._descriptor.insert_fields_names if name != self._version_column)
+        return changed
+
+    def _written(self, updates: list[tuple[int, Any]]) -> None:
+        """ Increments versions of written items and keeps their values as new snapshots """
+        if self._version_column is not None:
+            for _, item in updates:
+                setattr(item, self._version_column, (getattr(item, self._version_column) or 0) + 1)
+        if self._tracker is not None:
+            self._tracker.snapshot_many((item_id, self._insert_values(item)) for item_id, item in updates)
+
+    def update_many(self, items: list[Any], batch_size: int = 500) -> list[int]:
+        """ Updates rows with ids of items using batched 'case id when ...' statements of at most batch_size rows.
+        Ids are returned in order of items, rows are not read again """
+        return self._update_rows([(self._descriptor.id_of(item), item) for item in items], batch_size)
+
+    def _update_rows(self, updates: list[tuple[int, Any]], batch_size: int = 500) -> list[int]:
+        """ Updates rows with (id, item) pairs in one transaction. With tracked changes unchanged items are skipped
+        and every statement sets only columns changed in any of its rows """
+        items_ids = [item_id for item_id, _ in updates]
+        if self._tracker is not None or self._version_column is not None:
+            changes = [
+                (item_id, item, self._changed_columns(item_id, self._insert_values(item))) for item_id, item in updates
+            ]
+            updates = [(item_id, item) for item_id, item, changed in changes if changed]
+            changed_columns = {column for _, _, changed in changes for column in changed}
+            columns = tuple(name for name in self._descriptor.insert_fields_names if name in changed_columns)
+        else:
+            columns = self._descriptor.insert_fields_names
+        if not updates:
+            return items_ids
+        placeholders_per_row = 2 * len(columns) + 1 + (2 if self._version_column is not None else 0)
+        batch_size = max(1, min(batch_size, MAX_PLACEHOLDERS // placeholders_per_row))
+        indexes = [self._descriptor.insert_fields_names.index(column) for column in columns]
+        with self._get_cursor_object(operation='update_many') as cur:
+            for start in range(0, len(updates), batch_size):
+                batch = updates[start:start + batch_size]
+                rows_values = [(item_id, self._insert_values(item)) for item_id, item in batch]
+                params = [
+                    value
+                    for column in indexes
+                    for item_id, values in rows_values
+                    for value in (item_id, values[column])
+                ]
+                params.extend(item_id for item_id, _ in batch)
+                if self._version_column is not None:
+                    version_index = self._version_index
+                    params.extend(
+                        value for item_id, values in rows_values for value in (item_id, values[version_index])
+                    )
+                cur.execute(self._descriptor.update_many_statement(len(batch), columns, self._version_column), params)
+                if self._version_column is not None and cur.rowcount < len(batch):
+                    batch_ids = [item_id for item_id, _ in batch]
+                    self._invalidate(batch_ids)
+                    raise StaleEntityError(
+                        f"Some of items with ids {batch_ids} were changed or deleted by another writer"
+                    )
+        self._invalidate([item_id for item_id, _ in updates])
+        self._written(updates)
+        return items_ids
+
+    def upsert_many(self, items: list[Any], batch_size: int = 1000) -> list[int]:
+        """ Inserts or updates items in one transaction. Items with ids are written with 'insert ... on duplicate
+        key update', so existing rows are updated and missing ones are created with these ids. Items without ids
+        are inserted by insert_many. Ids are returned in order of items without additional select. Snapshots of
+        upserted rows are forgotten, repo with version column can't upsert, because versions of updated rows
+        can't be checked by 'on duplicate key update' """
+        if self._version_column is not None:
+            raise RuntimeError(
+                "upsert_many can't check version of rows, use insert_many and update_many of versioned repo"
+            )
+        with_ids = [(index, item) for index, item in enumerate(items) if self._descriptor.id_of(item) is not None]
+        without_ids = [(index, item) for index, item in enumerate(items) if self._descriptor.id_of(item) is None]
+        ids = [None] * len(items)
+        batch_size = max(1, min(batch_size, MAX_PLACEHOLDERS // len(self._descriptor.fields_names)))
+        with self.transaction():
+            with self._get_cursor_object(operation='upsert_many') as cur:
+                for start in range(0, len(with_ids), batch_size):
+                    batch = [item for _, item in with_ids[start:start + batch_size]]
+                    values = [value for item in batch for value in self._descriptor.all_values(item)]
+                    cur.execute(self._descriptor.upsert_many_statement(len(batch)), values)
+            for index, item in with_ids:
+                ids[index] = self._descriptor.id_of(item)
+            inserted_ids = self.insert_many([item for _, item in without_ids], batch_size)
+            for (index, _), item_id in zip(without_ids, inserted_ids):
+                ids[index] = item_id
+        upserted_ids = [self._descriptor.id_of(item) for _, item in with_ids]
+        self._invalidate(upserted_ids)
+        if self._tracker is not None:
+            self._tracker.forget(upserted_ids)
+        return ids
 
     def find_n_last(self, n: int) -> list[Any]:
         """ Finds n last rows in table """
-        with self._get_cursor_object() as cur:
-            sql = f'select * from {self._table_name()} order by id desc limit {n}'
-            cur.execute(sql)
-            return [self._entity(*row) for row in cur.fetchall()]
+        with self._get_cursor_object(read_only=True, operation='find_n_last') as cur:
+            cur.execute(self._statement('find_n_last'), (n,))
+            return self._tracked(self._descriptor.rows_to_entities(cur.fetchall()))
 
     def find_one(self, item_id: int) -> Any:
-        """ Finds one row in table using provided id"""
-        with self._get_cursor_object() as cur:
-            sql = f"select * from {self._table_name()} where id = {item_id}"
-            cur.execute(sql)
+        """ Finds one row in table using provided id, when repo has cache it is checked first"""
+        cache = self._cache_of_reads()
+        if cache is not None:
+            key = (self._descriptor.table_name, item_id)
+            cached = cache.get(key)
+            if cached is not MISSING:
+                return self._tracked([self._shared(cached)])[0]
+            generation = cache.generation(key)
+        # Rows that fill cache are read from primary, replica could return row replaced before invalidation
+        with self._get_cursor_object(read_only=cache is None, operation='find_one') as cur:
+            cur.execute(self._statement('find_one'), (item_id,))
             result = cur.fetchone()
             if not result:
                 raise RuntimeError(f"Item with id {item_id} wasn't found")
-            return self._entity(*result)
+        item = self._descriptor.row_to_entity(result)
+        if cache is not None:
+            cache.fill(key, self._shared(item), generation)
+        return self._tracked([item])[0]
+
+    def find_all(self, include: list[str] | None = None) -> list[Any]:
+        """ Finds all rows in table, related entities named in include are loaded in batches, see load_related() """
+        with self._get_cursor_object(read_only=True, operation='find_all') as cur:
+            cur.execute(self._statement('find_all'))
+            items = self._tracked(self._descriptor.rows_to_entities(cur.fetchall()))
+        return self.load_related(items, *include) if include else items
+
+    def load_related(self, items: list[Any], *names: str) -> list[Any]:
+        """ Sets related entities of items. Distinct foreign keys of all items are collected and parents are found
+        with find_many of repo of related entity, so every parent is built once and shared by its items.
+        Parents that don't exist are set to None """
+        for name in names:
+            relationship = self._relationship(name)
+            repo = self._related_repo(relationship.entity)
+            keys = [getattr(item, relationship.foreign_key) for item in items]
+            ids = [key for key in dict.fromkeys(keys) if key is not None]
+            parents = {repo._descriptor.id_of(parent): parent for parent in repo.find_many(ids, ignore_missing=True)}
+            for item, key in zip(items, keys):
+                setattr(item, name, parents.get(key))
+        return items
 
-    def find_all(self) -> list[Any]:
-        """ Finds all rows in table """
-        with self._get_cursor_object() as cur:
-            sql = f"select * from {self._table_name()}"
-            cur.execute(sql)
-            return [self._entity(*row) for row in cur.fetchall()]
+    def related(self, item: Any, name: str) -> LazyProxy:
+        """ Returns proxy of entity related to item, it is found on first access to its attributes """
+        relationship = self._relationship(name)
+        repo = self._related_repo(relationship.entity)
+        key = getattr(item, relationship.foreign_key)
+        return LazyProxy(lambda: None if key is None else repo.find_one(key))
+
+    def _relationship(self, name: str) -> Any:
+        relationship = self._descriptor.relationships.get(name)
+        if relationship is None:
+            raise ValueError(f"Entity {self._descriptor.entity.__name__} has no relationship {name}")
+        return relationship
+
+    def _related_repo(self, entity: type) -> 'CrudRepo':
+        """ Returns repo of related entity sharing pool, cache and instrumentation of this repo """
+        repo = self._related_repos.get(entity)
+        if repo is None:
+            repo = CrudRepo(self._connection_pool, entity, self._prepared, self._cache, self._instrumentation)
+            self._related_repos[entity] = repo
+        return repo
+
+    def find_many(
+            self,
+            items_ids: list[int],
+            chunk_size: int = 1000,
+            ignore_missing: bool = False,
+            include: list[str] | None = None
+    ) -> list[Any]:
+        """ Finds rows with provided ids using 'id in (...)' queries of at most chunk_size ids on one connection.
+        Rows are returned in order of ids. When some of them are not found RuntimeError listing them is raised,
+        unless ignore_missing is set, then missing ids are skipped. Related entities named in include are loaded """
+        found = {}
+        table_name = self._descriptor.table_name
+        cache = self._cache_of_reads()
+        if cache is not None:
+            for item_id in items_ids:
+                cached = cache.get((table_name, item_id))
+                if cached is not MISSING:
+                    found[item_id] = self._shared(cached)
+        ids_to_find = list(dict.fromkeys(item_id for item_id in items_ids if item_id not in found))
+        if ids_to_find:
+            if cache is not None:
+                generations = {item_id: cache.generation((table_name, item_id)) for item_id in ids_to_find}
+            id_index = self._descriptor.id_index
+            with self._get_cursor_object(read_only=cache is None, operation='find_many') as cur:
+                for start in range(0, len(ids_to_find), chunk_size):
+                    chunk = ids_to_find[start:start + chunk_size]
+                    cur.execute(self._descriptor.find_many_statement(len(chunk)), chunk)
+                    for row in cur.fetchall():
+                        item = self._descriptor.row_to_entity(row)
+                        found[row[id_index]] = item
+                        if cache is not None and row[id_index] in generations:
+                            cache.fill((table_name, row[id_index]), self._shared(item), generations[row[id_index]])
+        missing_ids = [item_id for item_id in items_ids if item_id not in found]
+        if missing_ids and not ignore_missing:
+            raise RuntimeError(f"Items with ids {missing_ids} weren't found")
+        items = self._tracked([found[item_id] for item_id in items_ids if item_id in found])
+        return self.load_related(items, *include) if include else items
+
+    def exists(self, item_id: int) -> bool:
+        """ Checks if row with provided id exists without reading it """
+        with self._get_cursor_object(read_only=True, operation='exists') as cur:
+            cur.execute(self._statement('exists'), (item_id,))
+            return cur.fetchone() is not None
+
+    def count(self) -> int:
+        """ Returns number of rows in table """
+        with self._get_cursor_object(read_only=True, operation='count') as cur:
+            cur.execute(self._statement('count'))
+            return cur.fetchone()[0]
+
+    def find_all_rows(self, row_format: str = 'tuple', batch_size: int = 10_000) -> Any:
+        """ Finds all rows in table without creating entities, for analytics and bulk processing.
+        row_format is one of: tuple, dict, columns (dict of lists), numpy (dict of arrays, needs numpy) or entity.
+        Rows are fetched in batches of batch_size rows """
+        with self._get_cursor_object(read_only=True, operation='find_all_rows') as cur:
+            cur.execute(self._statement('find_all'))
+            batches = iter(lambda: cur.fetchmany(batch_size), [])
+            return collect_rows(batches, self._descriptor.fields_names, row_format, self._descriptor.rows_to_entities)
+
+    def export(self, destination: Any, format: str = 'csv', batch_size: int = 10_000, **criteria: Any) -> int:
+        """ Streams rows to file path or stream in csv, jsonl or parquet (needs pyarrow) format and returns number
+        of rows. Rows can be filtered with the same criteria as find_by(), query().export() takes any query.
+        Rows are fetched from unbuffered cursor in batches of batch_size rows, so memory use doesn't depend
+        on size of table """
+        return self.query().where(**criteria).export(destination, format, batch_size)
+
+    def _export(
+            self,
+            sql: str,
+            params: list[Any],
+            names: tuple[str, ...],
+            destination: Any,
+            export_format: str,
+            batch_size: int
+    ) -> int:
+        """ Executes select and writes its rows batch by batch, header names are names of selected fields """
+        validate_format(export_format)
+        types = {field.name: field.type for field in self._descriptor.fields}
+        with self._get_cursor_object(read_only=True, operation='export') as cur:
+            cur.execute(sql, params)
+            batches = iter(lambda: cur.fetchmany(batch_size), [])
+            return write_batches(batches, names, destination, export_format, types)
+
+    def query(self) -> Query:
+        """ Returns query on entity table that can be filtered, projected, ordered and paginated """
+        return Query(self)
+
+    def find_by(self, **criteria: Any) -> list[Any]:
+        """ Finds rows matching all criteria, e.g. find_by(name='A', points__gte=10). Lookups are described in Query """
+        return self.query().where(**criteria).all()
+
+    def _select(self, sql: str, params: list[Any]) -> list[tuple[Any, ...]]:
+        """ Executes select statement and returns all its rows """
+        with self._get_cursor_object(read_only=True, operation='query') as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    def iter_all(self, page_size: int = 1000) -> Iterator[Any]:
+        """ Lazily yields all rows of table ordered by id. Rows are read in pages of page_size rows using keyset
+        pagination (where id > last id), connection is taken from pool only for time of reading single page.
+        Rows are not tracked by repo with track_changes """
+        last_id = None
+        while True:
+            with self._get_cursor_object(read_only=True, operation='iter_all') as cur:
+                if last_id is None:
+                    cur.execute(self._statement('find_first_page'), (page_size,))
+                else:
+                    cur.execute(self._statement('find_next_page'), (last_id, page_size))
+                rows = cur.fetchall()
+            if not rows:
+                return
+            # Streamed rows aren't tracked, snapshots of whole table would be kept otherwise
+            yield from self._descriptor.rows_to_entities(rows)
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][self._descriptor.id_index]
 
     def delete_one(self, item_id: int) -> int:
         """ Deletes one row in table using provided id"""
-        with self._get_cursor_object() as cur:
-            sql = f"delete from {self._table_name()} where id = {item_id}"
-            self.find_one(item_id)
-            cur.execute(sql)
-            return item_id
+        with self._get_cursor_object(operation='delete_one') as cur:
+            cur.execute(self._statement('delete_one'), (item_id,))
+            deleted = cur.rowcount
+        self._invalidate([item_id])
+        if self._tracker is not None:
+            self._tracker.forget([item_id])
+        if not deleted:
+            raise RuntimeError(f"Item with id {item_id} wasn't found")
+        return item_id
 
     def delete_many(self, items: list[Any]) -> list[int]:
         """ Deletes multiple rows in table using entities"""
-        items_ids = [item.id for item in items]
-        with self._get_cursor_object() as cur:
-            sql = f"delete from {self._table_name()} where id in {str(tuple(items_ids))}"
-            cur.execute(sql)
-            return items_ids
+        return self.delete_many_by_id([item.id for item in items])
 
     def delete_many_by_id(self, items_ids: list[int]) -> list[int]:
-        with self._get_cursor_object() as cur:
-            sql = f"delete from {self._table_name()} where id in {str(tuple(items_ids))}"
-            cur.execute(sql)
-            return items_ids
+        """ Deletes multiple rows in table using ids"""
+        if not items_ids:
+            return []
+        with self._get_cursor_object(operation='delete_many_by_id') as cur:
+            cur.execute(self._descriptor.delete_many_statement(len(items_ids)), tuple(items_ids))
+        self._invalidate(items_ids)
+        if self._tracker is not None:
+            self._tracker.forget(items_ids)
+        return items_ids
 
-    def delete_all(self) -> list[int]:
-        """ Deletes all rows from a table """
-        with self._get_cursor_object() as cur:
-            all_deleted_items = [item.id for item in self.find_all()]
-            sql = f'delete from {self._table_name()} where id >= 1'
-            cur.execute(sql)
-            return all_deleted_items
+    def delete_all(self, page_size: int = 1000) -> list[int]:
+        """ Deletes all rows from a table. Only ids are read, page by page, and rows are deleted by these pages """
+        all_deleted_items = []
+        with self._get_cursor_object(operation='delete_all') as cur:
+            cur.execute(self._statement('find_first_ids_page'), (page_size,))
+            ids = [row[0] for row in cur.fetchall()]
+            while ids:
+                cur.execute(self._descriptor.delete_many_statement(len(ids)), ids)
+                all_deleted_items.extend(ids)
+                if len(ids) < page_size:
+                    break
+                cur.execute(self._statement('find_next_ids_page'), (ids[-1], page_size))
+                ids = [row[0] for row in cur.fetchall()]
+        if self._cache is not None:
+            self._cache.invalidate_table(self._descriptor.table_name)
+        if self._tracker is not None:
+            self._tracker.clear()
+        return all_deleted_items
 
+    # Literal sql builders kept for callers that need readable sql text, statements above use bound values
     @classmethod
     def _column_values_for_insert(cls, item: Any) -> str:
         """ Creates expression with values that we want to put into sql. (All accept id) """
-        def to_str(entry: Any) -> str:
-            # funkcja pomocnicza, która zwraca f-string z wartością jeżeli jest ona napisem albo datą
-            return f"'{entry[1]}'" if isinstance(entry[1], (str, datetime, date)) else str(entry[1])
-
-        return ", ".join([to_str(entry) for entry in item.__dict__.items() if entry[0].lower() != 'id'])
+        values = describe(type(item)).insert_values(item)
+        return ", ".join([CrudRepo._literal(value) for value in values])
 
     @classmethod
     def _column_names_and_values_for_update(cls, entity) -> str:
         """ Method creates expression that will be responsible for updating row values. (All accept id) """
-        def to_str(entry: Any) -> str:
-            return entry[0] + '=' + (f"'{entry[1]}'" if isinstance(entry[1], (str, datetime, date)) else str(entry[1]))
+        descriptor = describe(type(entity))
+        names_and_values = zip(descriptor.insert_fields_names, descriptor.insert_values(entity))
+        return ', '.join([f"{name}={CrudRepo._literal(value)}" for name, value in names_and_values])
 
-        return ', '.join([to_str(item) for item in entity.__dict__.items() if item[0].lower() != 'id'])
+    @staticmethod
+    def _literal(value: Any) -> str:
+        """ Returns value as sql literal, strings and dates are quoted """
+        return f"'{value}'" if isinstance(value, (str, datetime, date)) else str(value)
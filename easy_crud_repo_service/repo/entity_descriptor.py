@@ -0,0 +1,200 @@
+from dataclasses import dataclass, fields, is_dataclass, Field
+from functools import cache, lru_cache
+from itertools import starmap
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+import inflection
+
+from easy_crud_repo_service.repo.relationships import RELATIONSHIP
+
+
+@dataclass(frozen=True, slots=True)
+class EntityDescriptor:
+    """ Immutable metadata of entity class, computed once per class and shared by all repos and threads """
+    entity: type
+    table_name: str
+    fields: tuple[Field, ...]
+    fields_names: tuple[str, ...]
+    id_index: int | None
+    insert_fields_names: tuple[str, ...]
+    insert_columns: str
+    statements: Mapping[str, str]
+    insert_values: Callable[[Any], tuple[Any, ...]]
+    all_values: Callable[[Any], tuple[Any, ...]]
+    row_to_entity: Callable[[tuple[Any, ...]], Any]
+    rows_to_entities: Callable[[list[tuple[Any, ...]]], list[Any]]
+    relationships: Mapping[str, Any]
+
+    def insert_many_statement(self, rows_number: int) -> str:
+        """ Returns parameterized multi row insert statement for given number of rows """
+        return _insert_many_statement(self.table_name, self.insert_fields_names, rows_number)
+
+    def update_many_statement(
+            self,
+            rows_number: int,
+            columns: tuple[str, ...] | None = None,
+            version_column: str | None = None
+    ) -> str:
+        """ Returns parameterized statement that updates given number of rows using 'case id when ...' expressions.
+        Only given columns are set (all accept id by default), with version column see update_columns_statement() """
+        columns = self.insert_fields_names if columns is None else columns
+        return _update_many_statement(self.table_name, columns, rows_number, version_column)
+
+    def update_columns_statement(self, columns: tuple[str, ...], version_column: str | None = None) -> str:
+        """ Returns parameterized statement that updates given columns of one row. With version column row is
+        updated only when its version equals bound one ('version <=> %s') and the version is incremented """
+        return _update_columns_statement(self.table_name, columns, version_column)
+
+    def upsert_many_statement(self, rows_number: int) -> str:
+        """ Returns parameterized 'insert ... on duplicate key update' statement of rows with explicit ids """
+        return _upsert_many_statement(self.table_name, self.fields_names, self.insert_fields_names, rows_number)
+
+    def id_of(self, item: Any) -> Any:
+        """ Returns value of id field of item """
+        return getattr(item, self.fields_names[self.id_index])
+
+    def find_many_statement(self, ids_number: int) -> str:
+        """ Returns parameterized select statement of rows with given number of ids """
+        return _in_ids_statement(f"select {', '.join(self.fields_names)} from {self.table_name}", ids_number)
+
+    def delete_many_statement(self, ids_number: int) -> str:
+        """ Returns parameterized delete statement of rows with given number of ids """
+        return _in_ids_statement(f"delete from {self.table_name}", ids_number)
+
+
+@cache
+def describe(entity: type) -> EntityDescriptor:
+    """ Returns cached descriptor of entity class, reflection on entity is done only on first call """
+    relationships = {}
+    if is_dataclass(entity):
+        # Relationship fields hold related entities, they are not columns
+        entity_fields = tuple(field for field in fields(entity) if RELATIONSHIP not in field.metadata)
+        relationships = {
+            field.name: field.metadata[RELATIONSHIP] for field in fields(entity) if RELATIONSHIP in field.metadata
+        }
+        if fields(entity)[:len(entity_fields)] != entity_fields:
+            raise TypeError(f"Relationship fields of {entity.__name__} have to be declared after columns")
+        fields_names = tuple(field.name for field in entity_fields)
+    else:
+        # Entities that are not dataclasses are described by namespace of their default instance
+        entity_fields = ()
+        fields_names = tuple(entity().__dict__.keys())
+
+    lowered_names = [name.lower() for name in fields_names]
+    id_index = lowered_names.index('id') if 'id' in lowered_names else None
+    insert_fields_names = tuple(name for name in fields_names if name.lower() != 'id')
+    table_name = inflection.tableize(entity.__name__)
+
+    return EntityDescriptor(
+        entity=entity,
+        table_name=table_name,
+        fields=entity_fields,
+        fields_names=fields_names,
+        id_index=id_index,
+        insert_fields_names=insert_fields_names,
+        insert_columns=', '.join(insert_fields_names),
+        statements=MappingProxyType(_compile_statements(table_name, fields_names, insert_fields_names)),
+        insert_values=_values_getter(insert_fields_names),
+        all_values=_values_getter(fields_names),
+        row_to_entity=lambda row: entity(*row),
+        rows_to_entities=lambda rows: list(starmap(entity, rows)),
+        relationships=MappingProxyType(relationships)
+    )
+
+
+def _values_getter(names: tuple[str, ...]) -> Callable[[Any], tuple[Any, ...]]:
+    """ Creates function that returns values of given attributes as a tuple """
+    if not names:
+        return lambda item: ()
+    if len(names) == 1:
+        name = names[0]
+        return lambda item: (getattr(item, name),)
+    return attrgetter(*names)
+
+
+@lru_cache(maxsize=256)
+def _insert_many_statement(table_name: str, insert_fields_names: tuple[str, ...], rows_number: int) -> str:
+    """ Creates multi row insert statement, number of distinct batch sizes in use is small so they are cached """
+    row_placeholders = f"({', '.join(['%s'] * len(insert_fields_names))})"
+    return f"insert into {table_name} ({', '.join(insert_fields_names)}) " \
+           f"values {', '.join([row_placeholders] * rows_number)}"
+
+
+@lru_cache(maxsize=256)
+def _update_many_statement(
+        table_name: str,
+        columns: tuple[str, ...],
+        rows_number: int,
+        version_column: str | None = None
+) -> str:
+    """ Creates statement updating every column with 'case id when %s then %s ... end' of given number of rows.
+    Version condition is checked per row with 'case id when %s then version <=> %s ... end' """
+    cases = ' '.join(['when %s then %s'] * rows_number)
+    assignments = [f"{name} = case id {cases} else {name} end" for name in columns]
+    condition = f"id in ({', '.join(['%s'] * rows_number)})"
+    if version_column is not None:
+        assignments.append(f"{version_column} = coalesce({version_column}, 0) + 1")
+        condition += f" and case id {' '.join([f'when %s then {version_column} <=> %s'] * rows_number)} end"
+    return f"update {table_name} set {', '.join(assignments)} where {condition}"
+
+
+@lru_cache(maxsize=256)
+def _update_columns_statement(table_name: str, columns: tuple[str, ...], version_column: str | None) -> str:
+    """ Creates statement updating given columns of one row, optionally checking and incrementing its version """
+    assignments = [f"{name}=%s" for name in columns]
+    condition = 'id = %s'
+    if version_column is not None:
+        assignments.append(f"{version_column}=coalesce({version_column}, 0) + 1")
+        condition += f" and {version_column} <=> %s"
+    return f"update {table_name} set {', '.join(assignments)} where {condition}"
+
+
+@lru_cache(maxsize=256)
+def _upsert_many_statement(
+        table_name: str,
+        fields_names: tuple[str, ...],
+        insert_fields_names: tuple[str, ...],
+        rows_number: int
+) -> str:
+    """ Creates multi row insert of all fields (id included) that updates rows which ids already exist """
+    row_placeholders = f"({', '.join(['%s'] * len(fields_names))})"
+    assignments = ', '.join([f"{name} = values({name})" for name in insert_fields_names])
+    return f"insert into {table_name} ({', '.join(fields_names)}) " \
+           f"values {', '.join([row_placeholders] * rows_number)} " \
+           f"on duplicate key update {assignments or 'id = id'}"
+
+
+@lru_cache(maxsize=512)
+def _in_ids_statement(statement_start: str, ids_number: int) -> str:
+    """ Creates statement filtered by 'id in (...)' with given number of placeholders """
+    return f"{statement_start} where id in ({', '.join(['%s'] * ids_number)})"
+
+
+def _compile_statements(
+        table_name: str,
+        fields_names: tuple[str, ...],
+        insert_fields_names: tuple[str, ...]
+) -> dict[str, str]:
+    """ Creates parameterized sql text of every operation using %s placeholders for bound values.
+    Selects name their columns, so rows match order of entity fields whatever the order of table columns is """
+    columns = ', '.join(fields_names)
+    return {
+        'insert': f"insert into {table_name} ({', '.join(insert_fields_names)}) "
+                  f"values ({', '.join(['%s'] * len(insert_fields_names))})",
+        'update': f"update {table_name} set {', '.join([f'{name}=%s' for name in insert_fields_names])} "
+                  f"where id = %s",
+        'find_n_last': f"select {columns} from {table_name} order by id desc limit %s",
+        'find_one': f"select {columns} from {table_name} where id = %s",
+        'find_all': f"select {columns} from {table_name}",
+        'exists': f"select 1 from {table_name} where id = %s limit 1",
+        'count': f"select count(*) from {table_name}",
+        'find_first_page': f"select {columns} from {table_name} order by id limit %s",
+        'find_next_page': f"select {columns} from {table_name} where id > %s order by id limit %s",
+        'find_first_ids_page': f"select id from {table_name} order by id limit %s",
+        'find_next_ids_page': f"select id from {table_name} where id > %s order by id limit %s",
+        'delete_one': f"delete from {table_name} where id = %s",
+        'load_data': f"load data local infile %s into table {table_name} character set utf8mb4 "
+                     f"lines terminated by %s ({', '.join(insert_fields_names)})",
+    }
@@ -0,0 +1,182 @@
+import csv
+import json
+import os
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from types import NoneType, UnionType
+from typing import Any, BinaryIO, Iterable, TextIO, Union, get_args, get_origin
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+
+def validate_format(export_format: str) -> None:
+    """ Checks format and availability of pyarrow before any row is read """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Export format {export_format} is not supported, use one of {EXPORT_FORMATS}")
+    if export_format == 'parquet':
+        _import_pyarrow()
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow is needed for 'parquet' format, install it with: pip install pyarrow")
+    return pyarrow
+
+
+def write_batches(
+        batches: Iterable[list[tuple[Any, ...]]],
+        names: tuple[str, ...],
+        destination: str | os.PathLike | TextIO | BinaryIO,
+        export_format: str,
+        types: dict[str, Any] | None = None
+) -> int:
+    """ Writes batches of rows to file path or stream in one of EXPORT_FORMATS and returns number of rows:
+    csv - header with names and one line per row, jsonl - one json object per line,
+    parquet - one record batch per batch of rows (needs pyarrow and binary stream).
+    Only one batch of rows is kept in memory. types are python types of columns, used for parquet schema, columns
+    without known type get type of their values (see _write_parquet) """
+    validate_format(export_format)
+    writer = {'csv': _write_csv, 'jsonl': _write_jsonl, 'parquet': _write_parquet}[export_format]
+
+    if not isinstance(destination, (str, os.PathLike)):
+        return writer(batches, names, destination, types or {})
+    if export_format == 'parquet':
+        with open(destination, 'wb') as stream:
+            return writer(batches, names, stream, types or {})
+    with open(destination, 'w', encoding='utf-8', newline='') as stream:
+        return writer(batches, names, stream, types or {})
+
+
+def _write_csv(batches: Iterable[list[tuple[Any, ...]]], names: tuple[str, ...], stream: TextIO, _: Any) -> int:
+    """ Dates are written in iso format, so rows can be read back with from_dict() of entity """
+    writer = csv.writer(stream)
+    writer.writerow(names)
+    rows_number = 0
+    for batch in batches:
+        writer.writerows(batch)
+        rows_number += len(batch)
+    return rows_number
+
+
+def _write_jsonl(batches: Iterable[list[tuple[Any, ...]]], names: tuple[str, ...], stream: TextIO, _: Any) -> int:
+    rows_number = 0
+    for batch in batches:
+        stream.writelines(
+            json.dumps(dict(zip(names, row)), default=_json_default, ensure_ascii=False) + '\n' for row in batch
+        )
+        rows_number += len(batch)
+    return rows_number
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _write_parquet(
+        batches: Iterable[list[tuple[Any, ...]]],
+        names: tuple[str, ...],
+        stream: BinaryIO,
+        types: dict[str, Any]
+) -> int:
+    """ Schema is taken from types of columns. Type of column without known type (and scale of decimal column) is
+    taken from its values, batches are kept until every such column had a value, columns that are null in all
+    rows are written as null type """
+    pyarrow = _import_pyarrow()
+    rows_number = 0
+    pending, schema, writer = [], None, None
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            rows_number += len(batch)
+            if writer is not None:
+                writer.write_batch(_record_batch(pyarrow, batch, schema))
+                continue
+            pending.append(batch)
+            schema = _arrow_schema(pyarrow, names, types, pending, complete=False)
+            if schema is not None:
+                writer = _write_pending(pyarrow, stream, schema, pending)
+                pending = []
+        if writer is None:
+            writer = _write_pending(pyarrow, stream, _arrow_schema(pyarrow, names, types, pending), pending)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows_number
+
+
+def _write_pending(pyarrow: Any, stream: BinaryIO, schema: Any, pending: list[list[tuple[Any, ...]]]) -> Any:
+    writer = pyarrow.parquet.ParquetWriter(stream, schema)
+    for batch in pending:
+        writer.write_batch(_record_batch(pyarrow, batch, schema))
+    return writer
+
+
+def _record_batch(pyarrow: Any, batch: list[tuple[Any, ...]], schema: Any) -> Any:
+    return pyarrow.record_batch([list(values) for values in zip(*batch)], schema=schema)
+
+
+def _arrow_schema(
+        pyarrow: Any,
+        names: tuple[str, ...],
+        types: dict[str, Any],
+        batches: list[list[tuple[Any, ...]]],
+        complete: bool = True
+) -> Any:
+    """ Returns schema of columns or None when type of some column isn't known yet and more batches will come """
+    fields = []
+    for index, name in enumerate(names):
+        values = [row[index] for batch in batches for row in batch if row[index] is not None]
+        arrow_type = _arrow_type(pyarrow, types.get(name), values)
+        if arrow_type is None:
+            if not complete:
+                return None
+            arrow_type = pyarrow.null()
+        fields.append((name, arrow_type))
+    return pyarrow.schema(fields)
+
+
+def _arrow_type(pyarrow: Any, python_type: Any, values: list[Any]) -> Any:
+    """ Returns arrow type of column taken from type of entity field, 'X | None' fields are nullable X columns.
+    Decimal scale and types of other fields are taken from non null values, None is returned without them """
+    arrow_types = {
+        bool: pyarrow.bool_(),
+        int: pyarrow.int64(),
+        float: pyarrow.float64(),
+        str: pyarrow.string(),
+        datetime: pyarrow.timestamp('us'),
+        date: pyarrow.date32(),
+        time: pyarrow.time64('us'),
+        timedelta: pyarrow.duration('us'),
+        bytes: pyarrow.binary()
+    }
+    python_type = _without_none(python_type)
+    if python_type in arrow_types:
+        return arrow_types[python_type]
+    if not values:
+        return None
+    inferred = pyarrow.array(values).type
+    if pyarrow.types.is_decimal(inferred):
+        # Values of next batches can have more digits, scale is the same for all values of decimal column
+        if inferred.precision <= 38:
+            return pyarrow.decimal128(38, inferred.scale)
+        return pyarrow.decimal256(76, inferred.scale)
+    return inferred
+
+
+def _without_none(python_type: Any) -> Any:
+    """ Returns X of 'X | None' and Optional[X] annotations, other types are returned as they are """
+    if get_origin(python_type) in (Union, UnionType):
+        args = [arg for arg in get_args(python_type) if arg is not NoneType]
+        if len(args) == 1:
+            return args[0]
+    return python_type
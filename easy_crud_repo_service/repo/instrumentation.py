@@ -0,0 +1,204 @@
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# Upper bounds of histogram buckets in seconds, the last implicit bucket is +Inf
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+slow_query_logger = logging.getLogger('easy_crud_repo_service.slow_query')
+
+
+@dataclass(frozen=True, slots=True)
+class QueryEvent:
+    """ Statement executed by CrudRepo. elapsed (seconds spent in execute and fetches) and rows (fetched rows of
+    select or affected rows of other statements) are None in events passed to before_execute callbacks """
+    entity: str
+    operation: str
+    sql: str
+    params_count: int
+    pool_wait: float
+    elapsed: float | None = None
+    rows: int | None = None
+
+
+class Histogram:
+    """ Thread safe histogram of durations with cumulative buckets like Prometheus histograms """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def to_dict(self) -> dict[str, Any]:
+        """ Returns count, sum and cumulative counts keyed by upper bound of bucket """
+        with self._lock:
+            counts, count, total = list(self._counts), self._count, self._sum
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip((*self._buckets, float('inf')), counts):
+            cumulative += bucket_count
+            buckets[bound] = cumulative
+        return {'count': count, 'sum': total, 'buckets': buckets}
+
+
+class Instrumentation:
+    """ Instrumentation of statements executed by CrudRepos it is passed to.
+    - before_execute and after_execute callbacks get QueryEvent of every statement
+    - statements slower than slow_query_threshold seconds are logged with warning level
+    - durations are collected into histograms per (entity, operation) exported by to_dict() and to_prometheus()
+    CrudRepo without instrumentation doesn't measure anything """
+
+    def __init__(
+            self,
+            slow_query_threshold: float | None = None,
+            histograms: bool = True,
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+            logger: logging.Logger = slow_query_logger
+    ) -> None:
+        self._slow_query_threshold = slow_query_threshold
+        self._collect_histograms = histograms
+        self._buckets = buckets
+        self._logger = logger
+        self._before: list[Callable[[QueryEvent], None]] = []
+        self._after: list[Callable[[QueryEvent], None]] = []
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def before_execute(self, callback: Callable[[QueryEvent], None]) -> Callable[[QueryEvent], None]:
+        """ Registers callback called before statement is executed, can be used as decorator """
+        self._before.append(callback)
+        return callback
+
+    def after_execute(self, callback: Callable[[QueryEvent], None]) -> Callable[[QueryEvent], None]:
+        """ Registers callback called after rows of statement were fetched, can be used as decorator """
+        self._after.append(callback)
+        return callback
+
+    def cursor(self, cursor: Any, entity: str, operation: str, pool_wait: float) -> 'InstrumentedCursor':
+        return InstrumentedCursor(cursor, self, entity, operation, pool_wait)
+
+    def histogram(self, entity: str, operation: str) -> Histogram:
+        key = (entity, operation)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self._buckets))
+        return histogram
+
+    def to_dict(self) -> dict[tuple[str, str], dict[str, Any]]:
+        """ Returns histograms keyed by (entity, operation) """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {key: histogram.to_dict() for key, histogram in histograms.items()}
+
+    def to_prometheus(self, metric_name: str = 'easy_crud_repo_query_duration_seconds') -> str:
+        """ Returns histograms in Prometheus text exposition format """
+        lines = [
+            f"# HELP {metric_name} Duration of statements executed by CrudRepo",
+            f"# TYPE {metric_name} histogram"
+        ]
+        for (entity, operation), histogram in sorted(self.to_dict().items()):
+            labels = f'entity="{entity}",operation="{operation}"'
+            for bound, count in histogram['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric_name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f'{metric_name}_sum{{{labels}}} {histogram["sum"]}')
+            lines.append(f'{metric_name}_count{{{labels}}} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """ Removes collected histograms """
+        with self._lock:
+            self._histograms = {}
+
+    def _started(self, event: QueryEvent) -> None:
+        for callback in self._before:
+            callback(event)
+
+    def _finished(self, event: QueryEvent) -> None:
+        if self._collect_histograms:
+            self.histogram(event.entity, event.operation).observe(event.elapsed)
+        if self._slow_query_threshold is not None and event.elapsed >= self._slow_query_threshold:
+            self._logger.warning(
+                "Slow query %s.%s took %.1f ms, %s rows, %s params: %s",
+                event.entity, event.operation, event.elapsed * 1000, event.rows, event.params_count, event.sql
+            )
+        for callback in self._after:
+            callback(event)
+
+
+class InstrumentedCursor:
+    """ Cursor proxy measuring time spent in execute and fetch calls. Statement is finished when next statement
+    is executed or cursor is closed, so rows fetched lazily from unbuffered cursor are counted too """
+
+    def __init__(self, cursor: Any, instrumentation: Instrumentation, entity: str, operation: str, pool_wait: float):
+        self._cursor = cursor
+        self._instrumentation = instrumentation
+        self._entity = entity
+        self._operation = operation
+        self._pool_wait = pool_wait
+        self._event = None
+        self._elapsed = 0.0
+        self._fetched = None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._cursor, attr)
+
+    def execute(self, operation: str, params: Any = ()) -> Any:
+        self._finish()
+        params_count = len(params) if params else 0
+        self._event = QueryEvent(self._entity, self._operation, operation, params_count, self._pool_wait)
+        # Only first statement of cursor waited for connection
+        self._pool_wait = 0.0
+        self._instrumentation._started(self._event)
+        return self._timed(self._cursor.execute, operation, params)
+
+    def fetchone(self) -> Any:
+        row = self._timed(self._cursor.fetchone)
+        self._count_rows(1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, size: int = 1) -> list[Any]:
+        rows = self._timed(self._cursor.fetchmany, size)
+        self._count_rows(len(rows))
+        return rows
+
+    def fetchall(self) -> list[Any]:
+        rows = self._timed(self._cursor.fetchall)
+        self._count_rows(len(rows))
+        return rows
+
+    def close(self) -> Any:
+        self._finish()
+        return self._cursor.close()
+
+    def _timed(self, method: Callable[..., Any], *args: Any) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._elapsed += time.perf_counter() - started_at
+
+    def _count_rows(self, rows: int) -> None:
+        self._fetched = (self._fetched or 0) + rows
+
+    def _finish(self) -> None:
+        if self._event is None:
+            return
+        event, self._event = self._event, None
+        rows = self._fetched if self._fetched is not None else self._cursor.rowcount
+        self._instrumentation._finished(QueryEvent(
+            event.entity, event.operation, event.sql, event.params_count, event.pool_wait, self._elapsed, rows
+        ))
+        self._elapsed, self._fetched = 0.0, None
@@ -0,0 +1,71 @@
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, TextIO
+
+# Errors raised when LOAD DATA LOCAL INFILE is disabled on server (1148, 3948) or rejected by client (2068)
+LOCAL_INFILE_DISABLED_ERRORS = {1148, 2068, 3948}
+
+# Default escaping of LOAD DATA: fields terminated by '\t', escaped by '\\', lines terminated by '\n'
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+_UNESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '0': '\0'}
+
+# Line terminators of files that can be loaded, rows written by write_rows() end with '\n'
+LINE_TERMINATORS = ('\n', '\r\n')
+
+
+def to_field(value: Any) -> str:
+    """ Returns value as field of LOAD DATA file, None is written as \\N """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).translate(_ESCAPES)
+
+
+def write_rows(rows: Iterable[tuple[Any, ...]], stream: TextIO) -> int:
+    """ Writes rows to stream in default LOAD DATA format, line by line, and returns number of rows """
+    rows_number = 0
+    for row in rows:
+        stream.write('\t'.join(map(to_field, row)))
+        stream.write('\n')
+        rows_number += 1
+    return rows_number
+
+
+def read_rows(stream: TextIO, line_terminator: str = '\n') -> Iterator[tuple[str | None, ...]]:
+    """ Lazily reads rows written in default LOAD DATA format, values are returned as strings or None. Stream
+    should be opened with newline='', so lines are split only on line_terminator like LOAD DATA does """
+    if line_terminator not in LINE_TERMINATORS:
+        raise ValueError(f"Line terminator should be one of {LINE_TERMINATORS}")
+    line = ''
+    for part in stream:
+        line += part
+        if line.endswith(line_terminator):
+            yield _from_line(line[:-len(line_terminator)])
+            line = ''
+    if line:
+        yield _from_line(line)
+
+
+def _from_line(line: str) -> tuple[str | None, ...]:
+    return tuple(_from_field(field) for field in line.split('\t'))
+
+
+def _from_field(field: str) -> str | None:
+    if '\\' not in field:
+        return field
+    if field == '\\N':
+        return None
+    chars, escaped = [], False
+    for char in field:
+        if escaped:
+            chars.append(_UNESCAPES.get(char, char))
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            chars.append(char)
+    return ''.join(chars)
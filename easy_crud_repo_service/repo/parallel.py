@@ -0,0 +1,232 @@
+import queue
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, TYPE_CHECKING
+
+from mysql.connector import Error
+
+from easy_crud_repo_service.repo.transaction import Transaction, active_transaction, bind_transaction
+
+if TYPE_CHECKING:
+    from easy_crud_repo_service.repo.crud_repo import CrudRepo
+
+# Attempts of XA COMMIT of prepared branch before it is left for XA RECOVER
+COMMIT_ATTEMPTS = 3
+
+
+class IncompleteCommitError(RuntimeError):
+    """ Raised when all branches prepared, but some of them couldn't be committed. Other branches are committed,
+    branches with xids are left prepared on server and should be committed with XA COMMIT (see XA RECOVER) """
+
+    def __init__(self, message: str, xids: list[tuple[str, str]]) -> None:
+        super().__init__(message)
+        self.xids = xids
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkResult:
+    """ Outcome of one chunk: result of repo method or error raised by it """
+    index: int
+    size: int
+    result: Any = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True, slots=True)
+class ParallelReport:
+    """ Results of all chunks in order of input """
+    chunks: tuple[ChunkResult, ...]
+
+    @property
+    def ok(self) -> bool:
+        return all(chunk.ok for chunk in self.chunks)
+
+    @property
+    def failed(self) -> list[ChunkResult]:
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    @property
+    def results(self) -> list[Any]:
+        """ Joined results of successful chunks, e.g. ids returned by insert_many in order of items """
+        return [value for chunk in self.chunks if chunk.ok for value in chunk.result]
+
+
+class _Branch:
+    """ XA transaction branch of one worker: pinned connection, xid and state (new, active, idle or prepared) """
+    __slots__ = ('connection', 'transaction', 'xid', 'state')
+
+    def __init__(self, connection: Any, xid: tuple[str, str]) -> None:
+        self.connection = connection
+        self.transaction = Transaction(connection)
+        self.xid = xid
+        self.state = 'new'
+
+    def execute(self, statement: str, state: str) -> None:
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"xa {statement} %s, %s", self.xid)
+        finally:
+            cursor.close()
+        self.state = state
+
+
+class ParallelRepo:
+    """ Runs batch operations of CrudRepo in chunks of chunk_size items on workers threads, by default as many
+    as connections of pool. Every worker uses its own connection, so pool can't be used by other threads in full.
+    - atomic=False (best effort): every chunk is committed separately, failed chunks are reported in ParallelReport
+    - atomic=True (all or nothing): every worker runs its chunks in XA transaction branch, branches are committed
+      with two phase commit only when all chunks succeeded, otherwise all of them are rolled back and error is raised.
+      Once all branches prepared they are only committed, branch which commit failed is left prepared on server
+      and IncompleteCommitError is raised
+    """
+
+    def __init__(self, repo: 'CrudRepo', workers: int | None = None, chunk_size: int = 10_000, atomic: bool = False):
+        if chunk_size <= 0:
+            raise ValueError("Chunk size should be higher than 0")
+        self._repo = repo
+        self._workers = workers or repo._connection_pool.pool_size
+        self._chunk_size = chunk_size
+        self._atomic = atomic
+
+    def insert_many(self, items: list[Any]) -> ParallelReport:
+        """ Inserts items, results of chunks are ids in order of items """
+        return self._run(items, self._repo.insert_many)
+
+    def update_many(self, items: list[Any]) -> ParallelReport:
+        return self._run(items, self._repo.update_many)
+
+    def upsert_many(self, items: list[Any]) -> ParallelReport:
+        return self._run(items, self._repo.upsert_many)
+
+    def delete_many(self, items: list[Any]) -> ParallelReport:
+        return self._run(items, self._repo.delete_many)
+
+    def delete_many_by_id(self, items_ids: list[int]) -> ParallelReport:
+        return self._run(items_ids, self._repo.delete_many_by_id)
+
+    def find_many(self, items_ids: list[int]) -> ParallelReport:
+        """ Finds rows in chunks, missing rows are errors of their chunks """
+        return self._run(items_ids, self._repo.find_many)
+
+    def _run(self, items: list[Any], operation: Callable[[list[Any]], Any]) -> ParallelReport:
+        if active_transaction(self._repo._connection_pool) is not None:
+            raise RuntimeError("Parallel operations can't run inside transaction of the same connection pool")
+        chunks = queue.SimpleQueue()
+        for index, start in enumerate(range(0, len(items), self._chunk_size)):
+            chunks.put((index, items[start:start + self._chunk_size]))
+        chunks_number = -(-len(items) // self._chunk_size)
+        workers = max(1, min(self._workers, chunks_number))
+        if not chunks_number:
+            return ParallelReport(())
+
+        if self._atomic:
+            results = self._run_atomic(chunks, operation, workers)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._work, chunks, operation, threading.Event()) for _ in range(workers)]
+                results = [result for future in futures for result in future.result()]
+        return ParallelReport(tuple(sorted(results, key=lambda chunk: chunk.index)))
+
+    @staticmethod
+    def _work(chunks: queue.SimpleQueue, operation: Callable[[list[Any]], Any], stop: threading.Event) -> list:
+        """ Takes chunks until queue is empty, chunk error stops all workers when stop event is shared """
+        results = []
+        while not stop.is_set():
+            try:
+                index, chunk = chunks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                results.append(ChunkResult(index, len(chunk), operation(chunk)))
+            except Exception as e:
+                results.append(ChunkResult(index, len(chunk), error=e))
+        return results
+
+    def _run_atomic(self, chunks: queue.SimpleQueue, operation: Callable, workers: int) -> list[ChunkResult]:
+        """ Every worker runs its chunks in own XA branch, branches are committed only if all of them prepared """
+        pool = self._repo._connection_pool
+        gtrid = uuid.uuid4().hex
+        stop = threading.Event()
+        branches: list[_Branch] = []
+        lock = threading.Lock()
+
+        def work(number: int) -> list[ChunkResult]:
+            branch = _Branch(pool.get_connection(), (gtrid, str(number)))
+            with lock:
+                branches.append(branch)
+            try:
+                branch.execute('start', 'active')
+                with bind_transaction(pool, branch.transaction):
+                    results = self._work(chunks, operation, stop)
+                branch.execute('end', 'idle')
+                if any(not result.ok for result in results):
+                    stop.set()
+                elif not stop.is_set():
+                    branch.execute('prepare', 'prepared')
+                return results
+            except BaseException:
+                stop.set()
+                raise
+
+        failure = None
+        results = []
+        try:
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(work, number) for number in range(workers)]
+                    for future in futures:
+                        try:
+                            results.extend(future.result())
+                        except Exception as e:
+                            failure = failure or e
+                failure = failure or next((result.error for result in results if not result.ok), None)
+            except BaseException as e:
+                failure = failure or e
+            if failure is not None:
+                self._rollback(branches)
+                raise failure
+            # All branches prepared, commit is the only valid outcome, so prepared branches are never rolled back
+            self._commit(branches)
+        finally:
+            for branch in branches:
+                branch.transaction.close_statements()
+                branch.connection.close()
+                branch.transaction._finish()
+        return results
+
+    @staticmethod
+    def _commit(branches: list[_Branch]) -> None:
+        """ Commits prepared branches, failed commit is retried. Branches that still fail are left prepared and
+        reported by IncompleteCommitError after the other branches are committed """
+        failed, error = [], None
+        for branch in branches:
+            for _ in range(COMMIT_ATTEMPTS):
+                try:
+                    branch.execute('commit', 'committed')
+                    break
+                except Error as e:
+                    error = e
+            else:
+                failed.append(branch.xid)
+        if failed:
+            raise IncompleteCommitError(
+                f"Branches {failed} prepared, but not committed, commit them with XA COMMIT", failed
+            ) from error
+
+    @staticmethod
+    def _rollback(branches: list[_Branch]) -> None:
+        """ Rolls back branches that were started, errors are ignored as original error is raised """
+        for branch in branches:
+            try:
+                if branch.state == 'active':
+                    branch.execute('end', 'idle')
+                if branch.state in ('idle', 'prepared'):
+                    branch.execute('rollback', 'rolled_back')
+            except Error:
+                pass
@@ -0,0 +1,58 @@
+from typing import Any, Iterator
+
+
+class PreparedStatements:
+    """ Prepared cursors of one checked out connection keyed by sql text. Statement is prepared on first execution
+    only, next executions of the same sql on this connection send just its parameters. Cursors are closed by
+    close() before connection goes back to the pool, because reset of session deallocates them on server """
+
+    def __init__(self, connection: Any) -> None:
+        self._connection = connection
+        self._cursors: dict[str, tuple[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def cursor(self) -> 'PreparedCursor':
+        return PreparedCursor(self)
+
+    def prepared(self, operation: str) -> tuple[str, Any]:
+        """ Returns sql and cursor that prepared it. Connector reuses statement only when the same str object is
+        executed again, so the first one is kept and passed to the cursor """
+        prepared = self._cursors.get(operation)
+        if prepared is None:
+            prepared = self._cursors[operation] = (operation, self._connection.cursor(prepared=True))
+        return prepared
+
+    def close(self) -> None:
+        cursors, self._cursors = self._cursors, {}
+        for _, cursor in cursors.values():
+            cursor.close()
+
+
+class PreparedCursor:
+    """ Cursor of PreparedStatements, every sql is executed on its own prepared cursor. Results, lastrowid and
+    rowcount are read from cursor of the last executed statement """
+
+    def __init__(self, statements: PreparedStatements) -> None:
+        self._statements = statements
+        self._current = None
+
+    def execute(self, operation: str, params: Any = ()) -> None:
+        operation, self._current = self._statements.prepared(operation)
+        self._current.execute(operation, params)
+
+    def executemany(self, operation: str, seq_params: Any) -> None:
+        operation, self._current = self._statements.prepared(operation)
+        self._current.executemany(operation, seq_params)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self._current, attr)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._current)
+
+    def close(self) -> None:
+        """ Statements stay prepared until connection is released """
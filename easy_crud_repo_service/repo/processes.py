@@ -0,0 +1,72 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from easy_crud_repo_service.repo.crud_repo import CrudRepo
+
+# Repo of worker process created by initializer of process pool
+_worker_repo = None
+
+
+@dataclass(frozen=True, slots=True)
+class IdRange:
+    """ Range of ids from start (inclusive) to stop (exclusive) """
+    start: int
+    stop: int
+
+    def criteria(self) -> dict[str, int]:
+        """ Returns criteria of CrudRepo.query().where() / export() selecting rows of range """
+        return {'id__gte': self.start, 'id__lt': self.stop}
+
+
+def id_ranges(repo: 'CrudRepo', partitions: int) -> list[IdRange]:
+    """ Splits ids between min and max id of table into given number of ranges of equal width """
+    if partitions <= 0:
+        raise ValueError("Number of partitions should be higher than 0")
+    first, last = repo._select(f"select min(id), max(id) from {repo._descriptor.table_name}", [])[0]
+    if first is None:
+        return []
+    width = -(-(last - first + 1) // partitions)
+    return [IdRange(start, min(start + width, last + 1)) for start in range(first, last + 1, width)]
+
+
+def map_partitions(
+        connection_pool: Any,
+        entity: type,
+        task: Callable[['CrudRepo', Any], Any],
+        partitions: Iterable[Any],
+        processes: int | None = None,
+        combine: Callable[[list[Any]], Any] | None = None,
+        mp_context: Any = None,
+        **repo_options: Any
+) -> Any:
+    """ Runs task(repo, partition) for every partition on worker processes, so conversion of rows isn't limited
+    to one core. Every worker creates its own CrudRepo(connection_pool, entity, **repo_options) once, so
+    connection_pool has to create its connections in the worker, like ForkSafeConnectionPool does. Task has to
+    be a module level function, partitions and results are pickled. Results are returned in order of partitions,
+    or passed to combine, e.g. sum. The first error raised by a task is raised """
+    partitions = list(partitions)
+    if not partitions:
+        return combine([]) if combine is not None else []
+    context = mp_context if mp_context is not None else multiprocessing.get_context()
+    with ProcessPoolExecutor(
+            max_workers=min(processes or multiprocessing.cpu_count(), len(partitions)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(connection_pool, entity, repo_options)
+    ) as executor:
+        results = [future.result() for future in [executor.submit(_run, task, part) for part in partitions]]
+    return combine(results) if combine is not None else results
+
+
+def _init_worker(connection_pool: Any, entity: type, repo_options: dict[str, Any]) -> None:
+    from easy_crud_repo_service.repo.crud_repo import CrudRepo
+
+    global _worker_repo
+    _worker_repo = CrudRepo(connection_pool, entity, **repo_options)
+
+
+def _run(task: Callable[['CrudRepo', Any], Any], partition: Any) -> Any:
+    return task(_worker_repo, partition)
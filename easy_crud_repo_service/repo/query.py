@@ -0,0 +1,151 @@
+from dataclasses import dataclass, replace
+from typing import Any, Iterator, Self, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from easy_crud_repo_service.repo.crud_repo import CrudRepo
+
+# Lookups that can be used after double underscore in criteria names, e.g. points__gte=10
+OPERATORS = {'eq': '=', 'ne': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<=', 'like': 'like'}
+LOOKUPS = {*OPERATORS, 'in', 'between', 'isnull'}
+
+# Largest row count accepted by MySQL, it is used as limit when only offset is provided
+MAX_LIMIT = 18446744073709551615
+
+
+@dataclass(frozen=True)
+class Query:
+    """ Immutable description of select statement on entity table. Every method returns new query, so partial
+    queries can be reused. Statement is compiled to parameterized sql, only names of entity fields are put into
+    sql text and all values are bound by the connector """
+    repo: 'CrudRepo'
+    conditions: tuple[tuple[str, str, Any], ...] = ()
+    projection: tuple[str, ...] = ()
+    as_tuples: bool = False
+    ordering: tuple[str, ...] = ()
+    limit_value: int | None = None
+    offset_value: int | None = None
+    after_id: Any = None
+
+    def where(self, **criteria: Any) -> Self:
+        """ Adds criteria joined with 'and'. Name of criterion is field name with optional lookup:
+        name='A', points__gte=10, id__in=[1, 2], name__like='A%', points__between=(1, 5), team_id__isnull=True """
+        conditions = []
+        for name, value in criteria.items():
+            field, _, lookup = name.partition('__')
+            lookup = lookup or 'eq'
+            if lookup not in LOOKUPS:
+                raise ValueError(f"Lookup {lookup} is not supported")
+            if lookup == 'in':
+                # str and bytes are iterable too, 'abc' would be matched as ('a', 'b', 'c')
+                if isinstance(value, (str, bytes)):
+                    raise ValueError(f"Lookup in of {field} needs collection of values, not {type(value).__name__}")
+                value = tuple(value)
+            conditions.append((self._field(field), lookup, value))
+        return replace(self, conditions=self.conditions + tuple(conditions))
+
+    def only(self, *fields: str) -> Self:
+        """ Selects only provided fields, entities are created with default values of other fields """
+        return replace(self, projection=tuple(self._field(field) for field in fields), as_tuples=False)
+
+    def values(self, *fields: str) -> Self:
+        """ Selects only provided fields and returns rows as tuples instead of entities """
+        return replace(self, projection=tuple(self._field(field) for field in fields), as_tuples=True)
+
+    def order_by(self, *fields: str) -> Self:
+        """ Orders rows by fields, field name prefixed with '-' means descending order """
+        ordering = [
+            f"{self._field(field[1:])} desc" if field.startswith('-') else self._field(field) for field in fields
+        ]
+        return replace(self, ordering=tuple(ordering))
+
+    def limit(self, limit: int) -> Self:
+        return replace(self, limit_value=limit)
+
+    def offset(self, offset: int) -> Self:
+        return replace(self, offset_value=offset)
+
+    def after(self, last_id: Any) -> Self:
+        """ Keyset pagination, selects rows with id higher than last_id ordered by id """
+        return replace(self, after_id=last_id)
+
+    def compile(self) -> tuple[str, list[Any]]:
+        """ Returns parameterized sql and its parameters """
+        descriptor = self.repo._descriptor
+        columns = ', '.join(self.projection or descriptor.fields_names)
+        where, params = self._compile_where()
+        sql = f"select {columns} from {descriptor.table_name}{where}"
+        ordering = self.ordering or (('id',) if self.after_id is not None else ())
+        if ordering:
+            sql += f" order by {', '.join(ordering)}"
+        if self.limit_value is not None or self.offset_value is not None:
+            sql += " limit %s"
+            params.append(MAX_LIMIT if self.limit_value is None else self.limit_value)
+        if self.offset_value is not None:
+            sql += " offset %s"
+            params.append(self.offset_value)
+        return sql, params
+
+    def all(self) -> list[Any]:
+        """ Executes query and returns entities, partial entities or tuples """
+        sql, params = self.compile()
+        return self._convert(self.repo._select(sql, params))
+
+    def first(self) -> Any | None:
+        """ Executes query limited to one row and returns it or None """
+        rows = self.limit(1).all()
+        return rows[0] if rows else None
+
+    def count(self) -> int:
+        """ Returns number of rows matching criteria (ordering, limit and offset are ignored) """
+        where, params = self._compile_where()
+        return self.repo._select(f"select count(*) from {self.repo._descriptor.table_name}{where}", params)[0][0]
+
+    def export(self, destination: Any, format: str = 'csv', batch_size: int = 10_000) -> int:
+        """ Streams rows matching query to file path or stream in csv, jsonl or parquet, see CrudRepo.export() """
+        sql, params = self.compile()
+        names = self.projection or self.repo._descriptor.fields_names
+        return self.repo._export(sql, params, names, destination, format, batch_size)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.all())
+
+    def _compile_where(self) -> tuple[str, list[Any]]:
+        """ Creates where clause and its parameters """
+        expressions, params = [], []
+        for field, lookup, value in self.conditions:
+            if lookup == 'isnull' or (lookup in ('eq', 'ne') and value is None):
+                # = null and <> null match no row, comparisons with None are compiled to is (not) null
+                is_null = lookup != 'ne' and (value is None or bool(value))
+                expressions.append(f"{field} is null" if is_null else f"{field} is not null")
+            elif lookup == 'in':
+                if not value:
+                    expressions.append('1 = 0')
+                    continue
+                expressions.append(f"{field} in ({', '.join(['%s'] * len(value))})")
+                params.extend(value)
+            elif lookup == 'between':
+                expressions.append(f"{field} between %s and %s")
+                params.extend(value)
+            else:
+                expressions.append(f"{field} {OPERATORS[lookup]} %s")
+                params.append(value)
+        if self.after_id is not None:
+            expressions.append('id > %s')
+            params.append(self.after_id)
+        return (f" where {' and '.join(expressions)}" if expressions else ''), params
+
+    def _convert(self, rows: list[tuple[Any, ...]]) -> list[Any]:
+        """ Converts rows to result type of query """
+        descriptor = self.repo._descriptor
+        if not self.projection:
+            return self.repo._tracked(descriptor.rows_to_entities(rows))
+        if self.as_tuples:
+            return [tuple(row) for row in rows]
+        entity = descriptor.entity
+        return [entity(**dict(zip(self.projection, row))) for row in rows]
+
+    def _field(self, name: str) -> str:
+        """ Validates that name is a field of entity, only validated names are put into sql text """
+        if name not in self.repo._descriptor.fields_names:
+            raise ValueError(f"Entity {self.repo._descriptor.entity.__name__} has no field {name}")
+        return name
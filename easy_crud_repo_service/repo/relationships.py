@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+# Key of dataclass field metadata marking field as relationship instead of column
+RELATIONSHIP = 'relationship'
+
+
+@dataclass(frozen=True, slots=True)
+class BelongsTo:
+    """ Many to one relationship: foreign_key field of entity holds id of parent entity """
+    entity: type
+    foreign_key: str
+
+
+def belongs_to(entity: type, foreign_key: str) -> Any:
+    """ Declares dataclass field holding parent entity referenced by foreign_key field. It isn't a column, it is None
+    until parent is loaded by CrudRepo.load_related() or find_all(include=[...]). It has to be declared after columns:
+        team: Team | None = belongs_to(Team, 'team_id') """
+    return field(default=None, compare=False, repr=False, metadata={RELATIONSHIP: BelongsTo(entity, foreign_key)})
+
+
+class LazyProxy:
+    """ Proxy of related entity, entity is loaded on first access to its attribute or get() and then reused """
+    __slots__ = ('_loader', '_target', '_loaded')
+
+    def __init__(self, loader: Callable[[], Any]) -> None:
+        self._loader = loader
+        self._target = None
+        self._loaded = False
+
+    def get(self) -> Any:
+        if not self._loaded:
+            self._target = self._loader()
+            self._loaded = True
+        return self._target
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.get(), attr)
+
+    def __eq__(self, other: Any) -> bool:
+        return self.get() == (other.get() if isinstance(other, LazyProxy) else other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"LazyProxy({self._target!r})" if self._loaded else 'LazyProxy(<not loaded>)'
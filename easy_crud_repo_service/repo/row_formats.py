@@ -0,0 +1,41 @@
+from typing import Any, Iterable
+
+ROW_FORMATS = ('entity', 'tuple', 'dict', 'columns', 'numpy')
+
+
+def collect_rows(
+        batches: Iterable[list[tuple[Any, ...]]],
+        names: tuple[str, ...],
+        row_format: str,
+        to_entities: Any = None
+) -> Any:
+    """ Collects batches of rows into one of ROW_FORMATS:
+    entity - list of entities created by to_entities, tuple - list of tuples, dict - list of dicts,
+    columns - dict of lists keyed by column names, numpy - dict of numpy arrays keyed by column names.
+    Rows are consumed batch by batch, so only one batch of raw rows exists at once """
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Row format {row_format} is not supported, use one of {ROW_FORMATS}")
+
+    if row_format in ('columns', 'numpy'):
+        columns = {name: [] for name in names}
+        column_lists = list(columns.values())
+        for batch in batches:
+            for column_list, values in zip(column_lists, zip(*batch)):
+                column_list.extend(values)
+        if row_format == 'columns':
+            return columns
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy is needed for 'numpy' row format, install it with: pip install numpy")
+        return {name: numpy.array(values) for name, values in columns.items()}
+
+    result = []
+    for batch in batches:
+        if row_format == 'entity':
+            result.extend(to_entities(batch))
+        elif row_format == 'tuple':
+            result.extend(batch)
+        else:
+            result.extend(dict(zip(names, row)) for row in batch)
+    return result
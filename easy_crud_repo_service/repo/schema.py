@@ -0,0 +1,189 @@
+import threading
+import types
+import typing
+import weakref
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Iterable
+
+from easy_crud_repo_service.repo.entity_descriptor import EntityDescriptor, describe
+
+# Columns of all requested tables are read with one statement, tables are bound as 'in (...)' placeholders
+COLUMNS_STATEMENT = (
+    "select table_name, column_name, data_type, is_nullable, column_key, extra, column_default "
+    "from information_schema.columns where table_schema = database() and table_name in ({}) "
+    "order by table_name, ordinal_position"
+)
+
+# Types of entity fields that can hold values of MySQL data types, data types that are not listed aren't validated
+PYTHON_TYPES = {
+    **dict.fromkeys(('tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint', 'year'), (int, float, Decimal)),
+    'bit': (int,),
+    **dict.fromkeys(('decimal', 'numeric'), (Decimal, float)),
+    **dict.fromkeys(('float', 'double', 'real'), (float, Decimal)),
+    **dict.fromkeys(('char', 'varchar', 'tinytext', 'text', 'mediumtext', 'longtext', 'enum', 'set'), (str,)),
+    **dict.fromkeys(('binary', 'varbinary', 'tinyblob', 'blob', 'mediumblob', 'longblob'), (bytes, bytearray)),
+    'date': (date,),
+    **dict.fromkeys(('datetime', 'timestamp'), (datetime,)),
+    'time': (timedelta, time),
+}
+
+# Introspected tables of every connection pool, keyed by table name. Pools are weakly referenced
+_schemas: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+# Entities that matched their tables on every connection pool, they aren't validated again
+_validated: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+class SchemaMismatchError(RuntimeError):
+    """ Raised when entity doesn't match columns of its table """
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnInfo:
+    """ Column of table read from information_schema.columns """
+    name: str
+    data_type: str
+    nullable: bool
+    primary_key: bool
+    auto_increment: bool
+    has_default: bool
+
+
+@dataclass(frozen=True, slots=True)
+class TableSchema:
+    """ Columns of table in order of their positions """
+    table_name: str
+    columns: tuple[ColumnInfo, ...]
+
+    @property
+    def columns_names(self) -> tuple[str, ...]:
+        return tuple(column.name for column in self.columns)
+
+    @property
+    def primary_key(self) -> tuple[str, ...]:
+        return tuple(column.name for column in self.columns if column.primary_key)
+
+    def column(self, name: str) -> ColumnInfo | None:
+        return next((column for column in self.columns if column.name.lower() == name.lower()), None)
+
+
+def bootstrap(
+        connection_pool: Any,
+        entities: Iterable[type],
+        validate: bool = True
+) -> dict[type, TableSchema | None]:
+    """ Reads columns of tables of all entities with one query, tables that were already read on this pool are
+    taken from cache. Entities are validated against their tables, SchemaMismatchError lists all differences.
+    Without validation schemas of missing tables are None. Entities are validated once per pool, e.g. by every
+    CrudRepo created with validate_schema """
+    descriptors = [describe(entity) for entity in entities]
+    tables = introspect(connection_pool, [descriptor.table_name for descriptor in descriptors])
+    if validate:
+        with _lock:
+            validated = _validated.setdefault(connection_pool, set())
+        problems = [
+            problem
+            for descriptor in descriptors
+            if descriptor.entity not in validated
+            for problem in mismatches(descriptor, tables.get(descriptor.table_name))
+        ]
+        if problems:
+            raise SchemaMismatchError('; '.join(problems))
+        with _lock:
+            validated.update(descriptor.entity for descriptor in descriptors)
+    return {descriptor.entity: tables.get(descriptor.table_name) for descriptor in descriptors}
+
+
+def introspect(connection_pool: Any, tables_names: Iterable[str]) -> dict[str, TableSchema]:
+    """ Returns schemas of existing tables, tables missing in cache of the pool are read with one query """
+    with _lock:
+        cached = _schemas.setdefault(connection_pool, {})
+    tables_names = list(dict.fromkeys(tables_names))
+    missing = [table_name for table_name in tables_names if table_name not in cached]
+    if missing:
+        connection = connection_pool.get_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(COLUMNS_STATEMENT.format(', '.join(['%s'] * len(missing))), missing)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        finally:
+            connection.close()
+        with _lock:
+            cached.update(tables_from_rows(rows))
+    return {table_name: cached[table_name] for table_name in tables_names if table_name in cached}
+
+
+def forget(connection_pool: Any) -> None:
+    """ Removes cached schemas and validated entities of the pool, e.g. after migration """
+    with _lock:
+        _schemas.pop(connection_pool, None)
+        _validated.pop(connection_pool, None)
+
+
+def tables_from_rows(rows: Iterable[tuple[Any, ...]]) -> dict[str, TableSchema]:
+    """ Builds schemas from rows of COLUMNS_STATEMENT ordered by table and position """
+    columns: dict[str, list[ColumnInfo]] = {}
+    for table_name, name, data_type, nullable, key, extra, default in rows:
+        columns.setdefault(_text(table_name), []).append(ColumnInfo(
+            name=_text(name),
+            data_type=_text(data_type).lower(),
+            nullable=_text(nullable) == 'YES',
+            primary_key=_text(key) == 'PRI',
+            auto_increment='auto_increment' in _text(extra).lower(),
+            has_default=default is not None
+        ))
+    return {table_name: TableSchema(table_name, tuple(table)) for table_name, table in columns.items()}
+
+
+def mismatches(descriptor: EntityDescriptor, schema: TableSchema | None) -> list[str]:
+    """ Returns differences between entity and its table that would make statements of CrudRepo fail:
+    missing table or columns, id that isn't primary key, required columns without entity field and fields which
+    annotated type can't hold values of column """
+    entity_name = descriptor.entity.__name__
+    if schema is None:
+        return [f"Table {descriptor.table_name} of entity {entity_name} doesn't exist"]
+    problems = []
+    for name in descriptor.fields_names:
+        if schema.column(name) is None:
+            problems.append(f"Table {schema.table_name} has no column {name} of entity {entity_name}")
+    primary_key = tuple(name.lower() for name in schema.primary_key)
+    if descriptor.id_index is not None and primary_key != (descriptor.fields_names[descriptor.id_index].lower(),):
+        problems.append(f"Primary key of table {schema.table_name} is {schema.primary_key}, not id")
+    lowered_names = {name.lower() for name in descriptor.fields_names}
+    for column in schema.columns:
+        required = not column.nullable and not column.has_default and not column.auto_increment
+        if required and column.name.lower() not in lowered_names:
+            problems.append(f"Required column {column.name} of table {schema.table_name} has no field in {entity_name}")
+    for field in descriptor.fields:
+        column = schema.column(field.name)
+        expected = PYTHON_TYPES.get(column.data_type) if column is not None else None
+        annotated = _annotated_types(field.type)
+        if expected and annotated and not any(issubclass(type_, expected) for type_ in annotated):
+            problems.append(
+                f"Field {entity_name}.{field.name} of type {field.type} can't hold {column.data_type} "
+                f"column of table {schema.table_name}"
+            )
+    return problems
+
+
+def _annotated_types(annotation: Any) -> tuple[type, ...]:
+    """ Returns classes of annotation without None, empty tuple when annotation can't be checked """
+    if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+        members = [member for member in typing.get_args(annotation) if member is not type(None)]
+    else:
+        members = [annotation]
+    if object in members or not all(isinstance(member, type) for member in members):
+        return ()
+    return tuple(members)
+
+
+def _text(value: Any) -> str:
+    """ Columns of information_schema can be returned as bytes by some server versions """
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    return '' if value is None else str(value)
@@ -0,0 +1,116 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TYPE_CHECKING
+
+from easy_crud_repo_service.repo.prepared import PreparedStatements
+
+if TYPE_CHECKING:
+    from easy_crud_repo_service.repo.crud_repo import CrudRepo
+
+# Transactions active in current thread, keyed by id of connection pool they were started on
+_active = threading.local()
+
+
+class Transaction:
+    """ Unit of work on one pinned connection. Every CrudRepo that uses the same connection pool runs its
+    statements on this connection while transaction is active in current thread, everything is committed once.
+    Writes can also be deferred and they are flushed as batched statements just before commit """
+
+    def __init__(self, connection: Any) -> None:
+        self.connection = connection
+        self._deferred: dict[int, tuple['CrudRepo', list[Any], list[tuple[int, Any]], list[int]]] = {}
+        self._callbacks: list[Callable[[], None]] = []
+        self._statements: PreparedStatements | None = None
+
+    def defer_insert(self, repo: 'CrudRepo', item: Any) -> None:
+        """ Inserts item at commit, id assigned by database is set on the item """
+        self._deferred_of(repo)[1].append(item)
+
+    def defer_update(self, repo: 'CrudRepo', item_id: int, item: Any) -> None:
+        """ Updates row with item values at commit """
+        self._deferred_of(repo)[2].append((item_id, item))
+
+    def defer_delete(self, repo: 'CrudRepo', item_id: int) -> None:
+        """ Deletes row at commit """
+        self._deferred_of(repo)[3].append(item_id)
+
+    def prepared_statements(self) -> PreparedStatements:
+        """ Prepared cursors of pinned connection, statements are prepared once per transaction """
+        if self._statements is None:
+            self._statements = PreparedStatements(self.connection)
+        return self._statements
+
+    def close_statements(self) -> None:
+        """ Closes prepared cursors, called before connection is released """
+        if self._statements is not None:
+            self._statements.close()
+            self._statements = None
+
+    def on_finish(self, callback: Callable[[], None]) -> None:
+        """ Registers callback called after commit or rollback """
+        self._callbacks.append(callback)
+
+    def flush(self) -> None:
+        """ Executes deferred writes: inserts, updates and deletes of every repo are sent as batches """
+        deferred, self._deferred = self._deferred, {}
+        for repo, inserts, updates, deletes in deferred.values():
+            if inserts:
+                for item, item_id in zip(inserts, repo.insert_many(inserts)):
+                    setattr(item, repo._descriptor.fields_names[repo._descriptor.id_index], item_id)
+            if updates:
+                repo._update_rows(updates)
+            if deletes:
+                repo.delete_many_by_id(deletes)
+
+    def _deferred_of(self, repo: 'CrudRepo') -> tuple['CrudRepo', list[Any], list[tuple[int, Any]], list[int]]:
+        return self._deferred.setdefault(id(repo), (repo, [], [], []))
+
+    def _finish(self) -> None:
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def active_transaction(connection_pool: Any) -> Transaction | None:
+    """ Returns transaction started on connection pool in current thread """
+    return getattr(_active, 'transactions', {}).get(id(connection_pool))
+
+
+@contextmanager
+def bind_transaction(connection_pool: Any, transaction: Transaction) -> Iterator[Transaction]:
+    """ Makes repos using connection pool run their statements in transaction in current thread """
+    transactions = _active.__dict__.setdefault('transactions', {})
+    if id(connection_pool) in transactions:
+        raise RuntimeError("Connection pool already has active transaction in this thread")
+    transactions[id(connection_pool)] = transaction
+    try:
+        yield transaction
+    finally:
+        del transactions[id(connection_pool)]
+
+
+@contextmanager
+def transaction(connection_pool: Any) -> Iterator[Transaction]:
+    """ Context manager that pins one connection of the pool for all repos using it and commits once at the end.
+    When any error occurs everything is rolled back. Nested calls join already active transaction """
+    current = active_transaction(connection_pool)
+    if current is not None:
+        yield current
+        return
+
+    connection = connection_pool.get_connection()
+    unit_of_work = Transaction(connection)
+    try:
+        with bind_transaction(connection_pool, unit_of_work):
+            yield unit_of_work
+            unit_of_work.flush()
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        try:
+            unit_of_work.close_statements()
+        finally:
+            connection.close()
+        unit_of_work._finish()
@@ -1,3 +1,6 @@
+import os
+from typing import Any, Callable
+
 import pytest
 from pathlib import Path
 
@@ -5,12 +8,151 @@ from dbm_database_service.managers import MySQLDatabaseManager
 from dbm_database_service.models.column import Column
 from dbm_database_service.models.datatype import DataType
 from dbm_database_service.models.table import Table
+from mysql.connector import InterfaceError
+from mysql.connector.errors import DatabaseError, PoolError
 
+from easy_crud_repo_service.model.coach import Coach
 from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.cache import LRUCache
 from easy_crud_repo_service.repo.connections.builders import MySQLConnectionPoolBuilder
-from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from easy_crud_repo_service.repo.connections.routed_pool import RoutedConnectionPool
+from easy_crud_repo_service.repo.crud_repo import AUTO_INCREMENT_STATEMENT, CrudRepo
+
+
+class FakeCursor:
+    """ Cursor of FakeConnection. Executed statements are logged on connection and its pool, rows are answered
+    by the pool and inserted rows get ids like from auto increment of the pool. Prepared cursors also log
+    preparation of new statement and their close """
+
+    def __init__(self, connection: 'FakeConnection', prepared: bool = False) -> None:
+        self.connection = connection
+        self.prepared = prepared
+        self.statement = None
+        self.lastrowid = None
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, operation: str, params: Any = ()) -> None:
+        if self.prepared and operation is not self.statement:
+            self.connection.log(f'prepare {operation}')
+            self.statement = operation
+        self.connection.execute(operation, params)
+        pool = self.connection.pool
+        self._rows = list(pool.answer(operation, params))
+        self.rowcount = len(self._rows)
+        if operation.startswith('insert'):
+            self.rowcount = operation.count('(%s')
+            self.lastrowid = pool.next_id
+            pool.next_id += self.rowcount * pool.increment
+
+    def executemany(self, operation: str, seq_params: Any) -> None:
+        for params in seq_params:
+            self.execute(operation, params)
+
+    def fetchone(self) -> tuple | None:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int = 1) -> list[tuple]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self) -> list[tuple]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self) -> None:
+        if self.prepared and self.statement is not None:
+            self.connection.log(f'close {self.statement}')
+
+
+class FakeConnection:
+    """ Connection of FakePool, commit, rollback and close are logged as statements """
+
+    def __init__(self, pool: 'FakePool | None' = None, **config) -> None:
+        self.pool = pool if pool is not None else FakePool()
+        self.config = config
+        self.statements = []
+        self.alive = True
+        self.closed = False
+        self.resets = 0
+
+    def cursor(self, prepared: bool = False) -> FakeCursor:
+        return FakeCursor(self, prepared)
+
+    def execute(self, operation: str, params: Any) -> None:
+        """ Logs statement executed by cursor, fail callable of the pool decides whether it fails """
+        if self.pool.fail is not None and self.pool.fail(operation, params):
+            raise DatabaseError(msg=f"Statement {operation} failed")
+        self.log(operation)
+        self.pool.params.append(params)
+
+    def log(self, event: str) -> None:
+        self.statements.append(event)
+        self.pool.statements.append(event)
+
+    def commit(self) -> None:
+        self.log('commit')
+
+    def rollback(self) -> None:
+        self.log('rollback')
+
+    def is_connected(self) -> bool:
+        return self.alive
+
+    def reset_session(self) -> None:
+        if not self.alive:
+            raise InterfaceError("Connection lost")
+        self.resets += 1
+
+    def close(self) -> None:
+        if not self.closed:
+            self.log('release')
+        self.closed = True
+
 
+class FakePool:
+    """ Pool of fake connections, so no database is needed. Every checkout creates new FakeConnection, statements
+    of all of them are logged on the pool too. rows(operation, params) answers selects, fail(operation, params)
+    makes statements fail. auto_increment_increment of the server is given by increment """
 
+    def __init__(
+            self,
+            pool_name: str = 'FAKE_POOL',
+            pool_size: int = 5,
+            rows: Callable[[str, Any], list[tuple]] | None = None,
+            fail: Callable[[str, Any], bool] | None = None,
+            increment: int = 1,
+            exhausted: bool = False
+    ) -> None:
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self.rows = rows
+        self.fail = fail
+        self.increment = increment
+        self.exhausted = exhausted
+        self.pid = os.getpid()
+        self.next_id = 1
+        self.connections = []
+        self.statements = []
+        self.params = []
+
+    @property
+    def checkouts(self) -> int:
+        return len(self.connections)
+
+    def get_connection(self) -> FakeConnection:
+        if self.exhausted:
+            raise PoolError("Failed getting connection; pool exhausted")
+        self.connections.append(FakeConnection(self))
+        return self.connections[-1]
+
+    def answer(self, operation: str, params: Any) -> list[tuple]:
+        if operation == AUTO_INCREMENT_STATEMENT:
+            return [(self.increment,)]
+        return self.rows(operation, params) if self.rows is not None else []
 
 
 @pytest.fixture
@@ -19,9 +161,11 @@ def connection_tests() -> None:
     return pool
 
 @pytest.fixture(autouse=True)
-def create_teams_table(connection_tests):
-    """ Creates teams table if not exists for further tests"""
-    dbm = MySQLDatabaseManager(connection_tests)
+def create_teams_table(request):
+    """ Creates teams table if not exists for further tests, tests that run on fakes don't need database"""
+    if 'connection_tests' not in request.fixturenames:
+        return
+    dbm = MySQLDatabaseManager(request.getfixturevalue('connection_tests'))
     columns = [
         Column('id', DataType('int'), primary_key=True, auto_increment=True),
         Column('name', DataType('varchar', 255)),
@@ -30,7 +174,46 @@ def create_teams_table(connection_tests):
     table = Table('teams', columns=columns, if_not_exist=True)
     dbm.create_table(table)
 
+@pytest.fixture(autouse=True)
+def create_coaches_table(request):
+    """ Creates coaches table with version column if not exists for further tests"""
+    if 'connection_tests' not in request.fixturenames:
+        return
+    dbm = MySQLDatabaseManager(request.getfixturevalue('connection_tests'))
+    columns = [
+        Column('id', DataType('int'), primary_key=True, auto_increment=True),
+        Column('name', DataType('varchar', 255)),
+        Column('team_id', DataType('int')),
+        Column('version', DataType('int'))
+    ]
+    table = Table('coaches', columns=columns, if_not_exist=True)
+    dbm.create_table(table)
+
 @pytest.fixture
 def repo_tests(connection_tests):
     """ CrudRepo based on Team class """
     return CrudRepo(connection_tests, Team)
+
+
+@pytest.fixture
+def prepared_repo_tests(connection_tests):
+    """ CrudRepo based on Team class that executes statements on prepared cursors """
+    return CrudRepo(connection_tests, Team, prepared=True)
+
+
+@pytest.fixture
+def cached_repo_tests(connection_tests):
+    """ CrudRepo based on Team class with LRU cache of found rows """
+    return CrudRepo(connection_tests, Team, cache=LRUCache(maxsize=100))
+
+
+@pytest.fixture
+def tracked_repo_tests(connection_tests):
+    """ CrudRepo based on Coach class that writes only changed columns and checks version column """
+    return CrudRepo(connection_tests, Coach, track_changes=True, version_column='version')
+
+
+@pytest.fixture
+def routed_repo_tests(connection_tests):
+    """ CrudRepo based on Team class that reads from replica, which is the same pool in tests """
+    return CrudRepo(RoutedConnectionPool(connection_tests, [connection_tests], read_your_writes_window=0), Team)
@@ -0,0 +1,52 @@
+import asyncio
+from pathlib import Path
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.async_crud_repo import AsyncCrudRepo
+from easy_crud_repo_service.repo.connections.builders import AsyncMySQLConnectionPoolBuilder
+
+
+def run_with_repo(scenario) -> None:
+    """ Runs coroutine function with AsyncCrudRepo based on Team class, pool is created inside event loop """
+    async def main() -> None:
+        pool = AsyncMySQLConnectionPoolBuilder(f"{Path.cwd()}\\.env").set_new_port(3306).build()
+        try:
+            await scenario(AsyncCrudRepo(pool, Team))
+        finally:
+            await pool.close()
+    asyncio.run(main())
+
+
+class TestAsyncCrudRepo:
+    def test_insert_and_find_one(self) -> None:
+        async def scenario(repo: AsyncCrudRepo) -> None:
+            team_id = await repo.insert(Team(name='JOHN', points=10))
+            assert await repo.find_one(team_id) == Team(team_id, 'JOHN', 10)
+        run_with_repo(scenario)
+
+    def test_insert_many_and_delete_many_by_id(self) -> None:
+        async def scenario(repo: AsyncCrudRepo) -> None:
+            ids = await repo.insert_many([Team(name='A', points=1), Team(name='B', points=2)], batch_size=1)
+            assert [(await repo.find_one(team_id)).name for team_id in ids] == ['A', 'B']
+            assert await repo.delete_many_by_id(ids) == ids
+        run_with_repo(scenario)
+
+    def test_update(self) -> None:
+        async def scenario(repo: AsyncCrudRepo) -> None:
+            team_id = await repo.insert(Team(name='Malaga', points=30))
+            assert await repo.update(team_id, Team(name='Malaga', points=20)) == Team(team_id, 'Malaga', 20)
+        run_with_repo(scenario)
+
+    def test_concurrent_calls_share_small_pool(self) -> None:
+        async def scenario(repo: AsyncCrudRepo) -> None:
+            ids = await asyncio.gather(*[repo.insert(Team(name=f'TEAM_{n}', points=n)) for n in range(50)])
+            assert len(set(ids)) == 50
+        run_with_repo(scenario)
+
+    def test_iter_all_and_delete_all(self) -> None:
+        async def scenario(repo: AsyncCrudRepo) -> None:
+            await repo.insert_many([Team(name='A', points=1), Team(name='B', points=2)])
+            teams = [team async for team in repo.iter_all(page_size=1)]
+            assert teams == await repo.find_all()
+            assert len(await repo.delete_all()) == len(teams)
+        run_with_repo(scenario)
@@ -0,0 +1,133 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from easy_crud_repo_service.repo.buffered import BufferFullError, BufferedCrudRepo
+from easy_crud_repo_service.repo.transaction import Transaction, bind_transaction
+
+
+class FakeRepo:
+    """ Repo which insert_many records batches, assigns consecutive ids and fails on negative items """
+
+    def __init__(self) -> None:
+        self._connection_pool = object()
+        self._descriptor = SimpleNamespace(table_name='teams')
+        self.batches = []
+        self.next_id = 1
+        self.release = threading.Event()
+        self.release.set()
+
+    def insert_many(self, items, batch_size=1000):
+        self.release.wait()
+        self.batches.append(list(items))
+        if any(item < 0 for item in items):
+            raise RuntimeError(f"Invalid items {items}")
+        ids = list(range(self.next_id, self.next_id + len(items)))
+        self.next_id += len(items)
+        return ids
+
+
+class TestBufferedCrudRepo:
+
+    def test_inserts_are_written_in_batches(self) -> None:
+        repo = FakeRepo()
+        with BufferedCrudRepo(repo, batch_size=4, flush_interval=10) as buffered:
+            futures = buffered.insert_many(list(range(10)))
+            buffered.flush()
+        assert [future.result() for future in futures] == list(range(1, 11))
+        assert repo.batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+    def test_batch_is_written_after_flush_interval(self) -> None:
+        buffered = BufferedCrudRepo(FakeRepo(), flush_interval=0.01)
+        try:
+            assert buffered.insert(1).result(timeout=5) == 1
+        finally:
+            buffered.close()
+
+    def test_failed_batch_sets_error_on_all_futures(self) -> None:
+        repo = FakeRepo()
+        with BufferedCrudRepo(repo, flush_interval=10) as buffered:
+            futures = buffered.insert_many([1, -2, 3])
+            buffered.flush()
+            assert all(str(future.exception()) == "Invalid items [1, -2, 3]" for future in futures)
+            future = buffered.insert(4)
+            buffered.flush()
+            assert future.result() == 1
+
+    def test_full_buffer_applies_backpressure(self) -> None:
+        repo = FakeRepo()
+        repo.release.clear()
+        buffered = BufferedCrudRepo(repo, batch_size=1, flush_interval=0, max_pending=2)
+        try:
+            futures = [buffered.insert(1)]
+            # Writer takes the first item and waits in insert_many, two more items fill the queue
+            while buffered.pending:
+                pass
+            futures.extend(buffered.insert_many([2, 3]))
+            with pytest.raises(BufferFullError):
+                buffered.insert(4, timeout=0.01)
+        finally:
+            repo.release.set()
+            buffered.close()
+        assert [future.result() for future in futures] == [1, 2, 3]
+
+    def test_blocked_caller_does_not_block_others(self) -> None:
+        repo = FakeRepo()
+        repo.release.clear()
+        buffered = BufferedCrudRepo(repo, batch_size=1, flush_interval=0, max_pending=1)
+        futures = [buffered.insert(1)]
+        while buffered.pending:
+            pass
+        futures.append(buffered.insert(2))
+        blocked = threading.Thread(target=lambda: futures.append(buffered.insert(3)))
+        blocked.start()
+        while not buffered._putting:
+            pass
+        # Queue is full and the other caller waits without timeout, timeout of this one still applies
+        with pytest.raises(BufferFullError):
+            buffered.insert(4, timeout=0.01)
+        closing = threading.Thread(target=buffered.close)
+        closing.start()
+        while not buffered.closed:
+            pass
+        with pytest.raises(RuntimeError, match="Buffered repo is closed"):
+            buffered.insert(5)
+        repo.release.set()
+        blocked.join(timeout=5)
+        closing.join(timeout=5)
+        assert not closing.is_alive()
+        assert [future.result(timeout=0) for future in futures] == [1, 2, 3]
+
+    def test_close_writes_queued_items(self) -> None:
+        repo = FakeRepo()
+        buffered = BufferedCrudRepo(repo, flush_interval=10)
+        futures = buffered.insert_many([1, 2, 3])
+        buffered.close()
+        assert buffered.closed
+        assert [future.result(timeout=0) for future in futures] == [1, 2, 3]
+        with pytest.raises(RuntimeError, match="Buffered repo is closed"):
+            buffered.insert(4)
+        buffered.close()
+
+    def test_cancelled_items_are_not_written(self) -> None:
+        repo = FakeRepo()
+        with BufferedCrudRepo(repo, flush_interval=10) as buffered:
+            first, second = buffered.insert_many([1, 2])
+            assert first.cancel()
+            buffered.flush()
+        assert repo.batches == [[2]]
+        assert second.result() == 1
+
+    def test_insert_inside_transaction(self) -> None:
+        repo = FakeRepo()
+        with BufferedCrudRepo(repo) as buffered:
+            with bind_transaction(repo._connection_pool, Transaction(None)):
+                with pytest.raises(RuntimeError, match="can't run inside transaction"):
+                    buffered.insert(1)
+
+    def test_invalid_options(self) -> None:
+        with pytest.raises(ValueError, match="Batch size should be higher than 0"):
+            BufferedCrudRepo(FakeRepo(), batch_size=0)
+        with pytest.raises(ValueError, match="Max pending should be higher than 0"):
+            BufferedCrudRepo(FakeRepo(), max_pending=0)
@@ -0,0 +1,131 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.cache import LRUCache, SharedCache, MISSING, CacheStats
+from easy_crud_repo_service.repo.connections.routed_pool import RoutedConnectionPool
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from tests.test_repo.conftest import FakePool
+
+
+class TestLRUCache:
+    def test_get_and_set(self) -> None:
+        cache = LRUCache()
+        assert cache.get(('teams', 1)) is MISSING
+        cache.set(('teams', 1), 'TEAM')
+        assert cache.get(('teams', 1)) == 'TEAM'
+        assert cache.stats() == CacheStats(hits=1, misses=1, evictions=0, size=1)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.set(('teams', 1), 'A')
+        cache.set(('teams', 2), 'B')
+        cache.get(('teams', 1))
+        cache.set(('teams', 3), 'C')
+        assert cache.get(('teams', 2)) is MISSING
+        assert cache.get(('teams', 1)) == 'A'
+        assert cache.stats().evictions == 1
+
+    def test_entry_expires_after_ttl(self) -> None:
+        cache = LRUCache(ttl=0.01)
+        cache.set(('teams', 1), 'A')
+        time.sleep(0.02)
+        assert cache.get(('teams', 1)) is MISSING
+        assert len(cache) == 0
+
+    def test_delete_many_and_delete_table(self) -> None:
+        cache = LRUCache()
+        cache.set(('teams', 1), 'A')
+        cache.set(('teams', 2), 'B')
+        cache.set(('players', 1), 'P')
+        cache.delete_many([('teams', 1), ('teams', 5)])
+        assert cache.get(('teams', 1)) is MISSING
+        cache.delete_table('teams')
+        assert len(cache) == 1
+        assert cache.get(('players', 1)) == 'P'
+
+    def test_fill_is_ignored_after_invalidation(self) -> None:
+        cache = LRUCache()
+        generation = cache.generation(('teams', 1))
+        cache.invalidate([('teams', 1)])
+        assert not cache.fill(('teams', 1), 'STALE', generation)
+        assert cache.get(('teams', 1)) is MISSING
+        generation = cache.generation(('teams', 1))
+        assert cache.fill(('teams', 1), 'FRESH', generation)
+        assert cache.get(('teams', 1)) == 'FRESH'
+
+    def test_fill_is_ignored_after_table_invalidation(self) -> None:
+        cache = LRUCache()
+        generation = cache.generation(('teams', 1))
+        cache.invalidate_table('teams')
+        assert not cache.fill(('teams', 1), 'STALE', generation)
+        assert cache.fill(('players', 1), 'PLAYER', cache.generation(('players', 1)))
+
+    def test_counters_are_thread_safe(self) -> None:
+        cache = LRUCache(maxsize=10)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda n: (cache.set(('teams', n % 20), n), cache.get(('teams', n % 20))), range(2000)))
+        stats = cache.stats()
+        assert stats.hits + stats.misses == 2000
+        assert stats.size == 10
+
+    def test_invalid_maxsize(self) -> None:
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestSharedCache:
+    def test_shared_mapping_is_used(self) -> None:
+        mapping = {}
+        cache = SharedCache(mapping)
+        cache.set(('teams', 1), 'A')
+        assert SharedCache(mapping).get(('teams', 1)) == 'A'
+        cache.delete_table('teams')
+        assert mapping == {}
+
+    def test_entry_expires_after_ttl(self) -> None:
+        cache = SharedCache({}, ttl=0.01)
+        cache.set(('teams', 1), 'A')
+        time.sleep(0.02)
+        assert cache.get(('teams', 1)) is MISSING
+        assert cache.stats() == CacheStats(hits=0, misses=1, evictions=1, size=0)
+
+    def test_fill_is_ignored_after_invalidation_by_other_process(self) -> None:
+        mapping = {}
+        reader, writer = SharedCache(mapping), SharedCache(mapping)
+        generation = reader.generation(('teams', 1))
+        writer.invalidate([('teams', 1)])
+        assert not reader.fill(('teams', 1), 'STALE', generation)
+        generation = reader.generation(('teams', 2))
+        writer.invalidate_table('teams')
+        assert not reader.fill(('teams', 2), 'STALE', generation)
+        assert reader.fill(('teams', 3), 'FRESH', reader.generation(('teams', 3)))
+        assert writer.get(('teams', 3)) == 'FRESH'
+        assert len(writer) == 1
+
+    def test_invalidation_between_check_and_set_removes_filled_value(self) -> None:
+        class Mapping(dict):
+            def __setitem__(self, key, value):
+                if key == ('teams', 1):
+                    writer.invalidate([key])
+                super().__setitem__(key, value)
+
+        mapping = Mapping()
+        reader, writer = SharedCache(mapping), SharedCache(mapping)
+        assert not reader.fill(('teams', 1), 'STALE', reader.generation(('teams', 1)))
+        assert reader.get(('teams', 1)) is MISSING
+
+
+class TestCachedReadsOfRoutedPool:
+    def test_rows_that_fill_cache_are_read_from_primary(self) -> None:
+        primary, replica = FakePool(rows=lambda operation, params: [(1, 'A', 1)]), FakePool()
+        routed_pool = RoutedConnectionPool(primary, [replica], read_your_writes_window=0)
+        repo = CrudRepo(routed_pool, Team, cache=LRUCache())
+        assert repo.find_one(1) == repo.find_one(1) == Team(1, 'A', 1)
+        assert repo.find_many([1]) == [Team(1, 'A', 1)]
+        assert primary.checkouts == 1
+        assert replica.checkouts == 0
+        CrudRepo(routed_pool, Team).find_all()
+        assert replica.checkouts == 1
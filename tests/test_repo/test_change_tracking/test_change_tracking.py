@@ -0,0 +1,62 @@
+import pytest
+
+from easy_crud_repo_service.model.coach import Coach
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.change_tracking import ChangeTracker, StaleEntityError
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+
+
+class TestChangeTracker:
+
+    def test_changed_columns_are_compared_with_snapshot(self) -> None:
+        tracker = ChangeTracker(('name', 'points'))
+        tracker.snapshot(1, ('Barcelona', 30))
+        assert tracker.changed(1, ('Barcelona', 30)) == ()
+        assert tracker.changed(1, ('Barcelona', 31)) == ('points',)
+        assert tracker.changed(2, ('Real', 20)) is None
+
+    def test_ignored_column_is_never_changed(self) -> None:
+        tracker = ChangeTracker(('name', 'version'), ignored='version')
+        tracker.snapshot(1, ('Barcelona', 1))
+        assert tracker.changed(1, ('Barcelona', 2)) == ()
+
+    def test_snapshots_are_forgotten(self) -> None:
+        tracker = ChangeTracker(('name',))
+        tracker.snapshot_many([(1, ('A',)), (2, ('B',))])
+        tracker.forget([1, 3])
+        assert tracker.changed(1, ('A',)) is None
+        assert len(tracker) == 1
+        tracker.clear()
+        assert len(tracker) == 0
+
+    def test_least_recent_snapshots_are_dropped_over_maxsize(self) -> None:
+        tracker = ChangeTracker(('name',), maxsize=2)
+        tracker.snapshot_many([(1, ('A',)), (2, ('B',))])
+        tracker.snapshot(1, ('C',))
+        tracker.snapshot(3, ('D',))
+        assert tracker.changed(2, ('B',)) is None
+        assert tracker.changed(1, ('C',)) == ()
+        assert len(tracker) == 2
+
+    def test_stale_entity_error_is_runtime_error(self) -> None:
+        assert issubclass(StaleEntityError, RuntimeError)
+
+
+class TestTrackedRepo:
+
+    def test_version_column_has_to_be_field_of_entity(self) -> None:
+        with pytest.raises(ValueError, match='Entity Team has no field version'):
+            CrudRepo(None, Team, version_column='version')
+
+    def test_unchanged_item_is_not_written(self) -> None:
+        repo = CrudRepo(None, Team, track_changes=True)
+        team = repo._tracked([Team(1, 'Barcelona', 30)])[0]
+        # Repo without pool would fail on any statement
+        assert repo.update(1, team, reload=False) == 1
+        assert repo.update_many([team]) == [1]
+        assert repo.save(team) == 1
+
+    def test_versioned_repo_rejects_upsert_many(self) -> None:
+        repo = CrudRepo(None, Coach, version_column='version')
+        with pytest.raises(RuntimeError, match="upsert_many can't check version"):
+            repo.upsert_many([Coach(1, 'Guardiola', 1, 3)])
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from easy_crud_repo_service.repo.connections import async_pool
+from easy_crud_repo_service.repo.connections.async_pool import AsyncMySQLConnectionPool
+
+
+class FakeAsyncConnection:
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.connected = True
+        self.pings = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    async def is_connected(self):
+        self.pings += 1
+        return self.connected
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def cmd_reset_connection(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened(monkeypatch) -> list[FakeAsyncConnection]:
+    connections = []
+
+    async def connect(**config):
+        connections.append(FakeAsyncConnection(len(connections)))
+        return connections[-1]
+
+    monkeypatch.setattr(async_pool, 'connect', connect)
+    return connections
+
+
+class TestAsyncMySQLConnectionPool:
+
+    def test_recently_released_connection_is_not_pinged(self, opened) -> None:
+        async def run():
+            pool = AsyncMySQLConnectionPool(pool_size=1)
+            async with pool.connection():
+                pass
+            async with pool.connection() as connection:
+                return connection
+
+        assert asyncio.run(run()) is opened[0]
+        assert opened[0].pings == 0
+
+    def test_dead_idle_connection_is_replaced(self, opened) -> None:
+        async def run():
+            pool = AsyncMySQLConnectionPool(pool_size=1, pool_reset_session=False, health_check_after=0)
+            async with pool.connection() as connection:
+                connection.connected = False
+            async with pool.connection() as connection:
+                return connection
+
+        assert asyncio.run(run()) is opened[1]
+        assert opened[0].closed
+
+    def test_any_error_rolls_back_connection(self, opened) -> None:
+        async def run():
+            pool = AsyncMySQLConnectionPool(pool_size=1, pool_reset_session=False)
+            with pytest.raises(ValueError):
+                async with pool.connection():
+                    raise ValueError("Invalid value")
+            async with pool.connection() as connection:
+                return connection
+
+        assert asyncio.run(run()) is opened[0]
+        assert opened[0].rollbacks == 1
+
+    def test_connection_that_is_not_connected_is_discarded_on_error(self, opened) -> None:
+        async def run():
+            pool = AsyncMySQLConnectionPool(pool_size=1, pool_reset_session=False)
+            with pytest.raises(ValueError):
+                async with pool.connection() as connection:
+                    connection.connected = False
+                    raise ValueError("Invalid value")
+            async with pool.connection() as connection:
+                return connection
+
+        assert asyncio.run(run()) is opened[1]
+        assert opened[0].closed and opened[0].rollbacks == 0
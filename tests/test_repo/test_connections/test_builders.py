@@ -6,7 +6,10 @@ import pytest
 from easyvalid_data_validator.customexceptions.common import ValidationError
 from mysql.connector.pooling import MySQLConnectionPool
 
-from easy_crud_repo_service.repo.connections.builders import MySQLConnectionPoolBuilder
+from easy_crud_repo_service.repo.connections.async_pool import AsyncMySQLConnectionPool
+from easy_crud_repo_service.repo.connections.builders import MySQLConnectionPoolBuilder, AsyncMySQLConnectionPoolBuilder
+from easy_crud_repo_service.repo.connections.elastic_pool import ElasticConnectionPool
+from easy_crud_repo_service.repo.connections.routed_pool import RoutedConnectionPool
 
 
 class TestWithValidCases:
@@ -24,6 +27,40 @@ class TestWithValidCases:
         assert e.type == ConnectionError
         assert e.value.args[0] == "File is invalid or doesn't exist"
 
+    def test_async_builder_with_absolute_path_provided(self) -> None:
+        connection_pool = AsyncMySQLConnectionPoolBuilder(self.env_path).set_pool_size(2).build()
+        assert connection_pool.pool_name == "MYSQL_POOL"
+        assert connection_pool.pool_size == 2
+        assert type(connection_pool) == AsyncMySQLConnectionPool
+
+    def test_build_elastic_with_absolute_path_provided(self) -> None:
+        connection_pool = MySQLConnectionPoolBuilder(self.env_path).set_pool_size(3).build_elastic(min_size=1)
+        assert connection_pool.pool_name == "MYSQL_POOL"
+        assert connection_pool.pool_size == 3
+        assert connection_pool.stats().idle == 1
+        assert type(connection_pool) == ElasticConnectionPool
+        connection_pool.close()
+
+    def test_build_routed_with_replica_hosts(self) -> None:
+        connection_pool = (
+            MySQLConnectionPoolBuilder(self.env_path)
+            .set_replica_hosts(['localhost', 'localhost:3306'])
+            .build_routed(strategy='least_busy')
+        )
+        assert type(connection_pool) == RoutedConnectionPool
+        assert connection_pool.pool_name == "MYSQL_POOL"
+        assert [replica.pool_name for replica in connection_pool.replicas] == [
+            "MYSQL_POOL_REPLICA_1", "MYSQL_POOL_REPLICA_2"
+        ]
+
+    def test_set_allow_local_infile(self, basic_builder) -> None:
+        basic_builder.set_allow_local_infile(True)
+        assert basic_builder._pool_config_["allow_local_infile"] is True
+
+    def test_set_replica_hosts(self, basic_builder) -> None:
+        basic_builder.set_replica_hosts(['replica-1:3307'])
+        assert basic_builder._replica_hosts_ == ['replica-1:3307']
+
     def test_set_pool_name(self, basic_builder) -> None:
         basic_builder.set_pool_name('NEW_POOL')
         assert basic_builder._pool_config_["pool_name"] == "NEW_POOL"
@@ -100,3 +137,28 @@ class TestWithInvalidCases:
         with pytest.raises(ValidationError) as e:
             MySQLConnectionPoolBuilder(self.env_path).set_new_port(3309.9).build()
         assert e.value.args[0] == {'port': ["Invalid type - isn't same type like compare type"]}
+
+    def test_async_builder_with_invalid_arg(self) -> None:
+        with pytest.raises(ValidationError) as e:
+            AsyncMySQLConnectionPoolBuilder(self.env_path).set_pool_size('1').build()
+        assert e.value.args[0] == {'pool_size': ["Invalid type - isn't same type like compare type"]}
+
+    def test_build_elastic_with_invalid_arg(self) -> None:
+        with pytest.raises(ValidationError) as e:
+            MySQLConnectionPoolBuilder(self.env_path).set_pool_size('1').build_elastic()
+        assert e.value.args[0] == {'pool_size': ["Invalid type - isn't same type like compare type"]}
+
+    def test_build_routed_with_invalid_replica_host(self) -> None:
+        with pytest.raises(ConnectionError) as e:
+            MySQLConnectionPoolBuilder(self.env_path).set_replica_hosts(['replica:port']).build_routed()
+        assert e.value.args[0] == "Replica host replica:port is invalid"
+
+    def test_build_routed_with_invalid_strategy(self) -> None:
+        with pytest.raises(ValueError) as e:
+            MySQLConnectionPoolBuilder(self.env_path).build_routed(strategy='random')
+        assert e.value.args[0] == "Routing strategy random is not supported, use one of ('round_robin', 'least_busy')"
+
+    def test_set_allow_local_infile_with_invalid_arg(self) -> None:
+        with pytest.raises(ValidationError) as e:
+            MySQLConnectionPoolBuilder(self.env_path).set_allow_local_infile('True').build()
+        assert e.value.args[0] == {'allow_local_infile': ["Invalid type - isn't same type like compare type"]}
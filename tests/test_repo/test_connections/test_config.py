@@ -0,0 +1,62 @@
+import os
+
+import pytest
+from easyvalid_data_validator.customexceptions.common import ValidationError
+
+from easy_crud_repo_service.repo.connections.builders import MySQLConnectionPoolBuilder
+from easy_crud_repo_service.repo.connections.config import PoolConfig
+
+ENV = """POOL_NAME=MYSQL_POOL
+POOL_SIZE=5
+POOL_RESET_SESSION=True
+HOST=localhost
+DATABASE=db_1
+USER=user
+PASSWORD=user1234
+PORT=3307
+REPLICA_HOSTS=replica-1:3308, replica-2
+"""
+
+
+@pytest.fixture
+def env_path(tmp_path) -> str:
+    path = tmp_path / '.env'
+    path.write_text(ENV)
+    return str(path)
+
+
+class TestPoolConfig:
+
+    def test_config_is_parsed_from_dotenv(self, env_path) -> None:
+        config = PoolConfig.from_dotenv(env_path)
+        assert config.pool_size == 5
+        assert config.port == 3307
+        assert config.allow_local_infile is False
+        assert config.replica_hosts == ('replica-1:3308', 'replica-2')
+        assert config.pool_options()['database'] == 'db_1'
+        assert 'replica_hosts' not in config.pool_options()
+
+    def test_environment_is_not_changed(self, env_path, monkeypatch) -> None:
+        monkeypatch.setenv('HOST', 'other-host')
+        monkeypatch.delenv('POOL_NAME', raising=False)
+        assert PoolConfig.from_dotenv(env_path).host == 'localhost'
+        assert os.environ['HOST'] == 'other-host'
+        assert 'POOL_NAME' not in os.environ
+
+    def test_missing_file(self, tmp_path) -> None:
+        with pytest.raises(ConnectionError, match="File is invalid or doesn't exist"):
+            PoolConfig.from_dotenv(str(tmp_path / 'fake.env'))
+
+    def test_invalid_option(self, env_path) -> None:
+        with pytest.raises(ValidationError) as e:
+            PoolConfig(**{**PoolConfig.from_dotenv(env_path).pool_options(), 'host': None})
+        assert e.value.args[0] == {'host': ["Invalid type - isn't same type like compare type"]}
+
+    def test_builder_uses_parsed_config(self, env_path) -> None:
+        config = PoolConfig.from_dotenv(env_path)
+        builder = MySQLConnectionPoolBuilder(config=config)
+        assert builder._validated_
+        assert builder.config() == config
+        builder.set_pool_size(2)
+        assert not builder._validated_
+        assert builder.config().pool_size == 2
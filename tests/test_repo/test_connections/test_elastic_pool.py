@@ -0,0 +1,176 @@
+import threading
+import time
+
+import pytest
+from mysql.connector import InterfaceError
+from mysql.connector.errors import PoolError
+
+from easy_crud_repo_service.repo.connections.elastic_pool import ElasticConnectionPool
+from tests.test_repo.conftest import FakeConnection
+
+
+def make_pool(**kwargs) -> ElasticConnectionPool:
+    return ElasticConnectionPool(pool_name='TEST_POOL', connection_factory=FakeConnection, **kwargs)
+
+
+class TestElasticConnectionPool:
+    """ Cases for ElasticConnectionPool, connections are replaced with fakes so no database is needed """
+
+    def test_pool_grows_lazily(self) -> None:
+        pool = make_pool(max_size=3, host='localhost')
+        assert pool.stats().created == 0
+        connection = pool.get_connection()
+        assert connection.config == {'host': 'localhost'}
+        assert pool.stats().created == 1
+        assert pool.stats().in_use == 1
+
+    def test_min_size_connections_are_created_eagerly(self) -> None:
+        pool = make_pool(min_size=2, max_size=3)
+        assert pool.stats().idle == 2
+        assert pool.stats().created == 2
+
+    def test_min_size_connections_are_warmed_in_background(self) -> None:
+        opened = threading.Event()
+
+        def slow_connection(**config) -> FakeConnection:
+            opened.wait(1)
+            return FakeConnection(**config)
+
+        pool = ElasticConnectionPool(
+            min_size=3, max_size=3, connection_factory=slow_connection, warm_in_background=True
+        )
+        assert pool.stats().created == 0
+        opened.set()
+        assert pool.wait_until_warm(1)
+        assert pool.stats().idle == 3
+        assert pool.stats().created == 3
+
+    def test_warm_up_failures_are_ignored(self) -> None:
+        def failing_connection(**config) -> FakeConnection:
+            raise InterfaceError("Server is not available")
+
+        pool = ElasticConnectionPool(
+            min_size=2, max_size=2, connection_factory=failing_connection, warm_in_background=True
+        )
+        assert pool.wait_until_warm(1)
+        assert pool.stats().idle == 0
+
+    def test_released_connection_is_reused_and_reset(self) -> None:
+        pool = make_pool(max_size=2)
+        with pool.get_connection() as connection:
+            raw = connection._slot.connection
+        with pool.get_connection() as connection:
+            assert connection._slot.connection is raw
+        assert raw.resets == 2
+        assert pool.stats().created == 1
+        assert pool.stats().checkouts == 2
+
+    def test_close_twice_releases_once(self) -> None:
+        pool = make_pool(max_size=1)
+        connection = pool.get_connection()
+        connection.close()
+        connection.close()
+        assert pool.stats().in_use == 0
+        assert pool.stats().idle == 1
+
+    def test_exhausted_pool_raises_after_wait_timeout(self) -> None:
+        pool = make_pool(max_size=1, wait_timeout=0.05)
+        pool.get_connection()
+        with pytest.raises(PoolError) as e:
+            pool.get_connection()
+        assert e.value.msg == "Failed getting connection; pool exhausted for 0.05 seconds"
+        assert pool.stats().timeouts == 1
+
+    def test_waiting_thread_gets_released_connection(self) -> None:
+        pool = make_pool(max_size=1, wait_timeout=5)
+        connection = pool.get_connection()
+        threading.Timer(0.05, connection.close).start()
+        with pool.get_connection():
+            pass
+        assert pool.stats().max_wait_time > 0
+        assert pool.stats().created == 1
+
+    def test_callers_above_max_waiters_are_rejected_at_once(self) -> None:
+        pool = make_pool(max_size=1, wait_timeout=5, max_waiters=1)
+        connection = pool.get_connection()
+        waiter = threading.Thread(target=lambda: pool.get_connection().close())
+        waiter.start()
+        while pool._waiters < 1:
+            time.sleep(0.001)
+        started_at = time.monotonic()
+        with pytest.raises(PoolError) as e:
+            pool.get_connection()
+        assert time.monotonic() - started_at < 1
+        assert e.value.msg == "Failed getting connection; pool exhausted and 1 callers already wait"
+        connection.close()
+        waiter.join()
+        stats = pool.stats()
+        assert stats.rejections == 1
+        assert stats.timeouts == 0
+        assert stats.checkouts == 2
+
+    def test_zero_max_waiters_never_waits(self) -> None:
+        pool = make_pool(max_size=1, wait_timeout=5, max_waiters=0)
+        pool.get_connection()
+        with pytest.raises(PoolError):
+            pool.get_connection()
+        assert pool.stats().rejections == 1
+
+    def test_idle_connections_above_min_size_are_reaped(self) -> None:
+        pool = make_pool(min_size=1, max_size=3, idle_timeout=0)
+        first, second = pool.get_connection(), pool.get_connection()
+        first.close()
+        second.close()
+        pool.get_connection()
+        stats = pool.stats()
+        assert stats.destroyed == 1
+        assert stats.in_use + stats.idle == 1
+
+    def test_dead_connection_is_replaced_after_health_check(self) -> None:
+        pool = make_pool(max_size=1, health_check_after=0)
+        with pool.get_connection() as connection:
+            raw = connection._slot.connection
+        raw.alive = False
+        with pool.get_connection() as connection:
+            assert connection._slot.connection is not raw
+        assert raw.closed
+
+    def test_connection_is_not_pinged_before_health_check_after(self) -> None:
+        pool = make_pool(max_size=1, health_check_after=60)
+        with pool.get_connection() as connection:
+            raw = connection._slot.connection
+        raw.is_connected = lambda: pytest.fail("Connection shouldn't be pinged")
+        with pool.get_connection() as connection:
+            assert connection._slot.connection is raw
+
+    def test_broken_connection_is_closed_on_release(self) -> None:
+        pool = make_pool(max_size=1)
+        connection = pool.get_connection()
+        connection._slot.connection.alive = False
+        connection.close()
+        assert pool.stats().idle == 0
+        assert pool.stats().destroyed == 1
+
+    def test_connection_older_than_max_lifetime_is_recycled(self) -> None:
+        pool = make_pool(max_size=1, max_lifetime=0.01)
+        with pool.get_connection() as connection:
+            raw = connection._slot.connection
+            time.sleep(0.02)
+        assert raw.closed
+        assert pool.stats().idle == 0
+
+    def test_close_closes_idle_connections(self) -> None:
+        pool = make_pool(min_size=2, max_size=2)
+        pool.close()
+        assert pool.stats().idle == 0
+        assert pool.stats().destroyed == 2
+
+    def test_invalid_sizes(self) -> None:
+        with pytest.raises(AttributeError) as e:
+            make_pool(min_size=3, max_size=2)
+        assert e.value.args[0] == "Pool sizes should satisfy 0 <= min_size <= max_size and max_size > 0"
+
+    def test_invalid_max_waiters(self) -> None:
+        with pytest.raises(AttributeError) as e:
+            make_pool(max_waiters=-1)
+        assert e.value.args[0] == "Pool max_waiters should be None or >= 0"
@@ -0,0 +1,56 @@
+import multiprocessing
+import os
+import pickle
+
+import pytest
+
+from easy_crud_repo_service.repo.connections.builders import MySQLConnectionPoolBuilder, PoolFactory
+from easy_crud_repo_service.repo.connections.config import PoolConfig
+from easy_crud_repo_service.repo.connections.fork_safe import ForkSafeConnectionPool
+from tests.test_repo.conftest import FakePool
+
+
+def pool_pid(pool: ForkSafeConnectionPool) -> tuple[int, int]:
+    return pool.get_connection().pool.pid, os.getpid()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is not available')
+class TestForkSafeConnectionPool:
+
+    def test_pool_is_created_on_first_use(self) -> None:
+        created = []
+        pool = ForkSafeConnectionPool(lambda: created.append(1) or FakePool())
+        assert not created
+        assert pool.pool_name == 'FAKE_POOL'
+        assert pool.get_connection().pool.pid == os.getpid()
+        assert created == [1]
+
+    def test_child_process_creates_own_pool(self) -> None:
+        pool = ForkSafeConnectionPool(FakePool)
+        parent_pool = pool.pool
+        with multiprocessing.get_context('fork').Pool(1) as processes:
+            connection_pid, child_pid = processes.apply(pool_pid, (pool,))
+        assert connection_pid == child_pid != os.getpid()
+        assert pool.pool is parent_pool
+
+    def test_pool_is_pickled_as_factory(self) -> None:
+        pool = ForkSafeConnectionPool(FakePool)
+        pool.get_connection()
+        copied = pickle.loads(pickle.dumps(pool))
+        assert copied._pool is None
+        assert copied.get_connection().pool.pid == os.getpid()
+
+    def test_builder_saves_config_in_factory(self, tmp_path) -> None:
+        (tmp_path / '.env').write_text(
+            'POOL_NAME=MYSQL_POOL\nPOOL_SIZE=5\nHOST=localhost\nDATABASE=db\nUSER=user\nPASSWORD=pass\nPORT=3307\n'
+        )
+        builder = MySQLConnectionPoolBuilder(str(tmp_path / '.env')).set_pool_size(2)
+        pool = builder.build_fork_safe('build_lazy', warm_in_background=False)
+        builder.set_pool_size(3)
+        factory = pickle.loads(pickle.dumps(pool))._factory
+        assert isinstance(factory, PoolFactory)
+        assert isinstance(factory.config, PoolConfig)
+        assert factory.config.pool_size == 2
+        assert factory.method == 'build_lazy'
+        with pytest.raises(ValueError, match='Build method build_async is not supported'):
+            builder.build_fork_safe('build_async')
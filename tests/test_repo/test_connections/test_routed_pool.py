@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from easy_crud_repo_service.repo.connections.routed_pool import RoutedConnection, RoutedConnectionPool
+from tests.test_repo.conftest import FakePool
+
+
+class TestRoutedConnectionPool:
+    """ Cases for RoutedConnectionPool, pools are replaced with fakes so no database is needed """
+
+    def test_writes_go_to_primary(self) -> None:
+        primary, replica = FakePool(), FakePool()
+        routed_pool = RoutedConnectionPool(primary, [replica])
+        assert routed_pool.get_connection().pool is primary
+        assert routed_pool.pool_name == 'FAKE_POOL'
+        assert routed_pool.pool_size == 5
+
+    def test_reads_are_spread_round_robin(self) -> None:
+        primary, replicas = FakePool(), [FakePool(), FakePool(), FakePool()]
+        routed_pool = RoutedConnectionPool(primary, replicas)
+        for _ in range(6):
+            routed_pool.get_read_connection().close()
+        assert [replica.checkouts for replica in replicas] == [2, 2, 2]
+        assert primary.checkouts == 0
+
+    def test_reads_go_to_least_busy_replica(self) -> None:
+        primary, replicas = FakePool(), [FakePool(), FakePool()]
+        routed_pool = RoutedConnectionPool(primary, replicas, strategy='least_busy')
+        first = routed_pool.get_read_connection()
+        second = routed_pool.get_read_connection()
+        assert isinstance(first, RoutedConnection)
+        first_pool = first.pool
+        assert first_pool is not second.pool
+        first.close()
+        third = routed_pool.get_read_connection()
+        assert third.pool is first_pool
+        assert routed_pool._busy.count(1) == 2
+
+    def test_reads_stay_on_primary_after_write(self) -> None:
+        primary, replica = FakePool(), FakePool()
+        routed_pool = RoutedConnectionPool(primary, [replica], read_your_writes_window=0.05)
+        routed_pool.get_connection().close()
+        assert routed_pool.get_read_connection().pool is primary
+        time.sleep(0.06)
+        assert routed_pool.get_read_connection().pool is replica
+
+    def test_read_your_writes_window_starts_when_write_is_committed(self) -> None:
+        primary, replica = FakePool(), FakePool()
+        routed_pool = RoutedConnectionPool(primary, [replica], read_your_writes_window=0.05)
+        connection = routed_pool.get_connection()
+        assert isinstance(connection, RoutedConnection)
+        time.sleep(0.06)
+        connection.commit()
+        connection.close()
+        assert primary.connections[0].statements == ['commit', 'release']
+        assert routed_pool.get_read_connection().pool is primary
+        time.sleep(0.06)
+        assert routed_pool.get_read_connection().pool is replica
+
+    def test_exhausted_replica_falls_back(self) -> None:
+        primary, replicas = FakePool(), [FakePool(exhausted=True), FakePool(exhausted=True)]
+        routed_pool = RoutedConnectionPool(primary, replicas)
+        assert routed_pool.get_read_connection().pool is primary
+        assert routed_pool._busy == [0, 0]
+
+    def test_without_replicas_reads_go_to_primary(self) -> None:
+        primary = FakePool()
+        assert RoutedConnectionPool(primary).get_read_connection().pool is primary
+
+    def test_close_is_idempotent(self) -> None:
+        routed_pool = RoutedConnectionPool(FakePool(), [FakePool()])
+        connection = routed_pool.get_read_connection()
+        connection.close()
+        connection.close()
+        assert routed_pool._busy == [0]
+
+    def test_invalid_strategy(self) -> None:
+        with pytest.raises(ValueError) as e:
+            RoutedConnectionPool(FakePool(), strategy='random')
+        assert e.value.args[0] == "Routing strategy random is not supported, use one of ('round_robin', 'least_busy')"
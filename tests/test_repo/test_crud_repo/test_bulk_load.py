@@ -0,0 +1,29 @@
+import tempfile
+
+import pytest
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from tests.test_repo.conftest import FakePool
+
+
+class TestBulkLoad:
+
+    def test_temporary_file_is_removed_when_source_fails(self, tmp_path, monkeypatch) -> None:
+        def teams():
+            yield Team(name='A')
+            raise ValueError('broken source')
+
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+        pool = FakePool()
+        with pytest.raises(ValueError):
+            CrudRepo(pool, Team).bulk_load(teams())
+        assert list(tmp_path.iterdir()) == []
+        assert pool.statements == []
+
+    def test_temporary_file_is_removed_after_load(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+        pool = FakePool()
+        CrudRepo(pool, Team).bulk_load([Team(name='A'), Team(name='B')])
+        assert list(tmp_path.iterdir()) == []
+        assert pool.statements[0].startswith('load data local infile')
@@ -0,0 +1,23 @@
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import AUTO_INCREMENT_STATEMENT, CrudRepo
+from tests.test_repo.conftest import FakePool
+
+
+class TestInsertMany:
+
+    def test_ids_are_computed_from_first_id_of_every_statement(self) -> None:
+        pool = FakePool(increment=2)
+        repo = CrudRepo(pool, Team)
+        assert repo.insert_many([Team(name=f'T{n}') for n in range(5)], batch_size=3) == [1, 3, 5, 7, 9]
+        assert pool.statements[1:] == [
+            'insert into teams (name, points) values (%s, %s), (%s, %s), (%s, %s)',
+            'insert into teams (name, points) values (%s, %s), (%s, %s)',
+            'commit',
+            'release'
+        ]
+
+    def test_settings_are_read_once_per_pool(self) -> None:
+        pool = FakePool()
+        CrudRepo(pool, Team).insert_many([Team(name='A')])
+        CrudRepo(pool, Team).insert_many([Team(name='B')])
+        assert pool.statements.count(AUTO_INCREMENT_STATEMENT) == 1
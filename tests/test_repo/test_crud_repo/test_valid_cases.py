@@ -1,13 +1,20 @@
+import io
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 from datetime import date
 
 from easy_crud_repo_service.model.car import Car
+from easy_crud_repo_service.model.coach import Coach
 from easy_crud_repo_service.model.order import Order
 
 logging.basicConfig(level=logging.INFO)
 from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.change_tracking import StaleEntityError
 from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from easy_crud_repo_service.repo.instrumentation import Instrumentation
 
 
 class TestCrudRepo:
@@ -48,6 +55,58 @@ class TestCrudRepo:
         assert all([True for n in res if n > 0])
         assert len(res) == 2
 
+    def test_bulk_load_falls_back_to_inserts_when_local_infile_is_disabled(self, repo_tests) -> None:
+        count = repo_tests.count()
+        teams = (Team(name=f'TEAM\t{n}', points=n) for n in range(5))
+        assert repo_tests.bulk_load(teams, batch_size=2) == 5
+        assert repo_tests.count() == count + 5
+        assert repo_tests.find_n_last(1)[0].name == 'TEAM\t4'
+
+    def test_bulk_load_of_crlf_file(self, repo_tests, tmp_path) -> None:
+        path = tmp_path / 'teams.tsv'
+        path.write_bytes(b'CRLF\t1\r\nCRLF\t2\r\n')
+        assert repo_tests.bulk_load(path, line_terminator='\r\n') == 2
+        assert [team.points for team in repo_tests.find_n_last(2)] == [2, 1]
+        assert repo_tests.find_n_last(1)[0].name == 'CRLF'
+
+    def test_export_filtered_rows_to_jsonl(self, repo_tests) -> None:
+        repo_tests.insert_many([Team(name='EXPORTED', points=1), Team(name='EXPORTED', points=2)])
+        stream = io.StringIO()
+        assert repo_tests.export(stream, format='jsonl', batch_size=1, name='EXPORTED') >= 2
+        assert '"name": "EXPORTED"' in stream.getvalue().splitlines()[0]
+
+    def test_instrumented_repo_collects_histograms(self, connection_tests) -> None:
+        instrumentation = Instrumentation()
+        events = []
+        instrumentation.after_execute(events.append)
+        repo = CrudRepo(connection_tests, Team, instrumentation=instrumentation)
+        team_id = repo.insert(Team(name='Malaga', points=30))
+        repo.find_one(team_id)
+        assert [(event.operation, event.rows) for event in events] == [('insert', 1), ('find_one', 1)]
+        assert instrumentation.to_dict()[('Team', 'find_one')]['count'] == 1
+
+    def test_repo_can_be_shared_by_threads(self, repo_tests) -> None:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            ids = list(executor.map(lambda n: repo_tests.insert(Team(name=f'THREAD_{n}', points=n)), range(40)))
+        assert len(set(ids)) == 40
+        assert [team.name for team in repo_tests.find_many(ids)] == [f'THREAD_{n}' for n in range(40)]
+
+    def test_parallel_insert_many(self, repo_tests) -> None:
+        teams = [Team(name=f'PARALLEL_{n}', points=n) for n in range(25)]
+        report = repo_tests.parallel(workers=3, chunk_size=10, atomic=True).insert_many(teams)
+        assert report.ok
+        assert [team.name for team in repo_tests.find_many(report.results)] == [team.name for team in teams]
+
+    def test_insert_many_returns_ids_in_input_order(self, repo_tests) -> None:
+        teams = [Team(name=f'TEAM_{n}', points=n) for n in range(5)]
+        res = repo_tests.insert_many(teams, batch_size=2)
+        assert len(res) == 5
+        assert res == sorted(res)
+        assert [repo_tests.find_one(team_id).name for team_id in res] == [team.name for team in teams]
+
+    def test_insert_many_with_empty_list(self, repo_tests) -> None:
+        assert repo_tests.insert_many([]) == []
+
     def test_update_with_valid_entity(self, repo_tests) -> None:
         team_for_insert = Team('Malaga', 30)
         team_for_update = Team('Malaga', 20)
@@ -56,6 +115,26 @@ class TestCrudRepo:
         assert obtained_team.id == team_id
         assert obtained_team.points == team_for_update.points and obtained_team.points != team_for_insert
 
+    def test_update_without_reload(self, repo_tests) -> None:
+        team_id = repo_tests.insert(Team(name='Malaga', points=30))
+        assert repo_tests.update(team_id, Team(name='Malaga', points=20), reload=False) == team_id
+        assert repo_tests.find_one(team_id).points == 20
+
+    def test_valid_update_many(self, repo_tests) -> None:
+        ids = repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=2), Team(name='C', points=3)])
+        teams = [Team(ids[2], 'C2', 30), Team(ids[0], 'A2', 10), Team(ids[1], 'B2', 20)]
+        assert repo_tests.update_many(teams, batch_size=2) == [ids[2], ids[0], ids[1]]
+        assert repo_tests.find_many(ids) == [Team(ids[0], 'A2', 10), Team(ids[1], 'B2', 20), Team(ids[2], 'C2', 30)]
+
+    def test_valid_upsert_many(self, repo_tests) -> None:
+        existing_id = repo_tests.insert(Team(name='A', points=1))
+        new_id = repo_tests.insert(Team(name='B', points=2))
+        repo_tests.delete_one(new_id)
+        teams = [Team(None, 'C', 3), Team(existing_id, 'A2', 10), Team(new_id, 'B2', 20)]
+        ids = repo_tests.upsert_many(teams, batch_size=1)
+        assert ids[1:] == [existing_id, new_id]
+        assert repo_tests.find_many(ids) == [Team(ids[0], 'C', 3), Team(existing_id, 'A2', 10), Team(new_id, 'B2', 20)]
+
     def test_valid_find_n_last(self, repo_tests) -> None:
         teams = repo_tests.find_n_last(2)
         assert len(teams) == 2
@@ -67,17 +146,65 @@ class TestCrudRepo:
         found_team = repo_tests.find_one(insert_res)
         assert found_team.id == insert_res
 
+    def test_valid_find_all_rows(self, repo_tests) -> None:
+        repo_tests.delete_all()
+        ids = repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=2)])
+        assert repo_tests.find_all_rows(batch_size=1) == [(ids[0], 'A', 1), (ids[1], 'B', 2)]
+        assert repo_tests.find_all_rows('dict')[0] == {'id': ids[0], 'name': 'A', 'points': 1}
+        assert repo_tests.find_all_rows('columns') == {'id': ids, 'name': ['A', 'B'], 'points': [1, 2]}
+
+    def test_valid_find_many(self, repo_tests) -> None:
+        ids = repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=2), Team(name='C', points=3)])
+        teams = repo_tests.find_many([ids[2], ids[0], ids[1]], chunk_size=2)
+        assert [team.id for team in teams] == [ids[2], ids[0], ids[1]]
+        assert [team.name for team in teams] == ['C', 'A', 'B']
+
+    def test_find_many_with_missing_ids(self, repo_tests) -> None:
+        team_id = repo_tests.insert(Team(name='A', points=1))
+        with pytest.raises(RuntimeError) as e:
+            repo_tests.find_many([team_id, -1])
+        assert e.value.args[0] == "Items with ids [-1] weren't found"
+        assert [team.id for team in repo_tests.find_many([team_id, -1], ignore_missing=True)] == [team_id]
+
+    def test_valid_exists(self, repo_tests) -> None:
+        team_id = repo_tests.insert(Team(name='A', points=1))
+        assert repo_tests.exists(team_id)
+        assert not repo_tests.exists(-1)
+
+    def test_valid_count(self, repo_tests) -> None:
+        repo_tests.insert(Team(name='A', points=1))
+        assert repo_tests.count() == len(repo_tests.find_all())
+
     def test_valid_find_all(self, repo_tests) -> None:
         teams = repo_tests.find_all()
         assert len(teams) > 0
         assert all([True for team in teams if type(team) == Team])
 
+    def test_valid_iter_all(self, repo_tests) -> None:
+        repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=2), Team(name='C', points=3)])
+        teams = list(repo_tests.iter_all(page_size=2))
+        assert teams == repo_tests.find_all()
+        assert [team.id for team in teams] == sorted(team.id for team in teams)
+
+    def test_iter_all_can_be_abandoned(self, repo_tests) -> None:
+        repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=2)])
+        teams = repo_tests.iter_all(page_size=1)
+        assert type(next(teams)) == Team
+        teams.close()
+        # Connection of abandoned iteration is already back in the pool
+        assert len(repo_tests.find_all()) > 0
+
     def test_valid_delete_one(self, repo_tests) -> None:
         team_for_insert = Team('Malaga', 30)
         insert_res = repo_tests.insert(team_for_insert)
         deleted__id = repo_tests.delete_one(insert_res)
         assert insert_res == deleted__id
 
+    def test_delete_one_with_missing_id(self, repo_tests) -> None:
+        with pytest.raises(RuntimeError) as e:
+            repo_tests.delete_one(-1)
+        assert e.value.args[0] == "Item with id -1 wasn't found"
+
     def test_valid_delete_many(self, repo_tests) -> None:
         teams_for_insert = [Team(None, 'A', 30), Team(None, 'B', 30), Team(None, 'C', 30)]
         insert_res = repo_tests.insert_many(teams_for_insert)
@@ -97,6 +224,108 @@ class TestCrudRepo:
         deleted_ids = repo_tests.delete_all()
         assert len(deleted_ids) > 0
 
+    def test_delete_all_with_many_pages(self, repo_tests) -> None:
+        inserted_ids = repo_tests.insert_many([Team(name=f'TEAM_{n}', points=n) for n in range(5)])
+        deleted_ids = repo_tests.delete_all(page_size=2)
+        assert set(inserted_ids) <= set(deleted_ids)
+        assert repo_tests.find_all() == []
+
+    def test_insert_and_find_one_with_prepared_statements(self, prepared_repo_tests) -> None:
+        team_id = prepared_repo_tests.insert(Team(name="O'Neil", points=10))
+        found_team = prepared_repo_tests.find_one(team_id)
+        assert found_team == Team(team_id, "O'Neil", 10)
+
+    def test_update_with_prepared_statements(self, prepared_repo_tests) -> None:
+        team_id = prepared_repo_tests.insert(Team(name='Malaga', points=30))
+        updated_team = prepared_repo_tests.update(team_id, Team(name='Malaga', points=20))
+        assert updated_team == Team(team_id, 'Malaga', 20)
+
+    def test_delete_many_by_id_with_single_id(self, repo_tests) -> None:
+        team_id = repo_tests.insert(Team(name='A', points=1))
+        assert repo_tests.delete_many_by_id([team_id]) == [team_id]
+
+    def test_statement_is_compiled_once(self, repo_tests) -> None:
+        statement = repo_tests._statement('insert')
+        assert statement == 'insert into teams (name, points) values (%s, %s)'
+        assert repo_tests._statement('insert') is statement
+
+    def test_find_one_is_served_from_cache(self, cached_repo_tests) -> None:
+        team_id = cached_repo_tests.insert(Team(name='Malaga', points=30))
+        first = cached_repo_tests.find_one(team_id)
+        first.points = 10
+        second = cached_repo_tests.find_one(team_id)
+        assert second == Team(id=team_id, name='Malaga', points=30)
+        assert second is not cached_repo_tests.find_one(team_id)
+        assert cached_repo_tests._cache.stats().hits == 2
+
+    def test_cache_is_skipped_inside_transaction(self, cached_repo_tests) -> None:
+        team_id = cached_repo_tests.insert(Team(name='Malaga', points=30))
+        with cached_repo_tests.transaction():
+            cached_repo_tests.update(team_id, Team(name='Malaga', points=20), reload=False)
+            # Another thread caches committed state of the row while transaction is running
+            cached_repo_tests._cache.set(('teams', team_id), Team(id=team_id, name='Malaga', points=30))
+            assert cached_repo_tests.find_one(team_id).points == 20
+            assert cached_repo_tests.find_many([team_id])[0].points == 20
+
+    def test_cache_is_refreshed_by_update(self, cached_repo_tests) -> None:
+        team_id = cached_repo_tests.insert(Team(name='Malaga', points=30))
+        cached_repo_tests.find_one(team_id)
+        cached_repo_tests.update(team_id, Team(name='Malaga', points=20))
+        assert cached_repo_tests.find_one(team_id).points == 20
+
+    def test_cache_is_invalidated_by_delete(self, cached_repo_tests) -> None:
+        team_id = cached_repo_tests.insert(Team(name='Malaga', points=30))
+        cached_repo_tests.find_one(team_id)
+        cached_repo_tests.delete_many_by_id([team_id])
+        with pytest.raises(RuntimeError):
+            cached_repo_tests.find_one(team_id)
+
+    def test_tracked_repo_writes_changed_items_with_version_check(self, tracked_repo_tests) -> None:
+        coach_id = tracked_repo_tests.insert(Coach(name='Guardiola', team_id=1))
+        coach = tracked_repo_tests.find_one(coach_id)
+        stale = tracked_repo_tests.find_one(coach_id)
+        coach.name = 'Ancelotti'
+        tracked_repo_tests.save(coach)
+        assert coach.version == 1
+        assert tracked_repo_tests.find_one(coach_id) == Coach(id=coach_id, name='Ancelotti', team_id=1, version=1)
+        stale.team_id = 2
+        with pytest.raises(StaleEntityError):
+            tracked_repo_tests.update_many([stale])
+        assert tracked_repo_tests.find_one(coach_id).team_id == 1
+
+    def test_upsert_many_is_rejected_by_versioned_repo(self, tracked_repo_tests) -> None:
+        with pytest.raises(RuntimeError, match="upsert_many can't check version"):
+            tracked_repo_tests.upsert_many([Coach(id=1, name='Guardiola')])
+
+    def test_upsert_many_refreshes_tracked_rows(self, connection_tests) -> None:
+        repo = CrudRepo(connection_tests, Team, track_changes=True)
+        team_id = repo.insert(Team(name='Malaga', points=30))
+        team = repo.find_one(team_id)
+        repo.upsert_many([Team(id=team_id, name='Malaga', points=10)])
+        team.points = 30
+        repo.save(team)
+        assert repo.find_one(team_id).points == 30
+
+    def test_repo_with_validated_schema(self, connection_tests) -> None:
+        repo = CrudRepo(connection_tests, Team, validate_schema=True)
+        schema = repo.schema()
+        assert schema.columns_names == ('id', 'name', 'points')
+        assert schema.primary_key == ('id',)
+        assert schema.column('id').auto_increment
+
+    def test_reads_of_routed_repo_go_to_replica(self, routed_repo_tests) -> None:
+        team_id = routed_repo_tests.insert(Team(name='Malaga', points=30))
+        assert routed_repo_tests.find_one(team_id) == Team(id=team_id, name='Malaga', points=30)
+        assert routed_repo_tests._connection_pool._busy == [0]
+
+    def test_buffered_inserts_are_written_with_multi_row_statements(self, repo_tests) -> None:
+        teams = [Team(name=f'TEAM_{n}', points=n) for n in range(25)]
+        with repo_tests.buffered(batch_size=10, flush_interval=10) as buffered:
+            futures = buffered.insert_many(teams)
+        ids = [future.result() for future in futures]
+        assert len(set(ids)) == 25
+        assert repo_tests.find_many(ids) == [Team(item_id, f'TEAM_{n}', n) for n, item_id in enumerate(ids)]
+
     def test_valid_column_values_for_insert(self) -> None:
         columns_for_insert = CrudRepo._column_values_for_insert(Team(1, 'MALAGA', 10))
         assert type(columns_for_insert) == str
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from datetime import date
+
+import pytest
+
+from easy_crud_repo_service.model.car import Car
+from easy_crud_repo_service.model.order import Order
+from easy_crud_repo_service.model.player import Player
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.entity_descriptor import describe
+from easy_crud_repo_service.repo.relationships import BelongsTo, belongs_to
+
+
+class TestEntityDescriptor:
+    def test_descriptor_is_cached_per_entity(self) -> None:
+        assert describe(Team) is describe(Team)
+        assert describe(Team) is not describe(Car)
+
+    def test_descriptor_metadata(self) -> None:
+        descriptor = describe(Team)
+        assert descriptor.table_name == 'teams'
+        assert descriptor.fields_names == ('id', 'name', 'points')
+        assert descriptor.id_index == 0
+        assert descriptor.insert_fields_names == ('name', 'points')
+        assert descriptor.insert_columns == 'name, points'
+
+    def test_precompiled_statements(self) -> None:
+        statements = describe(Team).statements
+        assert statements['insert'] == 'insert into teams (name, points) values (%s, %s)'
+        assert statements['update'] == 'update teams set name=%s, points=%s where id = %s'
+        assert statements['find_one'] == 'select id, name, points from teams where id = %s'
+        assert statements['find_next_page'] == 'select id, name, points from teams where id > %s order by id limit %s'
+        assert statements['load_data'] == (
+            'load data local infile %s into table teams character set utf8mb4 lines terminated by %s (name, points)'
+        )
+
+    def test_insert_many_statement(self) -> None:
+        statement = describe(Team).insert_many_statement(2)
+        assert statement == 'insert into teams (name, points) values (%s, %s), (%s, %s)'
+        assert describe(Team).insert_many_statement(2) is statement
+
+    def test_update_many_statement(self) -> None:
+        assert describe(Team).update_many_statement(2) == (
+            'update teams set name = case id when %s then %s when %s then %s else name end, '
+            'points = case id when %s then %s when %s then %s else points end where id in (%s, %s)'
+        )
+
+    def test_update_many_statement_of_changed_columns_with_version(self) -> None:
+        # points column plays role of version column
+        assert describe(Team).update_many_statement(2, ('name',), 'points') == (
+            'update teams set name = case id when %s then %s when %s then %s else name end, '
+            'points = coalesce(points, 0) + 1 where id in (%s, %s) '
+            'and case id when %s then points <=> %s when %s then points <=> %s end'
+        )
+
+    def test_update_columns_statement(self) -> None:
+        assert describe(Team).update_columns_statement(('points',)) == 'update teams set points=%s where id = %s'
+        assert describe(Team).update_columns_statement(('name',), 'points') == (
+            'update teams set name=%s, points=coalesce(points, 0) + 1 where id = %s and points <=> %s'
+        )
+
+    def test_upsert_many_statement(self) -> None:
+        assert describe(Team).upsert_many_statement(1) == (
+            'insert into teams (id, name, points) values (%s, %s, %s) '
+            'on duplicate key update name = values(name), points = values(points)'
+        )
+
+    def test_in_ids_statements(self) -> None:
+        assert describe(Team).find_many_statement(2) == 'select id, name, points from teams where id in (%s, %s)'
+        assert describe(Team).delete_many_statement(1) == 'delete from teams where id in (%s)'
+
+    def test_insert_values(self) -> None:
+        assert describe(Team).insert_values(Team(1, 'MALAGA', 10)) == ('MALAGA', 10)
+        assert describe(Order).insert_values(Order(1, date(2022, 6, 12))) == (date(2022, 6, 12),)
+
+    def test_row_converters(self) -> None:
+        descriptor = describe(Team)
+        assert descriptor.row_to_entity((1, 'MALAGA', 10)) == Team(1, 'MALAGA', 10)
+        assert descriptor.rows_to_entities([(1, 'A', 1), (2, 'B', 2)]) == [Team(1, 'A', 1), Team(2, 'B', 2)]
+
+    def test_relationship_fields_are_not_columns(self) -> None:
+        descriptor = describe(Player)
+        assert descriptor.fields_names == ('id', 'name', 'goals', 'team_id')
+        assert descriptor.relationships == {'team': BelongsTo(Team, 'team_id')}
+        assert descriptor.statements['find_all'] == 'select id, name, goals, team_id from players'
+        assert descriptor.row_to_entity((1, 'MESSI', 10, 2)) == Player(1, 'MESSI', 10, 2)
+
+    def test_relationship_declared_before_columns(self) -> None:
+        @dataclass
+        class Goal:
+            id: int = None
+            player: Player = belongs_to(Player, 'player_id')
+            player_id: int = None
+
+        with pytest.raises(TypeError, match='have to be declared after columns'):
+            describe(Goal)
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from easy_crud_repo_service.model.car import Car
+from easy_crud_repo_service.repo.export import write_batches
+
+
+class TestWriteBatches:
+    batches = [
+        [(1, 'WA1', date(2020, 1, 31), 'VIN1', 'Audi', 'A4'), (2, 'WA2', date(2021, 2, 1), 'VIN2', 'BMW', 'X5')],
+        [(3, 'WA3', None, 'VIN3', 'Fiat', '126p')]
+    ]
+    names = tuple(Car.attr_names())
+
+    def test_csv_can_be_read_back_with_from_dict(self) -> None:
+        stream = io.StringIO()
+        assert write_batches(iter(self.batches), self.names, stream, 'csv') == 3
+        stream.seek(0)
+        rows = list(csv.DictReader(stream))
+        assert Car.from_dict(rows[0]) == Car(1, 'WA1', date(2020, 1, 31), 'VIN1', 'Audi', 'A4')
+        assert rows[2]['first_registration_date'] == ''
+
+    def test_jsonl(self) -> None:
+        stream = io.StringIO()
+        assert write_batches(iter(self.batches), self.names, stream, 'jsonl') == 3
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[1])['first_registration_date'] == '2021-02-01'
+        assert json.loads(lines[2])['first_registration_date'] is None
+
+    def test_path_destination(self, tmp_path) -> None:
+        path = tmp_path / 'cars.csv'
+        write_batches(iter(self.batches), self.names, path, 'csv')
+        assert path.read_text(encoding='utf-8').splitlines()[0] == ','.join(self.names)
+
+    def test_parquet(self, tmp_path) -> None:
+        pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+        path = tmp_path / 'cars.parquet'
+        types = {'id': int, 'first_registration_date': date}
+        assert write_batches(iter(self.batches), self.names, path, 'parquet', types) == 3
+        table = pyarrow_parquet.read_table(path)
+        assert table.column_names == list(self.names)
+        assert table.column('first_registration_date').to_pylist()[2] is None
+
+    def test_parquet_column_null_in_first_batch(self) -> None:
+        pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+        stream = io.BytesIO()
+        batches = [
+            [(1, None, None, None)],
+            [(2, 5, Decimal('1.50'), timedelta(hours=1))],
+            [(3, None, Decimal('2.25'), None)]
+        ]
+        types = {'id': int, 'team_id': int | None, 'price': Decimal | None, 'duration': timedelta | None}
+        assert write_batches(iter(batches), ('id', 'team_id', 'price', 'duration'), stream, 'parquet', types) == 3
+        stream.seek(0)
+        table = pyarrow_parquet.read_table(stream)
+        assert [str(field.type) for field in table.schema] == ['int64', 'int64', 'decimal128(38, 2)', 'duration[us]']
+        assert table.column('team_id').to_pylist() == [None, 5, None]
+        assert table.column('price').to_pylist() == [None, Decimal('1.50'), Decimal('2.25')]
+
+    def test_parquet_column_without_type_and_values(self) -> None:
+        pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+        stream = io.BytesIO()
+        assert write_batches(iter([[(1, None)], [(2, None)]]), ('id', 'note'), stream, 'parquet', {'id': int}) == 2
+        stream.seek(0)
+        assert str(pyarrow_parquet.read_table(stream).schema.field('note').type) == 'null'
+
+    def test_invalid_format(self) -> None:
+        with pytest.raises(ValueError) as e:
+            write_batches(iter(self.batches), self.names, io.StringIO(), 'xml')
+        assert e.value.args[0] == "Export format xml is not supported, use one of ('csv', 'jsonl', 'parquet')"
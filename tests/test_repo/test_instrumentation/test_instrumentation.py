@@ -0,0 +1,80 @@
+import logging
+
+from easy_crud_repo_service.repo.instrumentation import Histogram, Instrumentation, QueryEvent
+from tests.test_repo.conftest import FakeCursor, FakePool
+
+
+def fake_cursor() -> FakeCursor:
+    """ Cursor answering every statement with three rows """
+    return FakePool(rows=lambda operation, params: [(1,), (2,), (3,)]).get_connection().cursor()
+
+
+class TestHistogram:
+
+    def test_buckets_are_cumulative(self) -> None:
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        assert histogram.to_dict() == {'count': 4, 'sum': 2.65, 'buckets': {0.1: 2, 1.0: 3, float('inf'): 4}}
+
+
+class TestInstrumentation:
+
+    def test_callbacks_get_events(self) -> None:
+        instrumentation = Instrumentation()
+        before, after = [], []
+        instrumentation.before_execute(before.append)
+        instrumentation.after_execute(after.append)
+        cursor = instrumentation.cursor(fake_cursor(), 'Team', 'find_all', 0.5)
+        cursor.execute('select id from teams where id > %s', (1,))
+        cursor.fetchmany(2)
+        cursor.fetchall()
+        cursor.close()
+        assert before == [QueryEvent('Team', 'find_all', 'select id from teams where id > %s', 1, 0.5)]
+        assert after[0].rows == 3
+        assert after[0].elapsed >= 0
+        assert after[0].pool_wait == 0.5
+
+    def test_rowcount_is_used_when_nothing_was_fetched(self) -> None:
+        instrumentation = Instrumentation()
+        events = []
+        instrumentation.after_execute(events.append)
+        cursor = instrumentation.cursor(fake_cursor(), 'Team', 'update', 0.0)
+        cursor.execute('update teams set points = 1')
+        cursor.execute('delete from teams')
+        cursor.close()
+        assert [(event.sql, event.rows) for event in events] == [
+            ('update teams set points = 1', 3), ('delete from teams', 3)
+        ]
+
+    def test_slow_queries_are_logged(self, caplog) -> None:
+        instrumentation = Instrumentation(slow_query_threshold=0.0)
+        cursor = instrumentation.cursor(fake_cursor(), 'Team', 'find_all', 0.0)
+        with caplog.at_level(logging.WARNING, logger='easy_crud_repo_service.slow_query'):
+            cursor.execute('select id from teams')
+            cursor.close()
+        assert 'Slow query Team.find_all' in caplog.text
+        assert 'select id from teams' in caplog.text
+
+    def test_histograms_per_entity_and_operation(self) -> None:
+        instrumentation = Instrumentation(buckets=(1.0,))
+        for operation in ('find_one', 'find_one', 'insert'):
+            cursor = instrumentation.cursor(fake_cursor(), 'Team', operation, 0.0)
+            cursor.execute('select 1')
+            cursor.close()
+        histograms = instrumentation.to_dict()
+        assert histograms[('Team', 'find_one')]['count'] == 2
+        assert histograms[('Team', 'insert')]['buckets'] == {1.0: 1, float('inf'): 1}
+        instrumentation.reset()
+        assert instrumentation.to_dict() == {}
+
+    def test_prometheus_format(self) -> None:
+        instrumentation = Instrumentation(buckets=(1.0,))
+        cursor = instrumentation.cursor(fake_cursor(), 'Team', 'count', 0.0)
+        cursor.execute('select count(*) from teams')
+        cursor.close()
+        lines = instrumentation.to_prometheus('queries').splitlines()
+        assert lines[1] == '# TYPE queries histogram'
+        assert lines[2] == 'queries_bucket{entity="Team",operation="count",le="1.0"} 1'
+        assert lines[3] == 'queries_bucket{entity="Team",operation="count",le="+Inf"} 1'
+        assert lines[5] == 'queries_count{entity="Team",operation="count"} 1'
@@ -0,0 +1,44 @@
+import io
+from datetime import date, datetime
+
+import pytest
+
+from easy_crud_repo_service.repo.load_data import read_rows, to_field, write_rows
+
+
+class TestLoadDataFormat:
+
+    def test_special_characters_are_escaped(self) -> None:
+        assert to_field('a\tb\nc\\d') == 'a\\tb\\nc\\\\d'
+
+    def test_values_are_converted(self) -> None:
+        assert to_field(None) == '\\N'
+        assert to_field(True) == '1'
+        assert to_field(date(2022, 1, 31)) == '2022-01-31'
+        assert to_field(datetime(2022, 1, 31, 12, 30)) == '2022-01-31 12:30:00'
+        assert to_field(10) == '10'
+
+    def test_rows_are_written_line_by_line(self) -> None:
+        stream = io.StringIO()
+        assert write_rows([('Barcelona', 30), ('Real', None)], stream) == 2
+        assert stream.getvalue() == 'Barcelona\t30\nReal\t\\N\n'
+
+    def test_written_rows_are_read_back(self) -> None:
+        stream = io.StringIO()
+        write_rows([('a\tb\\N\nc', None, 1), ('\\N', '', 2)], stream)
+        stream.seek(0)
+        assert list(read_rows(stream)) == [('a\tb\\N\nc', None, '1'), ('\\N', '', '2')]
+
+    def test_crlf_lines_are_read_without_carriage_return(self) -> None:
+        stream = io.StringIO('Barcelona\t30\r\nReal\t\\N\r\nLast\t1', newline='')
+        assert list(read_rows(stream, '\r\n')) == [('Barcelona', '30'), ('Real', None), ('Last', '1')]
+
+    def test_lines_are_split_only_on_line_terminator(self) -> None:
+        stream = io.StringIO('a\r\nb\t1\r\n', newline='')
+        assert list(read_rows(stream)) == [('a\r',), ('b', '1\r')]
+        stream = io.StringIO('a\nb\t1\r\n', newline='')
+        assert list(read_rows(stream, '\r\n')) == [('a\nb', '1')]
+
+    def test_invalid_line_terminator(self) -> None:
+        with pytest.raises(ValueError, match="Line terminator should be one of"):
+            list(read_rows(io.StringIO(''), '\r'))
@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from easy_crud_repo_service.repo.parallel import COMMIT_ATTEMPTS, IncompleteCommitError, ParallelRepo
+from easy_crud_repo_service.repo.transaction import active_transaction
+from tests.test_repo.conftest import FakePool
+
+
+class FakeRepo:
+    """ Repo which insert_many returns doubled items and fails on negative ones """
+
+    def __init__(self) -> None:
+        self._connection_pool = FakePool(pool_size=3)
+        self.threads = set()
+        self.transactions = []
+
+    def insert_many(self, items):
+        self.threads.add(threading.get_ident())
+        self.transactions.append(active_transaction(self._connection_pool))
+        if any(item < 0 for item in items):
+            raise RuntimeError(f"Invalid items {items}")
+        return [item * 2 for item in items]
+
+
+class TestParallelRepo:
+
+    def test_results_are_joined_in_input_order(self) -> None:
+        repo = FakeRepo()
+        report = ParallelRepo(repo, chunk_size=2).insert_many(list(range(11)))
+        assert report.ok
+        assert report.results == [item * 2 for item in range(11)]
+        assert [chunk.size for chunk in report.chunks] == [2, 2, 2, 2, 2, 1]
+        assert len(repo.threads) <= repo._connection_pool.pool_size
+
+    def test_best_effort_reports_failed_chunks(self) -> None:
+        report = ParallelRepo(FakeRepo(), chunk_size=2).insert_many([1, 2, -3, 4, 5])
+        assert not report.ok
+        assert [chunk.index for chunk in report.failed] == [1]
+        assert str(report.failed[0].error) == "Invalid items [-3, 4]"
+        assert report.results == [2, 4, 10]
+
+    def test_empty_items(self) -> None:
+        assert ParallelRepo(FakeRepo()).insert_many([]).chunks == ()
+
+    def test_atomic_commits_prepared_branches(self) -> None:
+        repo = FakeRepo()
+        report = ParallelRepo(repo, workers=2, chunk_size=2, atomic=True).insert_many([1, 2, 3, 4])
+        assert report.results == [2, 4, 6, 8]
+        assert all(transaction is not None for transaction in repo.transactions)
+        for connection in repo._connection_pool.connections:
+            assert connection.statements == [
+                'xa start %s, %s', 'xa end %s, %s', 'xa prepare %s, %s', 'xa commit %s, %s', 'release'
+            ]
+        xids = set(repo._connection_pool.params)
+        assert len(xids) == 2 and len({gtrid for gtrid, _ in xids}) == 1
+
+    def test_atomic_rolls_back_all_branches_on_failure(self) -> None:
+        repo = FakeRepo()
+        with pytest.raises(RuntimeError) as e:
+            ParallelRepo(repo, workers=2, chunk_size=1, atomic=True).insert_many([1, -2, 3, 4])
+        assert e.value.args[0] == "Invalid items [-2]"
+        for connection in repo._connection_pool.connections:
+            assert connection.statements[-2:] == ['xa rollback %s, %s', 'release']
+            assert not any(statement.startswith('xa commit') for statement in connection.statements)
+
+    def test_prepared_branches_are_not_rolled_back_when_commit_fails(self) -> None:
+        repo = FakeRepo()
+        attempts = []
+
+        def fail(operation, params):
+            failed = operation.startswith('xa commit') and params[1] == '1'
+            attempts.extend([params] if failed else [])
+            return failed
+
+        repo._connection_pool.fail = fail
+        with pytest.raises(IncompleteCommitError) as e:
+            ParallelRepo(repo, workers=2, chunk_size=2, atomic=True).insert_many([1, 2, 3, 4])
+        assert e.value.xids == [attempts[0]]
+        assert len(attempts) == COMMIT_ATTEMPTS
+        statements = repo._connection_pool.statements
+        assert statements.count('xa prepare %s, %s') == 2
+        assert statements.count('xa commit %s, %s') == 1
+        assert 'xa rollback %s, %s' not in statements
+        assert all(connection.closed for connection in repo._connection_pool.connections)
+
+    def test_failed_commit_is_retried(self) -> None:
+        repo = FakeRepo()
+        failures = [True, False, False]
+        repo._connection_pool.fail = lambda operation, params: operation.startswith('xa commit') and failures.pop(0)
+        report = ParallelRepo(repo, workers=2, chunk_size=2, atomic=True).insert_many([1, 2, 3, 4])
+        assert report.results == [2, 4, 6, 8]
+        assert repo._connection_pool.statements.count('xa commit %s, %s') == 2
+
+    def test_invalid_chunk_size(self) -> None:
+        with pytest.raises(ValueError) as e:
+            ParallelRepo(FakeRepo(), chunk_size=0)
+        assert e.value.args[0] == "Chunk size should be higher than 0"
+
+
+class TestParallelCrudRepo:
+    """ Cases for ParallelRepo of real CrudRepo, statements of its methods are executed on fake connections """
+
+    def test_atomic_branches_run_statements_of_repo_without_commit(self) -> None:
+        pool = FakePool(pool_size=2)
+        repo = CrudRepo(pool, Team)
+        teams = [Team(name=f'T{n}') for n in range(4)] + [Team(id=10 + n, name=f'U{n}') for n in range(2)]
+        report = repo.parallel(chunk_size=2, atomic=True).insert_many(teams[:4])
+        assert report.ok and len(set(report.results)) == 4
+        assert repo.parallel(chunk_size=2, atomic=True).upsert_many(teams[2:]).ok
+        assert pool.checkouts == 4
+        for connection in pool.connections:
+            statements = connection.statements
+            assert statements[0] == 'xa start %s, %s'
+            assert statements[-4:] == ['xa end %s, %s', 'xa prepare %s, %s', 'xa commit %s, %s', 'release']
+            assert 'commit' not in statements and 'rollback' not in statements
+        assert sum('on duplicate key update' in statement for statement in pool.statements) == 1
+
+    def test_best_effort_chunks_are_committed_separately(self) -> None:
+        pool = FakePool(pool_size=2)
+        repo = CrudRepo(pool, Team)
+        report = repo.parallel(chunk_size=2).insert_many([Team(name=f'T{n}') for n in range(4)])
+        assert report.ok
+        assert pool.statements.count('commit') == pool.checkouts == 2
+        assert not any(statement.startswith('xa') for statement in pool.statements)
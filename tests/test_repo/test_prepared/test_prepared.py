@@ -0,0 +1,44 @@
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from easy_crud_repo_service.repo.prepared import PreparedStatements
+from tests.test_repo.conftest import FakeConnection, FakePool
+
+
+def malaga(operation, params):
+    return [(1, 'Malaga', 10)]
+
+
+class TestPreparedStatements:
+
+    def test_statement_is_prepared_once_per_sql(self) -> None:
+        connection = FakeConnection()
+        statements = PreparedStatements(connection)
+        cursor = statements.cursor()
+        first, second = 'select 1', ''.join(['select ', '1'])
+        cursor.execute(first)
+        cursor.execute('select 2')
+        cursor.execute(second)
+        assert len(statements) == 2
+        assert connection.statements == ['prepare select 1', 'select 1', 'prepare select 2', 'select 2', 'select 1']
+        statements.close()
+        assert connection.statements[-2:] == ['close select 1', 'close select 2']
+        assert len(statements) == 0
+
+    def test_statements_are_closed_before_connection_is_released(self) -> None:
+        pool = FakePool(rows=malaga)
+        repo = CrudRepo(pool, Team, prepared=True)
+        assert repo.find_one(1) == Team(1, 'Malaga', 10)
+        statement = repo._statement('find_one')
+        assert pool.statements == [f'prepare {statement}', statement, 'commit', f'close {statement}', 'release']
+
+    def test_transaction_reuses_statements(self) -> None:
+        pool = FakePool(rows=malaga)
+        repo = CrudRepo(pool, Team, prepared=True)
+        with repo.transaction():
+            repo.find_one(1)
+            repo.find_one(1)
+        statement = repo._statement('find_one')
+        assert pool.checkouts == 1
+        assert pool.statements.count(f'prepare {statement}') == 1
+        assert pool.statements.count(statement) == 2
+        assert pool.statements[-3:] == ['commit', f'close {statement}', 'release']
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from easy_crud_repo_service.repo.processes import IdRange, id_ranges, map_partitions
+from tests.test_repo.conftest import FakePool
+
+
+def double_in_worker(repo: CrudRepo, partition: int) -> tuple[int, str, bool]:
+    return partition * 2, repo._table_name(), os.getpid() != int(os.environ['PARENT_PID'])
+
+
+def fail_on_two(repo: CrudRepo, partition: int) -> int:
+    if partition == 2:
+        raise RuntimeError("Partition 2 failed")
+    return partition
+
+
+class TestIdRanges:
+
+    def test_ids_are_split_into_ranges(self, monkeypatch) -> None:
+        repo = CrudRepo(None, Team)
+        monkeypatch.setattr(repo, '_select', lambda sql, params: [(1, 10)])
+        assert id_ranges(repo, 3) == [IdRange(1, 5), IdRange(5, 9), IdRange(9, 11)]
+        assert IdRange(1, 5).criteria() == {'id__gte': 1, 'id__lt': 5}
+
+    def test_empty_table(self, monkeypatch) -> None:
+        repo = CrudRepo(None, Team)
+        monkeypatch.setattr(repo, '_select', lambda sql, params: [(None, None)])
+        assert id_ranges(repo, 3) == []
+        with pytest.raises(ValueError):
+            id_ranges(repo, 0)
+
+
+class TestMapPartitions:
+
+    def test_partitions_run_in_worker_processes(self, monkeypatch) -> None:
+        monkeypatch.setenv('PARENT_PID', str(os.getpid()))
+        results = map_partitions(FakePool(pool_size=1), Team, double_in_worker, [1, 2, 3], processes=2)
+        assert results == [(2, 'teams', True), (4, 'teams', True), (6, 'teams', True)]
+
+    def test_results_are_combined(self) -> None:
+        assert map_partitions(FakePool(pool_size=1), Team, fail_on_two, [1, 3], combine=sum) == 4
+        assert map_partitions(FakePool(pool_size=1), Team, fail_on_two, [], combine=sum) == 0
+
+    def test_task_error_is_raised(self) -> None:
+        with pytest.raises(RuntimeError, match='Partition 2 failed'):
+            map_partitions(FakePool(pool_size=1), Team, fail_on_two, [1, 2, 3])
@@ -0,0 +1,95 @@
+import pytest
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from tests.test_repo.conftest import FakePool
+
+
+@pytest.fixture
+def fake_repo() -> CrudRepo:
+    """ Queries are only compiled, so repo doesn't need database """
+    return CrudRepo(FakePool(), Team)
+
+
+class TestQueryCompilation:
+    def test_compile_without_criteria(self, fake_repo) -> None:
+        assert fake_repo.query().compile() == ('select id, name, points from teams', [])
+
+    def test_compile_with_criteria_ordering_and_pagination(self, fake_repo) -> None:
+        query = fake_repo.query().where(points__gte=10, name__like='A%')
+        query = query.order_by('-points', 'name').limit(5).offset(10)
+        assert query.compile() == (
+            'select id, name, points from teams where points >= %s and name like %s '
+            'order by points desc, name limit %s offset %s',
+            [10, 'A%', 5, 10]
+        )
+
+    def test_compile_with_in_between_and_null_lookups(self, fake_repo) -> None:
+        query = fake_repo.query().where(id__in=[1, 2], points__between=(1, 5), name__isnull=False)
+        assert query.compile() == (
+            'select id, name, points from teams where id in (%s, %s) and points between %s and %s '
+            'and name is not null',
+            [1, 2, 1, 5]
+        )
+
+    def test_compile_comparisons_with_none(self, fake_repo) -> None:
+        query = fake_repo.query().where(name=None, points__ne=None, id__isnull=None)
+        assert query.compile() == (
+            'select id, name, points from teams where name is null and points is not null and id is null', []
+        )
+
+    def test_compile_with_projection_and_keyset(self, fake_repo) -> None:
+        query = fake_repo.query().values('name').after(100).limit(10)
+        assert query.compile() == ('select name from teams where id > %s order by id limit %s', [100, 10])
+
+    def test_queries_are_immutable(self, fake_repo) -> None:
+        query = fake_repo.query()
+        query.where(points=1)
+        assert query.compile() == ('select id, name, points from teams', [])
+
+    def test_unknown_field(self, fake_repo) -> None:
+        with pytest.raises(ValueError) as e:
+            fake_repo.query().where(points_number=1)
+        assert e.value.args[0] == "Entity Team has no field points_number"
+
+    def test_unknown_lookup(self, fake_repo) -> None:
+        with pytest.raises(ValueError) as e:
+            fake_repo.query().where(points__regexp='1')
+        assert e.value.args[0] == "Lookup regexp is not supported"
+
+    def test_in_lookup_with_str(self, fake_repo) -> None:
+        with pytest.raises(ValueError) as e:
+            fake_repo.query().where(name__in='abc')
+        assert e.value.args[0] == "Lookup in of name needs collection of values, not str"
+        with pytest.raises(ValueError):
+            fake_repo.query().where(name__in=b'abc')
+
+    def test_in_lookup_with_generator(self, fake_repo) -> None:
+        query = fake_repo.query().where(id__in=(n for n in (1, 2)))
+        assert query.compile() == query.compile() == ('select id, name, points from teams where id in (%s, %s)', [1, 2])
+
+
+class TestQueryExecution:
+    def test_valid_find_by(self, repo_tests) -> None:
+        repo_tests.delete_all()
+        repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=5), Team(name='C', points=5)])
+        assert [team.name for team in repo_tests.find_by(points=5)] == ['B', 'C']
+
+    def test_ordered_and_paginated_query(self, repo_tests) -> None:
+        repo_tests.delete_all()
+        repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=5), Team(name='C', points=9)])
+        teams = repo_tests.query().where(points__gt=1).order_by('-points').all()
+        assert [team.name for team in teams] == ['C', 'B']
+        assert repo_tests.query().order_by('name').offset(1).first().name == 'B'
+
+    def test_projection(self, repo_tests) -> None:
+        repo_tests.delete_all()
+        repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=5)])
+        assert repo_tests.query().values('name', 'points').order_by('name').all() == [('A', 1), ('B', 5)]
+        assert repo_tests.query().only('name').order_by('name').all() == [Team(name='A'), Team(name='B')]
+
+    def test_count_and_empty_in(self, repo_tests) -> None:
+        repo_tests.delete_all()
+        repo_tests.insert_many([Team(name='A', points=1), Team(name='B', points=5)])
+        assert repo_tests.query().where(points__lte=5).count() == 2
+        assert repo_tests.query().where(id__in=[]).all() == []
@@ -0,0 +1,58 @@
+import pytest
+
+from easy_crud_repo_service.model.player import Player
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from easy_crud_repo_service.repo.relationships import LazyProxy
+
+
+class TestLazyProxy:
+
+    def test_entity_is_loaded_once_on_first_access(self) -> None:
+        calls = []
+        proxy = LazyProxy(lambda: calls.append(1) or Team(1, 'BARCELONA', 30))
+        assert repr(proxy) == 'LazyProxy(<not loaded>)'
+        assert not calls
+        assert proxy.name == 'BARCELONA'
+        assert proxy.points == 30
+        assert proxy == Team(1, 'BARCELONA', 30)
+        assert len(calls) == 1
+
+    def test_missing_entity_is_none(self) -> None:
+        proxy = LazyProxy(lambda: None)
+        assert proxy.get() is None
+        assert proxy == None  # noqa: E711
+
+
+class TestLoadRelated:
+
+    @pytest.fixture
+    def players_repo(self, monkeypatch) -> CrudRepo:
+        """ Repo without pool, find_many of teams repo is replaced, so only loading logic is tested """
+        repo = CrudRepo(None, Player)
+        teams = {1: Team(1, 'BARCELONA', 30), 2: Team(2, 'REAL', 20)}
+        calls = []
+
+        def find_many(items_ids, ignore_missing=False):
+            calls.append(list(items_ids))
+            return [teams[item_id] for item_id in items_ids if item_id in teams]
+
+        monkeypatch.setattr(repo._related_repo(Team), 'find_many', find_many)
+        repo.calls = calls
+        return repo
+
+    def test_parents_are_found_in_one_query_and_shared(self, players_repo) -> None:
+        players = [Player(1, 'A', 0, 1), Player(2, 'B', 0, 2), Player(3, 'C', 0, 1), Player(4, 'D', 0, None)]
+        players_repo.load_related(players, 'team')
+        assert players_repo.calls == [[1, 2]]
+        assert players[0].team == Team(1, 'BARCELONA', 30)
+        assert players[0].team is players[2].team
+        assert players[3].team is None
+
+    def test_missing_parent_is_none(self, players_repo) -> None:
+        players = players_repo.load_related([Player(1, 'A', 0, 3)], 'team')
+        assert players[0].team is None
+
+    def test_unknown_relationship(self, players_repo) -> None:
+        with pytest.raises(ValueError, match='has no relationship club'):
+            players_repo.load_related([Player(1, 'A', 0, 1)], 'club')
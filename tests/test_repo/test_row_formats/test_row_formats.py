@@ -0,0 +1,39 @@
+import pytest
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.entity_descriptor import describe
+from easy_crud_repo_service.repo.row_formats import collect_rows
+
+
+class TestCollectRows:
+    batches = [[(1, 'A', 10), (2, 'B', 20)], [(3, 'C', 30)]]
+    names = ('id', 'name', 'points')
+
+    def test_tuple_format(self) -> None:
+        assert collect_rows(iter(self.batches), self.names, 'tuple') == [(1, 'A', 10), (2, 'B', 20), (3, 'C', 30)]
+
+    def test_dict_format(self) -> None:
+        assert collect_rows(iter(self.batches), self.names, 'dict')[2] == {'id': 3, 'name': 'C', 'points': 30}
+
+    def test_columns_format(self) -> None:
+        assert collect_rows(iter(self.batches), self.names, 'columns') == {
+            'id': [1, 2, 3], 'name': ['A', 'B', 'C'], 'points': [10, 20, 30]
+        }
+
+    def test_entity_format(self) -> None:
+        entities = collect_rows(iter(self.batches), self.names, 'entity', describe(Team).rows_to_entities)
+        assert entities == [Team(1, 'A', 10), Team(2, 'B', 20), Team(3, 'C', 30)]
+
+    def test_numpy_format(self) -> None:
+        numpy = pytest.importorskip('numpy')
+        columns = collect_rows(iter(self.batches), self.names, 'numpy')
+        assert type(columns['points']) == numpy.ndarray
+        assert columns['points'].sum() == 60
+
+    def test_unsupported_format(self) -> None:
+        with pytest.raises(ValueError):
+            collect_rows(iter(self.batches), self.names, 'xml')
+
+    def test_slots_entities(self) -> None:
+        assert not hasattr(Team(1, 'A', 10), '__dict__')
+        assert describe(Team).insert_values(Team(1, 'A', 10)) == ('A', 10)
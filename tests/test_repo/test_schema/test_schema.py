@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from datetime import date
+
+import pytest
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo import schema
+from easy_crud_repo_service.repo.entity_descriptor import describe
+from easy_crud_repo_service.repo.schema import SchemaMismatchError, bootstrap, forget, mismatches, tables_from_rows
+from tests.test_repo.conftest import FakePool
+
+ROWS = [
+    ('teams', 'id', 'int', 'NO', 'PRI', 'auto_increment', None),
+    ('teams', 'name', 'varchar', 'YES', '', '', None),
+    ('teams', 'points', 'int', 'NO', '', '', '0'),
+    ('matches', 'id', b'bigint', b'NO', b'PRI', b'auto_increment', None),
+    ('matches', 'played_on', 'date', 'NO', '', '', None),
+    ('matches', 'stadium', 'varchar', 'NO', '', '', None),
+]
+
+
+@dataclass(slots=True)
+class Match:
+    id: int | None = None
+    played_on: str | None = None
+    home_goals: int = 0
+
+
+def schema_pool() -> FakePool:
+    """ Pool answering information_schema query with ROWS of requested tables """
+    return FakePool(rows=lambda operation, params: [row for row in ROWS if row[0] in params])
+
+
+class TestSchema:
+
+    def test_columns_are_read_from_rows(self) -> None:
+        schema = tables_from_rows(ROWS)['matches']
+        assert schema.columns_names == ('id', 'played_on', 'stadium')
+        assert schema.primary_key == ('id',)
+        assert schema.column('ID').auto_increment
+        assert not schema.column('stadium').nullable
+        assert schema.column('missing') is None
+
+    def test_matching_entity_has_no_mismatches(self) -> None:
+        assert mismatches(describe(Team), tables_from_rows(ROWS)['teams']) == []
+
+    def test_mismatches_are_listed(self) -> None:
+        assert mismatches(describe(Match), tables_from_rows(ROWS)['matches']) == [
+            'Table matches has no column home_goals of entity Match',
+            'Required column stadium of table matches has no field in Match',
+            "Field Match.played_on of type str | None can't hold date column of table matches",
+        ]
+        assert mismatches(describe(Match), None) == ["Table matches of entity Match doesn't exist"]
+
+    def test_primary_key_is_compared_case_insensitive(self) -> None:
+        rows = [('teams', 'ID', 'int', 'NO', 'PRI', 'auto_increment', None), *ROWS[1:3]]
+        assert mismatches(describe(Team), tables_from_rows(rows)['teams']) == []
+
+    def test_entity_is_validated_once_per_pool(self, monkeypatch) -> None:
+        pool = schema_pool()
+        bootstrap(pool, [Team])
+        monkeypatch.setattr(schema, 'mismatches', lambda descriptor, table: pytest.fail('Team validated again'))
+        bootstrap(pool, [Team])
+        assert pool.params == [['teams']]
+
+    def test_tables_are_read_with_one_query_and_cached_per_pool(self) -> None:
+        pool = schema_pool()
+        with pytest.raises(SchemaMismatchError, match='has no column home_goals'):
+            bootstrap(pool, [Team, Match])
+        assert bootstrap(pool, [Team])[Team].table_name == 'teams'
+        assert pool.params == [['teams', 'matches']]
+        forget(pool)
+        bootstrap(pool, [Team])
+        assert pool.params == [['teams', 'matches'], ['teams']]
+
+    def test_missing_table_without_validation(self) -> None:
+        @dataclass
+        class Stadium:
+            id: int = None
+            opened: date = None
+
+        assert bootstrap(schema_pool(), [Stadium], validate=False) == {Stadium: None}
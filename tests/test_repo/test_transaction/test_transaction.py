@@ -0,0 +1,55 @@
+import pytest
+
+from easy_crud_repo_service.model.team import Team
+from easy_crud_repo_service.repo.crud_repo import CrudRepo
+from easy_crud_repo_service.repo.transaction import transaction, active_transaction
+
+
+class TestTransaction:
+    def test_operations_are_committed_once(self, repo_tests) -> None:
+        with repo_tests.transaction() as tx:
+            team_id = repo_tests.insert(Team(name='A', points=1))
+            updated_team = repo_tests.update(team_id, Team(name='B', points=2))
+            assert active_transaction(repo_tests._connection_pool) is tx
+        assert updated_team == Team(team_id, 'B', 2)
+        assert repo_tests.find_one(team_id) == Team(team_id, 'B', 2)
+        assert active_transaction(repo_tests._connection_pool) is None
+
+    def test_error_rolls_back_all_operations(self, repo_tests) -> None:
+        count_before = repo_tests.count()
+        with pytest.raises(ValueError):
+            with repo_tests.transaction():
+                repo_tests.insert(Team(name='A', points=1))
+                repo_tests.insert(Team(name='B', points=2))
+                raise ValueError('rollback')
+        assert repo_tests.count() == count_before
+
+    def test_repos_sharing_pool_join_transaction(self, connection_tests, repo_tests) -> None:
+        other_repo = CrudRepo(connection_tests, Team)
+        with transaction(connection_tests):
+            team_id = repo_tests.insert(Team(name='A', points=1))
+            assert other_repo.find_one(team_id).name == 'A'
+            with other_repo.transaction():
+                other_repo.delete_one(team_id)
+        assert not repo_tests.exists(team_id)
+
+    def test_deferred_writes_are_flushed_at_commit(self, repo_tests) -> None:
+        team_id = repo_tests.insert(Team(name='A', points=1))
+        deleted_id = repo_tests.insert(Team(name='B', points=1))
+        new_team = Team(name='C', points=3)
+        with repo_tests.transaction() as tx:
+            tx.defer_insert(repo_tests, new_team)
+            tx.defer_update(repo_tests, team_id, Team(name='A', points=10))
+            tx.defer_delete(repo_tests, deleted_id)
+            assert new_team.id is None
+        assert repo_tests.find_one(new_team.id) == new_team
+        assert repo_tests.find_one(team_id).points == 10
+        assert not repo_tests.exists(deleted_id)
+
+    def test_cache_is_not_filled_with_uncommitted_rows(self, cached_repo_tests) -> None:
+        team_id = cached_repo_tests.insert(Team(name='A', points=1))
+        with pytest.raises(ValueError):
+            with cached_repo_tests.transaction():
+                cached_repo_tests.update(team_id, Team(name='B', points=2))
+                raise ValueError('rollback')
+        assert cached_repo_tests.find_one(team_id).name == 'A'